@@ -2,6 +2,8 @@
 
 import numpy
 
+from segpy.datatypes import SEG_Y_TYPE_TO_CTYPE
+
 NUMPY_DTYPES = {'ibm':     numpy.dtype('f4'),
                 'int32':   numpy.dtype('i4'),
                 'int16':   numpy.dtype('i2'),
@@ -30,3 +32,37 @@ def make_dtype(data_sample_format): # TODO: What is the correct name for this ar
         raise ValueError("Unknown data sample format string {!r}".format(data_sample_format))
 
 
+def make_header_dtype(header_format_class, field_names=None, endian='>'):
+    """Make a numpy structured dtype with the layout of a header format.
+
+    Each field of the dtype is at the same offset, and has the same size and
+    byte order, as the corresponding header field, so that headers can be
+    decoded directly from a buffer using numpy.frombuffer().
+
+    Args:
+        header_format_class: A header format class, such as TraceHeaderRev1.
+
+        field_names: An optional iterable series of names of the fields to be
+            included in the dtype. If not provided or None, all fields will be
+            included.
+
+        endian: '>' for big-endian data (the standard and default), '<'
+            for little-endian (non-standard).
+
+    Returns:
+        A numpy.dtype instance with an itemsize of header_format_class.LENGTH_IN_BYTES.
+
+    Raises:
+        AttributeError: If the the named fields do not exist in the header format.
+    """
+    if field_names is None:
+        field_names = header_format_class.ordered_field_names()
+    field_names = list(field_names)
+    named_fields = [getattr(header_format_class, field_name) for field_name in field_names]
+    return numpy.dtype({
+        'names': field_names,
+        'formats': [endian + SEG_Y_TYPE_TO_CTYPE[named_field.value_type.SEG_Y_TYPE]
+                    for named_field in named_fields],
+        'offsets': [named_field.offset - header_format_class.START_OFFSET_IN_BYTES
+                    for named_field in named_fields],
+        'itemsize': header_format_class.LENGTH_IN_BYTES})
@@ -1,11 +1,10 @@
 """Tools for interoperability between Segpy and Numpy arrays."""
 from collections import namedtuple
 import numpy as np
-from segpy.header import SubFormatMeta
-from segpy.packer import make_header_packer
+from segpy.header import make_sub_format
 
 from segpy.util import ensure_superset
-from segpy_numpy.dtypes import make_dtype
+from segpy_numpy.dtypes import make_dtype, make_header_dtype
 
 
 def extract_trace_headers(reader, fields, trace_indexes=None):
@@ -29,16 +28,11 @@ def extract_trace_headers(reader, fields, trace_indexes=None):
 
     field_names = [_extract_field_name(field) for field in fields]
 
-    class SubFormat(metaclass=SubFormatMeta,
-                    parent_format=reader.trace_header_format_class,
-                    parent_field_names=field_names):
-        pass
+    SubFormat = make_sub_format(reader.trace_header_format_class, field_names)
 
-    sub_header_packer = make_header_packer(SubFormat, reader.endian)
     trace_header_arrays_cls = namedtuple('trace_header_arrays_cls', field_names)
 
-    trace_headers = [reader.trace_header(trace_index, sub_header_packer)
-                     for trace_index in trace_indexes]
+    trace_headers = reader.trace_headers_many(trace_indexes, fields=field_names)
 
     trace_header_arrays = trace_header_arrays_cls(
         *(np.fromiter((getattr(trace_header, field_name) for trace_header in trace_headers),
@@ -50,6 +44,51 @@ def extract_trace_headers(reader, fields, trace_indexes=None):
     return trace_header_arrays
 
 
+def extract_trace_header_table(reader, fields=None, trace_indexes=None):
+    """Extract trace header fields from the specified trace headers as a structured array.
+
+    The undecoded headers are read in large blocks, and all of the requested
+    fields are decoded at once by Numpy, without creating a header object for
+    each trace. This is much faster than extract_trace_headers() for many traces.
+
+    Args:
+        reader: A SegYReader
+
+        fields: An optional iterable series where each item is either the name of a field
+            as a string or an object such as a NamedField with a 'name' attribute which in
+            turn is the name of a field as a string. If not provided or None, all fields of
+            the trace header format will be extracted.
+
+        trace_indexes: An optional iterable series of trace_indexes. If not provided or None,
+            the headers for all trace indexes will be returned.
+
+    Returns:
+        A one-dimensional Numpy structured array in native byte order, with one element
+        for each trace index, and a named field for each requested field.  Individual
+        fields can be obtained as arrays by indexing with the field name.
+
+    Raises:
+        AttributeError: If the the named fields do not exist in the trace header definition.
+    """
+    if trace_indexes is None:
+        trace_indexes = reader.trace_indexes()
+
+    trace_header_format = reader.trace_header_format_class
+    field_names = (trace_header_format.ordered_field_names() if fields is None
+                   else [_extract_field_name(field) for field in fields])
+
+    header_dtype = make_header_dtype(trace_header_format, field_names, reader.endian)
+    header_bytes = reader.trace_header_bytes_many(trace_indexes)
+    headers = np.frombuffer(header_bytes, dtype=header_dtype)
+
+    # Copy the fields into a compact array of native byte order
+    table = np.empty(len(headers), dtype=[(field_name, header_dtype.fields[field_name][0].newbyteorder('='))
+                                          for field_name in field_names])
+    for field_name in field_names:
+        table[field_name] = headers[field_name]
+    return table
+
+
 def extract_trace_header_field_3d(reader_3d, fields, inline_numbers=None, xline_numbers=None, null=None):
     """Extract a single trace header field from all trace headers as an array.
 
@@ -108,12 +147,8 @@ def extract_trace_header_field_3d(reader_3d, fields, inline_numbers=None, xline_
     xline_numbers = ensure_superset(reader_3d.xline_numbers(), xline_numbers)
     shape = (len(inline_numbers), len(xline_numbers))
 
-    class SubFormat(metaclass=SubFormatMeta,
-                    parent_format=reader_3d.trace_header_format_class,
-                    parent_field_names=field_names):
-        pass
+    SubFormat = make_sub_format(reader_3d.trace_header_format_class, field_names)
 
-    sub_header_packer = make_header_packer(SubFormat, reader_3d.endian)
     TraceHeaderArrays = namedtuple('TraceHeaderArrays', field_names)
 
     arrays = (_make_array(shape,
@@ -128,7 +163,7 @@ def extract_trace_header_field_3d(reader_3d, fields, inline_numbers=None, xline_
             inline_xline_number = (inline_number, xline_number)
             if reader_3d.has_trace_index(inline_xline_number):
                 trace_index = reader_3d.trace_index((inline_number, xline_number))
-                trace_header = reader_3d.trace_header(trace_index, sub_header_packer)
+                trace_header = reader_3d.trace_header(trace_index, fields=field_names)
 
                 for field_name, a in zip(field_names, trace_header_arrays):
                     field_value = getattr(trace_header, field_name)
@@ -0,0 +1,45 @@
+import numpy
+import pytest
+
+from segpy.packer import make_header_packer
+from segpy.trace_header import TraceHeaderRev1
+from segpy_numpy.dtypes import make_header_dtype
+
+
+def _trace_header(trace_index):
+    return TraceHeaderRev1(
+        line_sequence_num=trace_index + 1,
+        num_samples=10,
+        inline_number=trace_index + 100,
+        crossline_number=-trace_index - 200,
+        xy_scalar=-100,
+        cdp_x=-123456789 + trace_index,
+        cdp_y=987654321 - trace_index)
+
+
+class TestMakeHeaderDtype:
+
+    def test_itemsize_is_header_length(self):
+        assert make_header_dtype(TraceHeaderRev1).itemsize == TraceHeaderRev1.LENGTH_IN_BYTES
+
+    def test_all_fields_are_included_by_default(self):
+        assert make_header_dtype(TraceHeaderRev1).names == tuple(TraceHeaderRev1.ordered_field_names())
+
+    def test_field_offsets_match_header_format(self):
+        dtype = make_header_dtype(TraceHeaderRev1, ['cdp_x', 'xy_scalar'])
+        assert dtype.names == ('cdp_x', 'xy_scalar')
+        assert dtype.fields['cdp_x'][1] == TraceHeaderRev1.cdp_x.offset - 1
+        assert dtype.fields['xy_scalar'][1] == TraceHeaderRev1.xy_scalar.offset - 1
+
+    def test_unknown_field_raises_attribute_error(self):
+        with pytest.raises(AttributeError):
+            make_header_dtype(TraceHeaderRev1, ['no_such_field'])
+
+    @pytest.mark.parametrize('endian', ['>', '<'])
+    def test_packed_headers_are_decoded(self, endian):
+        packer = make_header_packer(TraceHeaderRev1, endian)
+        headers = [_trace_header(trace_index) for trace_index in range(3)]
+        decoded = numpy.frombuffer(b''.join(packer.pack(header) for header in headers),
+                                   dtype=make_header_dtype(TraceHeaderRev1, endian=endian))
+        for field_name in TraceHeaderRev1.ordered_field_names():
+            assert decoded[field_name].tolist() == [getattr(header, field_name) for header in headers]
@@ -1,10 +1,110 @@
 import unittest
 
+import pytest
+
+from segpy.binary_reel_header import BinaryReelHeader
+from segpy.dataset import Dataset
+from segpy.datatypes import SEG_Y_TYPE_TO_DATA_SAMPLE_FORMAT
+from segpy.encoding import ASCII
+from segpy.reader import create_reader
+from segpy.toolkit import CARD_LENGTH, CARDS_PER_HEADER
+from segpy.trace_header import TraceHeaderRev1
+from segpy.writer import write_segy
+from segpy_numpy.extract import extract_trace_header_table
+
 
 class MyTestCase(unittest.TestCase):
     def test_something(self):
         self.assertEqual(True, False)
 
 
+class HeadersDataset(Dataset):
+    """A dataset of float32 traces with distinct, partly negative, trace header values."""
+
+    NUM_TRACES = 12
+    NUM_SAMPLES = 5
+
+    @property
+    def textual_reel_header(self):
+        return tuple(' ' * CARD_LENGTH for _ in range(CARDS_PER_HEADER))
+
+    @property
+    def binary_reel_header(self):
+        return BinaryReelHeader(num_samples=self.NUM_SAMPLES,
+                                sample_interval=4000,
+                                data_sample_format=SEG_Y_TYPE_TO_DATA_SAMPLE_FORMAT['float32'])
+
+    @property
+    def extended_textual_header(self):
+        return []
+
+    @property
+    def dimensionality(self):
+        return 2
+
+    @property
+    def encoding(self):
+        return ASCII
+
+    def trace_indexes(self):
+        return iter(range(self.NUM_TRACES))
+
+    def num_traces(self):
+        return self.NUM_TRACES
+
+    def trace_header(self, trace_index):
+        return TraceHeaderRev1(
+            line_sequence_num=trace_index + 1,
+            ensemble_num=trace_index + 1,
+            num_samples=self.NUM_SAMPLES,
+            inline_number=trace_index + 100,
+            crossline_number=-trace_index - 200,
+            xy_scalar=-100,
+            cdp_x=-123456789 + trace_index,
+            cdp_y=987654321 - trace_index)
+
+    def trace_samples(self, trace_index, start=None, stop=None):
+        return [float(trace_index)] * len(range(self.NUM_SAMPLES)[start:stop])
+
+
+@pytest.fixture(params=['>', '<'])
+def reader(request, tmpdir):
+    endian = request.param
+    segy_path = str(tmpdir / 'test.segy')
+    with open(segy_path, 'wb') as fh:
+        write_segy(fh, HeadersDataset(), endian=endian)
+    with open(segy_path, 'rb') as fh:
+        yield create_reader(fh, endian=endian, cache_directory=None)
+
+
+class TestExtractTraceHeaderTable:
+
+    def test_all_fields_match_trace_headers(self, reader):
+        table = extract_trace_header_table(reader)
+        field_names = TraceHeaderRev1.ordered_field_names()
+        assert table.dtype.names == tuple(field_names)
+        assert len(table) == reader.num_traces()
+        for trace_index in reader.trace_indexes():
+            header = reader.trace_header(trace_index)
+            assert table[trace_index].tolist() == tuple(getattr(header, field_name) for field_name in field_names)
+
+    def test_subset_of_fields_matches_trace_headers(self, reader):
+        fields = ['cdp_x', TraceHeaderRev1.xy_scalar, 'crossline_number']
+        table = extract_trace_header_table(reader, fields)
+        assert table.dtype.names == ('cdp_x', 'xy_scalar', 'crossline_number')
+        for trace_index in reader.trace_indexes():
+            header = reader.trace_header(trace_index)
+            assert table[trace_index].tolist() == (header.cdp_x, header.xy_scalar, header.crossline_number)
+
+    def test_selected_trace_indexes_are_extracted_in_order(self, reader):
+        trace_indexes = [7, 3, 3, 11, 0]
+        table = extract_trace_header_table(reader, ['cdp_y'], trace_indexes)
+        assert table['cdp_y'].tolist() == [reader.trace_header(trace_index).cdp_y for trace_index in trace_indexes]
+
+    def test_table_has_native_byte_order(self, reader):
+        table = extract_trace_header_table(reader, ['cdp_x'])
+        assert table.dtype['cdp_x'].isnative
+
+
 if __name__ == '__main__':
     unittest.main()
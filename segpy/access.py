@@ -0,0 +1,253 @@
+"""Strategies for obtaining bytes from the file underlying a SegYReader.
+
+Each access strategy provides a read() method which returns a bytes-like
+object containing the data in a range of byte offsets within the file. The
+strategies differ in how the bytes are obtained, and so in their performance
+characteristics, in whether or not the data are copied, and in whether they
+can safely be used from several threads at once.
+
+Rather than constructing access objects directly, prefer to use the
+make_access() function with one of the access mode constants defined in this
+module.
+
+Where many ranges of bytes are required at once, plan_reads() can be used to
+coalesce them into a few large reads.
+"""
+
+import io
+import mmap
+import os
+import threading
+from collections import namedtuple
+
+STREAM_ACCESS = 'stream'
+MEMORY_MAP_ACCESS = 'mmap'
+POSITIONAL_ACCESS = 'pread'
+
+# Access modes which may be used from several threads at once
+THREAD_SAFE_ACCESS_MODES = (MEMORY_MAP_ACCESS, POSITIONAL_ACCESS)
+
+# Ranges separated by fewer unwanted bytes than this are read together by default
+COALESCE_MAX_GAP_NUM_BYTES = 64 * 1024
+
+# The largest read which plan_reads() will form by coalescing ranges
+COALESCE_MAX_READ_NUM_BYTES = 16 * 1024 * 1024
+
+# os.pread() is not available on all platforms
+_pread = getattr(os, 'pread', None)
+
+PlannedRead = namedtuple('PlannedRead', ['pos', 'num_bytes', 'extent_indexes'])
+
+
+class StreamAccess:
+    """Access file data by seeking and reading through a file-like object.
+
+    This strategy works with any seekable binary file-like object, including
+    in-memory streams. Each read() returns a new bytes object. As reads move the
+    position of the file-like object, this strategy must not be used from
+    several threads at once.
+    """
+
+    mode = STREAM_ACCESS
+
+    def __init__(self, fh):
+        self._fh = fh
+
+    def read(self, pos, num_bytes):
+        """Read bytes from the file.
+
+        Args:
+            pos: The file offset in bytes from the beginning of the file.
+
+            num_bytes: The number of bytes to be read.
+
+        Returns:
+            A bytes-like object containing at most num_bytes bytes. Fewer bytes
+            will be returned if the end of the file is reached.
+        """
+        self._fh.seek(pos, os.SEEK_SET)
+        return self._fh.read(num_bytes)
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, self._fh)
+
+
+class MemoryMapAccess:
+    """Access file data through a read-only memory map of the whole file.
+
+    No system calls are made to obtain data and read() returns memoryview
+    slices directly over the map, so no data are copied until they are
+    decoded. The file-like object must be backed by a real file descriptor.
+    This strategy may be used from several threads at once.
+    """
+
+    mode = MEMORY_MAP_ACCESS
+
+    def __init__(self, fh):
+        try:
+            fileno = fh.fileno()
+        except (AttributeError, io.UnsupportedOperation) as e:
+            raise TypeError("Memory-mapped access requires a file object with a file descriptor, "
+                            "but {!r} has none".format(fh)) from e
+        self._fh = fh
+        self._map = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+    def read(self, pos, num_bytes):
+        """Obtain a view of bytes in the file.
+
+        Args:
+            pos: The file offset in bytes from the beginning of the file.
+
+            num_bytes: The number of bytes to be viewed.
+
+        Returns:
+            A memoryview over the memory map, of at most num_bytes bytes. Fewer
+            bytes will be returned if the end of the file is reached.
+        """
+        return self._view[pos:pos + num_bytes]
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, self._fh)
+
+
+class PositionalAccess:
+    """Access file data with positional reads, which do not use the file position.
+
+    Each read() is a single os.pread() system call which specifies its own
+    offset, so there is no shared file position and reads may be made from
+    several threads at once, allowing many reads to be in progress together.
+    The file-like object must be backed by a real file descriptor. Where
+    os.pread() is not available, reads seek and read through the file-like
+    object while holding a lock, which is safe but not concurrent.
+    """
+
+    mode = POSITIONAL_ACCESS
+
+    def __init__(self, fh):
+        try:
+            self._fileno = fh.fileno()
+        except (AttributeError, io.UnsupportedOperation) as e:
+            raise TypeError("Positional access requires a file object with a file descriptor, "
+                            "but {!r} has none".format(fh)) from e
+        self._fh = fh
+        self._lock = threading.Lock()
+
+    def read(self, pos, num_bytes):
+        """Read bytes from the file.
+
+        Args:
+            pos: The file offset in bytes from the beginning of the file.
+
+            num_bytes: The number of bytes to be read.
+
+        Returns:
+            A bytes-like object containing at most num_bytes bytes. Fewer bytes
+            will be returned if the end of the file is reached.
+        """
+        if _pread is None:
+            with self._lock:
+                self._fh.seek(pos, os.SEEK_SET)
+                return self._fh.read(num_bytes)
+
+        data = _pread(self._fileno, num_bytes, pos)
+        if len(data) == num_bytes or not data:
+            return data
+        # Short reads are possible other than at the end of the file, so keep reading
+        chunks = [data]
+        num_bytes_read = len(data)
+        while num_bytes_read < num_bytes:
+            data = _pread(self._fileno, num_bytes - num_bytes_read, pos + num_bytes_read)
+            if not data:
+                break
+            chunks.append(data)
+            num_bytes_read += len(data)
+        return b''.join(chunks)
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, self._fh)
+
+
+ACCESS_MODES = {
+    STREAM_ACCESS: StreamAccess,
+    MEMORY_MAP_ACCESS: MemoryMapAccess,
+    POSITIONAL_ACCESS: PositionalAccess,
+}
+
+
+def make_access(fh, access_mode=STREAM_ACCESS):
+    """Create an access strategy object for a file.
+
+    Args:
+        fh: A file-like object open in binary mode.
+
+        access_mode: One of the access mode constants STREAM_ACCESS,
+            MEMORY_MAP_ACCESS or POSITIONAL_ACCESS.
+
+    Returns:
+        An object with a read(pos, num_bytes) method.
+
+    Raises:
+        ValueError: If access_mode is not recognised.
+        TypeError: If fh cannot be used with the requested access mode.
+    """
+    try:
+        access_class = ACCESS_MODES[access_mode]
+    except KeyError:
+        raise ValueError("Unrecognised access mode {!r}. Must be one of {}"
+                         .format(access_mode, ', '.join(map(repr, ACCESS_MODES))))
+    return access_class(fh)
+
+
+def plan_reads(extents, max_gap=COALESCE_MAX_GAP_NUM_BYTES, max_read_num_bytes=COALESCE_MAX_READ_NUM_BYTES):
+    """Coalesce ranges of bytes into a few large reads.
+
+    The ranges are sorted by position and neighbouring ranges are merged into
+    a single read where the gap between them is small enough that reading the
+    unwanted bytes in the gap is cheaper than making a separate read.
+
+    Args:
+        extents: An iterable series of (pos, num_bytes) 2-tuples giving the file
+            offset and length of each range of bytes required.
+
+        max_gap: The largest number of unwanted bytes between two ranges which
+            will be read in order to merge them into a single read. Overlapping
+            and adjacent ranges are always merged.
+
+        max_read_num_bytes: Ranges are not merged if the resulting read would be
+            longer than this number of bytes, although a single range longer
+            than this is read as a whole.
+
+    Returns:
+        A list of PlannedRead named tuples in order of position, each of which
+        contains the file offset and length of a read and a list of the indexes
+        into extents of the ranges lying within that read.
+
+    Raises:
+        ValueError: If max_gap or max_read_num_bytes is negative.
+    """
+    if max_gap < 0:
+        raise ValueError("max_gap {} is negative".format(max_gap))
+    if max_read_num_bytes < 0:
+        raise ValueError("max_read_num_bytes {} is negative".format(max_read_num_bytes))
+
+    extents = list(extents)
+    order = sorted(range(len(extents)), key=lambda extent_index: extents[extent_index][0])
+
+    reads = []
+    read_pos = read_end = None
+    extent_indexes = []
+    for extent_index in order:
+        pos, num_bytes = extents[extent_index]
+        end = pos + num_bytes
+        if extent_indexes and pos - read_end <= max_gap and max(end, read_end) - read_pos <= max_read_num_bytes:
+            read_end = max(end, read_end)
+        else:
+            if extent_indexes:
+                reads.append(PlannedRead(read_pos, read_end - read_pos, extent_indexes))
+            read_pos, read_end = pos, end
+            extent_indexes = []
+        extent_indexes.append(extent_index)
+    if extent_indexes:
+        reads.append(PlannedRead(read_pos, read_end - read_pos, extent_indexes))
+    return reads
@@ -0,0 +1,213 @@
+"""An asyncio interface for reading SEG Y data.
+
+The methods of SegYReader block while data are read from the file, which in
+an asyncio application stalls the event loop. An AsyncSegYReader wraps a
+SegYReader, providing coroutine methods which perform the reads in a pool of
+threads, so that the event loop continues to run while data are read, and
+many reads can be in progress at once.
+
+The wrapped reader must use one of the access modes in
+access.THREAD_SAFE_ACCESS_MODES, such as POSITIONAL_ACCESS, so that reads from
+several threads do not interfere with one another. The create_async_reader()
+coroutine creates a suitable reader without blocking the event loop.
+
+This module uses the async and await syntax, so requires Python 3.5 or later,
+although the rest of segpy supports Python 3.4.
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from segpy.access import POSITIONAL_ACCESS, THREAD_SAFE_ACCESS_MODES
+from segpy.reader import create_reader
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+
+async def create_async_reader(fh, max_concurrency=DEFAULT_MAX_CONCURRENCY, executor=None,
+                              access_mode=POSITIONAL_ACCESS, **kwargs):
+    """Create an AsyncSegYReader without blocking the event loop.
+
+    The reader is created by create_reader() in a worker thread.
+
+    Args:
+        fh: A file-like-object open in binary mode, as accepted by create_reader().
+
+        max_concurrency: The maximum number of reads in progress at once.
+
+        executor: An optional concurrent.futures.Executor in which reads are
+            performed. If None, a ThreadPoolExecutor is created with
+            max_concurrency workers, which is shut down when the reader is closed.
+
+        access_mode: One of the access modes in access.THREAD_SAFE_ACCESS_MODES.
+            Defaults to POSITIONAL_ACCESS.
+
+        **kwargs: Further keyword arguments for create_reader().
+
+    Returns:
+        An AsyncSegYReader.
+
+    Raises:
+        ValueError: If access_mode is not safe for use from several threads.
+    """
+    if access_mode not in THREAD_SAFE_ACCESS_MODES:
+        raise ValueError("Access mode {!r} cannot be used from several threads. Must be one of {}"
+                         .format(access_mode, ', '.join(map(repr, THREAD_SAFE_ACCESS_MODES))))
+    loop = asyncio.get_event_loop()
+    reader = await loop.run_in_executor(executor, partial(create_reader, fh, access_mode=access_mode, **kwargs))
+    return AsyncSegYReader(reader, max_concurrency, executor)
+
+
+class AsyncSegYReader:
+    """Provides coroutine methods for reading through a SegYReader.
+
+    Methods of the SegYReader which do not read from the file, such as
+    num_traces() or trace_index(), should be called directly on the wrapped
+    reader, which is available as the reader property.
+    """
+
+    def __init__(self, reader, max_concurrency=DEFAULT_MAX_CONCURRENCY, executor=None):
+        """Initialize an AsyncSegYReader.
+
+        Args:
+            reader: A SegYReader using one of the access modes in
+                access.THREAD_SAFE_ACCESS_MODES.
+
+            max_concurrency: The maximum number of reads in progress at once.
+
+            executor: An optional concurrent.futures.Executor in which reads are
+                performed. If None, a ThreadPoolExecutor is created with
+                max_concurrency workers, which is shut down when the reader is closed.
+
+        Raises:
+            ValueError: If the access mode of reader is not safe for use from
+                several threads, or if max_concurrency is less than one.
+        """
+        if reader.access_mode not in THREAD_SAFE_ACCESS_MODES:
+            raise ValueError("{} cannot be used with a reader with access mode {!r}. Must be one of {}"
+                             .format(self.__class__.__name__, reader.access_mode,
+                                     ', '.join(map(repr, THREAD_SAFE_ACCESS_MODES))))
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency {} is less than one".format(max_concurrency))
+        self._reader = reader
+        self._max_concurrency = max_concurrency
+        self._owns_executor = executor is None
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency) if executor is None else executor
+        self._semaphore = None
+
+    @property
+    def reader(self):
+        """The wrapped SegYReader."""
+        return self._reader
+
+    @property
+    def max_concurrency(self):
+        """The maximum number of reads in progress at once."""
+        return self._max_concurrency
+
+    async def trace_samples(self, trace_index, start=None, stop=None):
+        """Read a specific trace. See SegYReader.trace_samples()."""
+        return await self._run(self._reader.trace_samples, trace_index, start, stop)
+
+    async def trace_header(self, trace_index, header_packer_override=None, fields=None):
+        """Read a specific trace header. See SegYReader.trace_header()."""
+        return await self._run(self._reader.trace_header, trace_index, header_packer_override, fields)
+
+    async def trace_samples_many(self, trace_indexes, start=None, stop=None, **kwargs):
+        """Read the samples of many traces. See SegYReader.trace_samples_many()."""
+        return await self._run(self._reader.trace_samples_many, list(trace_indexes), start, stop, **kwargs)
+
+    async def trace_headers_many(self, trace_indexes, header_packer_override=None, **kwargs):
+        """Read the headers of many traces. See SegYReader.trace_headers_many()."""
+        return await self._run(self._reader.trace_headers_many, list(trace_indexes), header_packer_override,
+                               **kwargs)
+
+    async def trace_header_bytes_many(self, trace_indexes, **kwargs):
+        """Read the undecoded headers of many traces. See SegYReader.trace_header_bytes_many()."""
+        return await self._run(self._reader.trace_header_bytes_many, list(trace_indexes), **kwargs)
+
+    def traces(self, trace_indexes=None, start=None, stop=None):
+        """Iterate asynchronously over the samples of traces.
+
+        Up to max_concurrency traces are read ahead of the trace being yielded.
+
+        Args:
+            trace_indexes: An optional iterable series of trace indexes. If None,
+                all traces are read in order.
+
+            start: Optional zero-based start sample index, applied to every trace.
+
+            stop: Optional zero-based stop sample index, applied to every trace.
+
+        Returns:
+            An asynchronous iterator which yields a 2-tuple of trace index and
+            sequence of samples for each trace, in the order of trace_indexes.
+
+        Usage:
+
+            async for trace_index, samples in async_reader.traces():
+                process(trace_index, samples)
+        """
+        if trace_indexes is None:
+            trace_indexes = self._reader.trace_indexes()
+        return _AsyncTraceIterator(self, trace_indexes, start, stop, self._max_concurrency)
+
+    def close(self):
+        """Shut down the executor, if it was created by this reader.
+
+        This waits until any reads in progress are complete, so should not be
+        called from a coroutine. Leaving an async with block closes the reader
+        without blocking the event loop.
+
+        The wrapped reader and its file are not closed.
+        """
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        # Wait for reads in progress in another thread, so that the event loop continues to run
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self.close)
+
+    async def _run(self, function, *args, **kwargs):
+        if self._semaphore is None:
+            # Created on first use, so that it belongs to the running event loop
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        async with self._semaphore:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(self._executor, partial(function, *args, **kwargs))
+
+    def __repr__(self):
+        return "{}({!r}, max_concurrency={})".format(self.__class__.__name__, self._reader, self._max_concurrency)
+
+
+class _AsyncTraceIterator:
+
+    def __init__(self, async_reader, trace_indexes, start, stop, num_read_ahead):
+        self._async_reader = async_reader
+        self._trace_indexes = iter(trace_indexes)
+        self._start = start
+        self._stop = stop
+        self._num_read_ahead = num_read_ahead
+        self._pending = deque()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while len(self._pending) < self._num_read_ahead:
+            try:
+                trace_index = next(self._trace_indexes)
+            except StopIteration:
+                break
+            samples = asyncio.ensure_future(self._async_reader.trace_samples(trace_index, self._start, self._stop))
+            self._pending.append((trace_index, samples))
+        if not self._pending:
+            raise StopAsyncIteration
+        trace_index, samples = self._pending.popleft()
+        return trace_index, await samples
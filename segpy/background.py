@@ -0,0 +1,234 @@
+"""Construction of trace catalogs in a background thread.
+
+A BackgroundCataloguer scans the trace headers of a SEG Y file in a separate
+thread, so that a reader can be returned as soon as the reel headers have
+been read. The catalogs it provides are BackgroundCatalog mappings, which can
+be used immediately. Looking up the position or length of a trace waits only
+until that trace has been scanned, whereas any other use of a catalog, such
+as finding its length, waits until the scan is complete.
+"""
+
+import logging
+import threading
+from collections.abc import Mapping
+
+from segpy.toolkit import catalog_traces
+from segpy.trace_header import TraceHeaderRev1
+
+log = logging.getLogger(__name__)
+
+# The indexes of the catalogs within the 4-tuple returned by catalog_traces()
+TRACE_OFFSET_CATALOG_INDEX = 0
+TRACE_LENGTH_CATALOG_INDEX = 1
+CDP_CATALOG_INDEX = 2
+LINE_CATALOG_INDEX = 3
+
+
+class BackgroundCataloguer:
+    """Builds the catalogs of a SEG Y file in a background thread."""
+
+    def __init__(self, fh, bps, trace_header_format=TraceHeaderRev1, endian='>', progress=None,
+                 on_complete=None):
+        """Initialize a BackgroundCataloguer.
+
+        Scanning begins when start() is called.
+
+        Args:
+            fh: A file-like-object open in binary mode, positioned at the start
+                of the first trace header, which is used only by the cataloguer.
+                It will be closed when the scan is complete.
+
+            bps: The number of bytes per sample, such as obtained by a call
+                to bytes_per_sample()
+
+            trace_header_format: The class defining the trace header format.
+                Defaults to TraceHeaderRev1.
+
+            endian: '>' for big-endian data (the standard and default), '<'
+                for little-endian (non-standard)
+
+            progress: A unary callable which will be passed a number between zero
+                and one indicating the progress made. It is called from the
+                background thread.
+
+            on_complete: An optional callable which will be passed fh and the
+                4-tuple of catalogs returned by catalog_traces() once the scan is
+                complete, and before any threads waiting for the catalogs resume.
+                It is called from the background thread.
+        """
+        self._fh = fh
+        self._bps = bps
+        self._trace_header_format = trace_header_format
+        self._endian = endian
+        self._progress = progress
+        self._on_complete = on_complete
+
+        self._trace_offsets = []
+        self._trace_lengths = []
+        # The trace offsets and lengths scanned so far, or None once the catalogs are complete
+        self._partial = (self._trace_offsets, self._trace_lengths)
+        self._catalogs = None
+        self._error = None
+        self._num_waiting = 0
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='segpy-cataloguer', daemon=True)
+
+    def start(self):
+        """Begin scanning trace headers in the background."""
+        self._thread.start()
+
+    @property
+    def is_complete(self):
+        """True if the scan has finished, successfully or otherwise."""
+        return self._partial is None
+
+    def catalogs(self):
+        """A 4-tuple of BackgroundCatalog objects, in the order returned by catalog_traces()."""
+        return tuple(BackgroundCatalog(self, catalog_index)
+                     for catalog_index in (TRACE_OFFSET_CATALOG_INDEX, TRACE_LENGTH_CATALOG_INDEX,
+                                           CDP_CATALOG_INDEX, LINE_CATALOG_INDEX))
+
+    def wait(self, trace_index=None):
+        """Wait for part or all of the scan to complete.
+
+        Args:
+            trace_index: If not None, wait only until the trace with this index
+                has been scanned, or the scan is complete.
+
+        Raises:
+            Exception: Any exception raised by the scan is re-raised if the scan
+                has failed.
+        """
+        with self._condition:
+            self._num_waiting += 1
+            try:
+                while not self.is_complete and (trace_index is None or len(self._trace_offsets) <= trace_index):
+                    self._condition.wait()
+            finally:
+                self._num_waiting -= 1
+        if self._error is not None:
+            raise self._error
+
+    def completed_catalog(self, catalog_index):
+        """Wait for the scan to complete and obtain one of the catalogs.
+
+        Args:
+            catalog_index: The index of the catalog in the 4-tuple returned by
+                catalog_traces().
+
+        Returns:
+            The catalog, or an empty dictionary if no such catalog could be built.
+        """
+        self.wait()
+        catalog = self._catalogs[catalog_index]
+        return {} if catalog is None else catalog
+
+    def trace_value(self, catalog_index, trace_index):
+        """Look up the offset or length of a trace, waiting only until it has been scanned.
+
+        Args:
+            catalog_index: Either TRACE_OFFSET_CATALOG_INDEX or TRACE_LENGTH_CATALOG_INDEX.
+
+            trace_index: The zero-based index of the trace.
+
+        Returns:
+            The file offset of the trace header or the number of samples in the trace.
+
+        Raises:
+            KeyError: If there is no trace with the given index.
+        """
+        partial = self._partial
+        if partial is not None and isinstance(trace_index, int) and trace_index >= 0:
+            values = partial[catalog_index]
+            if trace_index >= len(values):
+                self.wait(trace_index)
+            if trace_index < len(values):
+                return values[trace_index]
+        return self.completed_catalog(catalog_index)[trace_index]
+
+    def _observe(self, trace_index, pos, num_samples):
+        self._trace_offsets.append(pos)
+        self._trace_lengths.append(num_samples)
+        # Waiters register before checking how many traces have been scanned, so none are missed
+        if self._num_waiting:
+            with self._condition:
+                self._condition.notify_all()
+
+    def _run(self):
+        catalogs = None
+        error = None
+        try:
+            with self._fh:
+                catalogs = catalog_traces(self._fh, self._bps, self._trace_header_format, self._endian,
+                                          self._progress, observer=self._observe)
+                if self._on_complete is not None:
+                    try:
+                        self._on_complete(self._fh, catalogs)
+                    except Exception as on_complete_error:
+                        log.warning("Could not complete cataloguing of {} because {}"
+                                    .format(self._fh, on_complete_error))
+        except Exception as scan_error:
+            log.warning("Could not catalog traces in {} because {}".format(self._fh, scan_error))
+            error = scan_error
+        with self._condition:
+            self._catalogs = catalogs
+            self._error = error
+            self._partial = None
+            self._condition.notify_all()
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, self._fh)
+
+
+class BackgroundCatalog(Mapping):
+    """A catalog which is being built by a BackgroundCataloguer.
+
+    Lookups in the trace offset and trace length catalogs wait only until the
+    requested trace has been scanned. All other operations wait until the scan
+    is complete, and are then delegated to the completed catalog.
+    """
+
+    def __init__(self, cataloguer, catalog_index):
+        self._cataloguer = cataloguer
+        self._catalog_index = catalog_index
+        self._is_trace_catalog = catalog_index in (TRACE_OFFSET_CATALOG_INDEX, TRACE_LENGTH_CATALOG_INDEX)
+
+    def completed(self):
+        """Wait for the scan to complete and obtain the completed catalog."""
+        return self._cataloguer.completed_catalog(self._catalog_index)
+
+    def __getitem__(self, key):
+        if self._is_trace_catalog:
+            return self._cataloguer.trace_value(self._catalog_index, key)
+        return self.completed()[key]
+
+    def __contains__(self, key):
+        if self._is_trace_catalog:
+            try:
+                self._cataloguer.trace_value(self._catalog_index, key)
+            except (KeyError, TypeError):
+                return False
+            return True
+        return key in self.completed()
+
+    def __len__(self):
+        return len(self.completed())
+
+    def __iter__(self):
+        return iter(self.completed())
+
+    def __getattr__(self, name):
+        # Expose attributes of the completed catalog, such as the i_range of 2D catalogs
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.completed(), name)
+
+    def __reduce__(self):
+        return _completed_catalog, (self.completed(),)
+
+    def __repr__(self):
+        return "{}({!r}, {})".format(self.__class__.__name__, self._cataloguer, self._catalog_index)
+
+
+def _completed_catalog(catalog):
+    return catalog
@@ -0,0 +1,375 @@
+"""Management of directories of cached reader indexes.
+
+A CacheManager owns a directory of index files, each identified by a key
+derived from the SEG Y file to which it relates. Entries are written
+atomically, so readers of the cache never see partially written entries,
+and the total size of the cache can be bounded, in which case the least
+recently used entries are evicted to make room for new ones.
+
+By default create_reader() caches indexes in a directory alongside each SEG Y
+file. A central cache shared by all SEG Y files can be configured for the
+current process by calling configure_cache(), or by setting the
+SEGPY_CACHE_DIRECTORY environment variable (and optionally
+SEGPY_CACHE_MAX_NUM_BYTES) before the first reader is created.
+
+Where the platform supports fcntl file locking, the creation of each entry
+can be coordinated between processes sharing a cache with CacheManager.lock(),
+so that an index is built by only one process while the others wait for it.
+"""
+
+import logging
+import os
+import tempfile
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from segpy.index import INDEX_FILE_EXTENSION
+from segpy.util import UNSET
+
+log = logging.getLogger(__name__)
+
+CACHE_DIRECTORY_ENV_VAR = 'SEGPY_CACHE_DIRECTORY'
+
+CACHE_MAX_NUM_BYTES_ENV_VAR = 'SEGPY_CACHE_MAX_NUM_BYTES'
+
+ENTRY_PERMISSIONS = 0o644
+
+LOCK_FILE_EXTENSION = '.lock'
+
+CacheEntry = namedtuple('CacheEntry', ['key', 'path', 'num_bytes', 'last_used'])
+
+
+class CacheManager:
+    """A directory of cache entries with an optional limit on its total size."""
+
+    def __init__(self, directory, max_num_bytes=None):
+        """Initialize a CacheManager.
+
+        The directory is created when the first entry is written.
+
+        Args:
+            directory: The path of the cache directory.
+
+            max_num_bytes: An optional limit on the total size in bytes of all
+                entries in the cache. If None (the default) the size of the
+                cache is unbounded.
+
+        Raises:
+            ValueError: If max_num_bytes is negative.
+        """
+        if max_num_bytes is not None and max_num_bytes < 0:
+            raise ValueError("max_num_bytes {} is negative".format(max_num_bytes))
+        self._directory = Path(directory)
+        self._max_num_bytes = max_num_bytes
+
+    @property
+    def directory(self):
+        """The path of the cache directory."""
+        return self._directory
+
+    @property
+    def max_num_bytes(self):
+        """The limit on the total size of the cache in bytes, or None if unbounded."""
+        return self._max_num_bytes
+
+    def entry_path(self, key):
+        """The path at which the entry for key is, or would be, stored."""
+        return self._directory / (key + INDEX_FILE_EXTENSION)
+
+    def lookup(self, key):
+        """Find the entry for a key, marking it as the most recently used.
+
+        Args:
+            key: The key of the entry.
+
+        Returns:
+            A Path to the entry, or None if there is no entry for key.
+        """
+        path = self.entry_path(key)
+        try:
+            os.utime(str(path))
+        except FileNotFoundError:
+            return None
+        except OSError as os_error:
+            # The cache may be read-only, in which case entries are still usable
+            log.debug("Could not update last use of cache entry {} because {}".format(path, os_error))
+            if not path.is_file():
+                return None
+        return path
+
+    def write(self, key, write_entry):
+        """Atomically create or replace the entry for a key.
+
+        The entry is written to a temporary file in the cache directory, which
+        is renamed to the entry path once complete. If the cache has a size limit,
+        least recently used entries are then evicted to bring the cache within
+        the limit.
+
+        Args:
+            key: The key of the entry.
+
+            write_entry: A unary callable which will be passed a file-like object
+                open for writing in binary mode, to which the entry should be
+                written.
+
+        Returns:
+            The Path to the entry.
+
+        Raises:
+            OSError: If the entry could not be written. Any exception raised by
+                write_entry is propagated, in which case no entry is created.
+        """
+        os.makedirs(str(self._directory), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=str(self._directory), prefix='.' + key, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                write_entry(temp_file)
+            # mkstemp() creates files readable only by their owner, but caches may be shared
+            os.chmod(temp_path, ENTRY_PERMISSIONS)
+            path = self.entry_path(key)
+            os.replace(temp_path, str(path))
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        if self._max_num_bytes is not None:
+            self.prune(keep=(key,))
+        return path
+
+    def lock_path(self, key):
+        """The path of the lock file for the entry for key."""
+        return self._directory / ('.' + key + LOCK_FILE_EXTENSION)
+
+    @contextmanager
+    def lock(self, key):
+        """A context manager which holds an exclusive lock on the entry for a key.
+
+        The lock is shared between all processes and threads using the same cache
+        directory, so it can be used to ensure that only one of them creates an
+        entry, while the others wait and then use the completed entry. The lock is
+        released when the context is exited, or if the process holding it exits.
+        Locks are advisory, so lookup() and write() do not require them.
+
+        Locking is not possible where the fcntl module is unavailable, or where
+        the lock file cannot be created, such as in a read-only cache. In these
+        cases the context is entered without the lock being held.
+
+        Args:
+            key: The key of the entry.
+
+        Returns:
+            A context manager, the value of which is True if the lock is held,
+            otherwise False.
+        """
+        if fcntl is None:
+            yield False
+            return
+
+        lock_file = self._acquire_lock_file(key)
+        if lock_file is None:
+            yield False
+            return
+
+        with lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _acquire_lock_file(self, key):
+        """Open and lock the lock file for key, returning None if it cannot be opened."""
+        path = self.lock_path(key)
+        while True:
+            try:
+                os.makedirs(str(self._directory), exist_ok=True)
+                lock_file = open(str(path), 'ab')
+            except OSError as os_error:
+                log.debug("Could not open lock file {} because {}".format(path, os_error))
+                return None
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            # The lock file may have been removed while waiting for the lock, in which case another
+            # holder could lock a new file at the same path, so the lock is taken again on that file
+            try:
+                if os.path.samestat(os.fstat(lock_file.fileno()), os.stat(str(path))):
+                    return lock_file
+            except FileNotFoundError:
+                pass
+            lock_file.close()
+
+    def _remove_lock_file(self, key):
+        """Remove the lock file for key, unless the lock is held."""
+        path = self.lock_path(key)
+        if fcntl is None:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            return
+
+        try:
+            lock_file = open(str(path), 'rb')
+        except OSError:
+            return
+        with lock_file:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                # The lock is held or awaited, so the file is still in use
+                return
+            try:
+                path.unlink()
+            except OSError as os_error:
+                log.debug("Could not remove lock file {} because {}".format(path, os_error))
+
+    def remove(self, key):
+        """Remove the entry for a key.
+
+        Args:
+            key: The key of the entry.
+
+        The lock file for the entry is also removed, unless the lock is held.
+
+        Returns:
+            True if an entry was removed, otherwise False.
+        """
+        try:
+            self.entry_path(key).unlink()
+        except FileNotFoundError:
+            return False
+        finally:
+            self._remove_lock_file(key)
+        return True
+
+    def entries(self):
+        """The entries in the cache.
+
+        Returns:
+            A list of CacheEntry objects in order of least to most recently used.
+        """
+        try:
+            names = os.listdir(str(self._directory))
+        except FileNotFoundError:
+            return []
+        entries = []
+        for name in names:
+            if name.startswith('.') or not name.endswith(INDEX_FILE_EXTENSION):
+                continue
+            path = self._directory / name
+            try:
+                status = os.stat(str(path))
+            except FileNotFoundError:
+                continue
+            entries.append(CacheEntry(key=name[:-len(INDEX_FILE_EXTENSION)],
+                                      path=path,
+                                      num_bytes=status.st_size,
+                                      last_used=status.st_mtime))
+        entries.sort(key=lambda entry: entry.last_used)
+        return entries
+
+    def total_num_bytes(self):
+        """The total size in bytes of all entries in the cache."""
+        return sum(entry.num_bytes for entry in self.entries())
+
+    def prune(self, max_num_bytes=None, max_age=None, keep=()):
+        """Evict entries from the cache.
+
+        The lock files of evicted entries are also removed, unless the lock is held.
+
+        Args:
+            max_num_bytes: Least recently used entries are evicted until the
+                total size of the cache does not exceed this number of bytes. If
+                None, the size limit of the cache manager is used.
+
+            max_age: An optional age in seconds. Entries which have not been used
+                for longer than this are evicted.
+
+            keep: An iterable series of keys for entries which should not be evicted.
+
+        Returns:
+            A list of the evicted CacheEntry objects.
+        """
+        if max_num_bytes is None:
+            max_num_bytes = self._max_num_bytes
+        keep = frozenset(keep)
+        entries = self.entries()
+        total_num_bytes = sum(entry.num_bytes for entry in entries)
+        oldest_allowed = None if max_age is None else time.time() - max_age
+
+        evicted = []
+        for entry in entries:
+            if entry.key in keep:
+                continue
+            too_big = max_num_bytes is not None and total_num_bytes > max_num_bytes
+            too_old = oldest_allowed is not None and entry.last_used < oldest_allowed
+            if not (too_big or too_old):
+                continue
+            try:
+                entry.path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as os_error:
+                log.warning("Could not evict cache entry {} because {}".format(entry.path, os_error))
+                continue
+            self._remove_lock_file(entry.key)
+            total_num_bytes -= entry.num_bytes
+            evicted.append(entry)
+        return evicted
+
+    def clear(self):
+        """Remove all entries from the cache.
+
+        Returns:
+            A list of the removed CacheEntry objects.
+        """
+        return self.prune(max_num_bytes=0)
+
+    def __repr__(self):
+        return "{}(directory={!r}, max_num_bytes={!r})".format(
+            self.__class__.__name__, str(self._directory), self._max_num_bytes)
+
+
+_configured_cache = UNSET
+
+
+def configure_cache(directory, max_num_bytes=None):
+    """Configure a central cache for all readers created in this process.
+
+    Args:
+        directory: The path of the cache directory, or None to revert to caching
+            alongside each SEG Y file.
+
+        max_num_bytes: An optional limit on the total size of the cache in bytes.
+
+    Returns:
+        The configured CacheManager, or None.
+    """
+    global _configured_cache
+    _configured_cache = None if directory is None else CacheManager(directory, max_num_bytes)
+    return _configured_cache
+
+
+def configured_cache():
+    """The central cache for this process.
+
+    If no cache has been configured by calling configure_cache(), a cache will be
+    configured from the SEGPY_CACHE_DIRECTORY and SEGPY_CACHE_MAX_NUM_BYTES
+    environment variables, if they are set.
+
+    Returns:
+        A CacheManager, or None if no central cache has been configured.
+    """
+    if _configured_cache is UNSET:
+        max_num_bytes = os.environ.get(CACHE_MAX_NUM_BYTES_ENV_VAR)
+        configure_cache(os.environ.get(CACHE_DIRECTORY_ENV_VAR) or None,
+                        None if max_num_bytes is None else int(max_num_bytes))
+    return _configured_cache
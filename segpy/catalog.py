@@ -8,8 +8,8 @@ Rather than constructing Catalog subtypes directly, prefer to use
 the CatalogBuilder class which will analyse the contents of the
 mapping to find a space and time efficient representation.
 """
+from bisect import bisect_left, bisect_right
 from collections import Mapping, Sequence, OrderedDict, Iterable
-from fractions import Fraction
 from itertools import product
 
 from segpy.sorted_frozen_set import SortedFrozenSet
@@ -434,6 +434,157 @@ class DictionaryCatalog(Mapping):
             self.__class__.__name__, len(self._items))
 
 
+class ArrayCatalog(Mapping):
+    """An immutable mapping backed by parallel sequences of keys and values.
+
+    The keys must be sorted and distinct. The sequences can be any indexable
+    sequences, such as arrays or memoryviews over memory-mapped data, so large
+    catalogs can be used without first being copied into Python objects.
+    """
+
+    def __init__(self, keys, values):
+        """Initialize an ArrayCatalog.
+
+        Args:
+            keys: A sequence of sorted, distinct keys.
+            values: A sequence of values corresponding to the keys.
+
+        Raises:
+            ValueError: If keys and values have different lengths.
+        """
+        if len(keys) != len(values):
+            raise ValueError("{} keys with length {} and values with length {} are inconsistent"
+                             .format(self.__class__.__name__, len(keys), len(values)))
+        self._keys = keys
+        self._values = values
+
+    @property
+    def keys_array(self):
+        """The sequence of keys."""
+        return self._keys
+
+    @property
+    def values_array(self):
+        """The sequence of values."""
+        return self._values
+
+    def _index(self, key):
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            return index
+        return None
+
+    def __getitem__(self, key):
+        index = self._index(key)
+        if index is None:
+            raise KeyError("{!r} does not contain key {!r}".format(self, key))
+        return self._values[index]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        try:
+            return self._index(key) is not None
+        except TypeError:
+            return False
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __reduce__(self):
+        return self.__class__, (list(self._keys), list(self._values))
+
+    def __repr__(self):
+        return '{}(keys=[{} items], values=[{} items])'.format(
+            self.__class__.__name__,
+            len(self._keys),
+            len(self._values))
+
+
+class ArrayCatalog2D(Catalog2D):
+    """An immutable mapping for 2D keys backed by parallel sequences of key components and values.
+
+    The (i, j) keys must be sorted first by i and then by j, and must be distinct. As
+    for ArrayCatalog, the sequences can be arrays or memoryviews over memory-mapped data.
+    """
+
+    def __init__(self, i_range, j_range, i_keys, j_keys, values):
+        """Initialize an ArrayCatalog2D.
+
+        Args:
+            i_range: A sorted sequence of the distinct i values.
+            j_range: A sorted sequence of the distinct j values.
+            i_keys: A sequence of the i component of each key.
+            j_keys: A sequence of the j component of each key.
+            values: A sequence of values corresponding to the keys.
+
+        Raises:
+            ValueError: If i_keys, j_keys and values have different lengths, or if
+                either i_range or j_range are not totally sorted.
+        """
+        super().__init__(i_range, j_range)
+        if not (len(i_keys) == len(j_keys) == len(values)):
+            raise ValueError("{} i keys with length {}, j keys with length {} and values with length {} "
+                             "are inconsistent".format(self.__class__.__name__,
+                                                       len(i_keys), len(j_keys), len(values)))
+        self._i_keys = i_keys
+        self._j_keys = j_keys
+        self._values = values
+
+    @property
+    def i_keys_array(self):
+        """The sequence of i key components."""
+        return self._i_keys
+
+    @property
+    def j_keys_array(self):
+        """The sequence of j key components."""
+        return self._j_keys
+
+    @property
+    def values_array(self):
+        """The sequence of values."""
+        return self._values
+
+    def _index(self, key):
+        i, j = key
+        i_begin = bisect_left(self._i_keys, i)
+        i_end = bisect_right(self._i_keys, i, i_begin)
+        index = bisect_left(self._j_keys, j, i_begin, i_end)
+        if index < i_end and self._j_keys[index] == j:
+            return index
+        return None
+
+    def __getitem__(self, key):
+        index = self._index(key)
+        if index is None:
+            raise KeyError("{!r} does not contain key {!r}".format(self, key))
+        return self._values[index]
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, key):
+        try:
+            return self._index(key) is not None
+        except (TypeError, ValueError):
+            return False
+
+    def __iter__(self):
+        return zip(self._i_keys, self._j_keys)
+
+    def __reduce__(self):
+        return self.__class__, (list(self.i_range), list(self.j_range),
+                                list(self._i_keys), list(self._j_keys), list(self._values))
+
+    def __repr__(self):
+        return '{}(i_range={}, j_range={}, items=[<{} items>])'.format(
+            self.__class__.__name__,
+            self.i_range, self.j_range,
+            len(self._values))
+
+
 class DictionaryCatalog2D(Catalog2D):
     """An immutable, ordered, dictionary mapping for 2D keys.
     """
@@ -737,9 +888,6 @@ class LinearRegularCatalog(Mapping):
                                  num_keys,
                                  num_values))
 
-        self._m = Fraction(self._value_stop - self._value_start,
-                           self._key_max - self._key_min)
-
     def __getitem__(self, key):
         if not (self._key_min <= key <= self._key_max):
             raise KeyError("{!r} key {!r} out of range".format(self, key))
@@ -747,9 +895,8 @@ class LinearRegularCatalog(Mapping):
         if offset % self._key_stride != 0:
             raise KeyError("{!r} does not contain key {!r}".format(self, key))
 
-        v = self._m * (key - self._key_min) + self._value_start
-        assert v.denominator == 1
-        return v.numerator
+        # The numbers of keys and values are equal, so each key stride corresponds to one value stride
+        return self._value_start + (offset // self._key_stride) * self._value_stride
 
     def __len__(self):
         return 1 + (self._key_max - self._key_min) // self._key_stride
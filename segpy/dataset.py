@@ -1,7 +1,21 @@
 from abc import ABCMeta, abstractmethod
+from collections import namedtuple
 
 from segpy.datatypes import DATA_SAMPLE_FORMAT_TO_SEG_Y_TYPE, SEG_Y_TYPE_DESCRIPTION
 
+RawTraceSamples = namedtuple('RawTraceSamples', ['data', 'seg_y_type', 'endian'])
+RawTraceSamples.__doc__ = """The encoded samples of a trace.
+
+    Attributes:
+        data: A bytes-like object containing the encoded samples.
+
+        seg_y_type: The SEG Y data type of the samples, such as 'ibm'.
+
+        endian: '>' for big-endian samples, '<' for little-endian. IBM float
+            samples are always big-endian, and the endianness of single byte
+            samples is immaterial.
+    """
+
 
 class Dataset(metaclass=ABCMeta):
 
@@ -76,6 +90,63 @@ class Dataset(metaclass=ABCMeta):
         """
         raise NotImplementedError
 
+    def trace_samples_raw(self, trace_index, start=None, stop=None):
+        """The encoded trace samples for a given trace index, if available.
+
+        Datasets which hold encoded samples, such as a SegYReader, may override
+        this so the samples can be copied without being decoded and encoded
+        again. The default implementation returns None.
+
+        Args:
+            trace_index: An integer in the range zero to num_traces - 1
+
+            start: Optional zero-based start sample index. The default
+                is to read from the first (i.e. zeroth) sample.
+
+            stop: Optional zero-based stop sample index. Following Python
+                slice convention this is one beyond the end.
+
+        Returns:
+            A RawTraceSamples containing the encoded samples, or None if the
+            encoded samples are not available.
+        """
+        return None
+
+    def trace_samples_many(self, trace_indexes, start=None, stop=None):
+        """The trace samples for many trace indexes.
+
+        Subclasses may override this to read many traces more efficiently than
+        by calling trace_samples() for each.
+
+        Args:
+            trace_indexes: An iterable series of integers in the range zero to
+                num_traces - 1
+
+            start: Optional zero-based start sample index, applied to every trace.
+
+            stop: Optional zero-based stop sample index, applied to every trace.
+
+        Returns:
+            A list containing a sequence of numeric samples for each trace index,
+            in the same order as trace_indexes.
+        """
+        return [self.trace_samples(trace_index, start, stop) for trace_index in trace_indexes]
+
+    def trace_headers_many(self, trace_indexes):
+        """The trace headers for many trace indexes.
+
+        Subclasses may override this to read many trace headers more efficiently
+        than by calling trace_header() for each.
+
+        Args:
+            trace_indexes: An iterable series of integers in the range zero to
+                num_traces() - 1
+
+        Returns:
+            A list of TraceHeaders, in the same order as trace_indexes.
+        """
+        return [self.trace_header(trace_index) for trace_index in trace_indexes]
+
     @property
     def data_sample_format(self):
         """The data type of the samples in machine-readable form. One of the values from datatypes.DATA_SAMPLE_FORMAT.
@@ -106,6 +177,15 @@ class DelegatingDataset(Dataset):
     def trace_samples(self, trace_index, start=None, stop=None):
         return self._source.trace_samples(trace_index, start, stop)
 
+    def trace_samples_raw(self, trace_index, start=None, stop=None):
+        # The encoded samples of the source are only those of this dataset if the samples are not transformed
+        if type(self).trace_samples is not DelegatingDataset.trace_samples:
+            return None
+        source_trace_samples_raw = getattr(self._source, 'trace_samples_raw', None)
+        if source_trace_samples_raw is None:
+            return None
+        return source_trace_samples_raw(trace_index, start, stop)
+
     @property
     def textual_reel_header(self):
         return self._source.textual_reel_header
@@ -1,5 +1,4 @@
 from collections import OrderedDict
-from weakref import WeakKeyDictionary
 from itertools import chain
 
 from segpy import __version__
@@ -8,7 +7,19 @@ from segpy.util import underscores_to_camelcase, first_sentence, super_class, co
 
 
 class Header:
-    """An abstract base class for header format definitions."""
+    """An abstract base class for header format definitions.
+
+    The field values of each header instance are stored in a single list, in
+    the order given by ordered_field_names(), and header classes have no
+    instance dictionary, so that many headers can be held in memory.
+    """
+
+    __slots__ = ('_values',)
+
+    # The names and default values of all fields, including those of base classes.
+    # These are set for each header class by FormatMeta.
+    _all_field_names = ()
+    _field_defaults = ()
 
     def __init__(self, *args, **kwargs):
         """Initialise a header instance.
@@ -25,7 +36,9 @@ class Header:
         Raises:
             TypeError: If keyword argument names do not correspond to header fields.
         """
-        for keyword, arg in zip(self.ordered_field_names(), args):
+        self._values = list(self._field_defaults)
+
+        for keyword, arg in zip(self._all_field_names, args):
             setattr(self, keyword, arg)
 
         for keyword, arg in kwargs.items():
@@ -71,9 +84,9 @@ class Header:
             ', '.join("{}={}".format(k, getattr(self, k)) for k in self.ordered_field_names()))
 
     def __getstate__(self):
-        state = self.__dict__.copy()
+        state = {}
         state['__version__'] = __version__
-        state['_all_attributes'] = OrderedDict((name, getattr(self, name)) for name in self._ordered_field_names)
+        state['_all_attributes'] = OrderedDict((name, getattr(self, name)) for name in self._all_field_names)
         return state
 
     def __setstate__(self, state):
@@ -84,10 +97,9 @@ class Header:
                                     __version__))
         del state['__version__']
 
+        self._values = list(self._field_defaults)
         for name, value in state['_all_attributes'].items():
             setattr(self, name, value)
-        del state['_all_attributes']
-        self.__dict__.update(state)
 
 
 def are_equal(self, other):
@@ -124,6 +136,9 @@ class FormatMeta(type):
         if Header not in transitive_bases:
             bases = (Header,) + bases
 
+        # Field values are stored by Header, so instances need no dictionary
+        namespace.setdefault('__slots__', ())
+
         for attr_name, attr in namespace.items():
 
             # This shenanigans is necessary so we can have all the following work is a useful way
@@ -141,7 +156,15 @@ class FormatMeta(type):
                 attr_class.__name__ = underscores_to_camelcase(attr_name)
                 attr_class.__doc__ = attr.documentation
 
-        return super().__new__(mcs, name, bases, namespace)
+        cls = super().__new__(mcs, name, bases, namespace)
+
+        # Fields inherited from base classes come first, so their indexes are the same in every class
+        cls._all_field_names = cls.ordered_field_names()
+        num_inherited_fields = len(cls._all_field_names) - len(cls._ordered_field_names)
+        for index, field_name in enumerate(cls._ordered_field_names, start=num_inherited_fields):
+            namespace[field_name]._index = index
+        cls._field_defaults = tuple(getattr(cls, field_name).default for field_name in cls._all_field_names)
+        return cls
 
 
 def is_public_non_field_attr(name, attr):
@@ -200,6 +223,40 @@ class SubFormatMeta(FormatMeta):
         super().__init__(name, bases, namespace)
 
 
+# Sub-formats which have been created by make_sub_format(), keyed by (parent_format, parent_field_names)
+_sub_formats = {}
+
+
+def make_sub_format(parent_format, parent_field_names):
+    """Obtain a format class which has a subset of the fields in an existing format class.
+
+    Sub-formats are created once for each parent format and sequence of field names, and
+    are thereafter shared by all callers, so that repeated requests cost only a dictionary
+    lookup.
+
+    Args:
+        parent_format: The format class from which fields will be duplicated.
+
+        parent_field_names: An iterable series of field names which the sub-format should
+            duplicate from the parent_format, in order.
+
+    Returns:
+        A format class created by SubFormatMeta.
+    """
+    parent_field_names = tuple(parent_field_names)
+    key = (parent_format, parent_field_names)
+    try:
+        return _sub_formats[key]
+    except KeyError:
+        pass
+
+    sub_format = SubFormatMeta('{}SubFormat'.format(parent_format.__name__), (), OrderedDict(),
+                               parent_format=parent_format,
+                               parent_field_names=parent_field_names)
+    # If another thread has created the same sub-format in the meantime, use that one
+    return _sub_formats.setdefault(key, sub_format)
+
+
 class NamedField:
     """Instances of NamedField can be detected by the NamedDescriptorResolver metaclass."""
 
@@ -278,7 +335,7 @@ class HeaderFieldDescriptor:
 
     def __init__(self, value_type, offset, default, documentation):
         self._named_field = NamedField(value_type, offset, default, documentation)
-        self._instance_data = WeakKeyDictionary()
+        self._index = None  # The index of the field value in Header._values. Set later by the metaclass
 
     @property
     def _name(self):
@@ -302,14 +359,12 @@ class HeaderFieldDescriptor:
         """
         if instance is None:
             return self._named_field
-        if instance not in self._instance_data:
-            return self._named_field.default
-        return self._instance_data[instance]
+        return instance._values[self._index]
 
     def __set__(self, instance, value):
         """Set the field value."""
         try:
-            self._instance_data[instance] = self._named_field._value_type(value)
+            instance._values[self._index] = self._named_field._value_type(value)
         except ValueError as e:
             raise ValueError("Assigned value {!r} for {} attribute must be convertible to {}: {}"
                              .format(value, self._name, self._named_field._value_type.__name__, e)) from e
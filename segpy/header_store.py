@@ -0,0 +1,128 @@
+"""A compact binary format for persisting columns of trace header values.
+
+Obtaining a few fields from every trace header of a SEG Y file requires every
+trace header to be read and decoded. A header store records the values of
+selected fields for all traces as one typed array per field, so that they can
+subsequently be obtained without reading the SEG Y file. The arrays are
+memory mapped when the store is loaded, so loading takes the same time however
+many traces the SEG Y file contains.
+
+The layout of a header store file is:
+
+    magic           8 bytes    HEADER_STORE_MAGIC
+    format version  4 bytes    unsigned, little-endian
+    metadata length 4 bytes    unsigned, little-endian
+    metadata        UTF-8 encoded JSON, padded to a multiple of eight bytes
+    columns         integer arrays in the byte order given in the metadata,
+                    each aligned to a multiple of eight bytes
+
+As with index files, the format version is changed only when the layout changes.
+The layout is shared with index files, and is read and written by segpy.mapped_arrays.
+"""
+
+from collections import OrderedDict
+
+from segpy.datatypes import SEG_Y_TYPE_TO_CTYPE
+from segpy.mapped_arrays import padding, read_metadata, write_metadata
+
+HEADER_STORE_MAGIC = b'SEGPYHDR'
+
+HEADER_STORE_FORMAT_VERSION = 1
+
+# The array typecodes which can be used for columns, all of which are also struct format characters
+_COLUMN_TYPECODES = frozenset('bBhHiI')
+
+
+class HeaderStoreFormatError(Exception):
+    """Raised when a header store file cannot be read with this version of segpy."""
+    pass
+
+
+def column_typecode(header_format_class, field_name):
+    """The array typecode of the column for a header field.
+
+    Args:
+        header_format_class: The header format class defining the field.
+
+        field_name: The name of the field.
+
+    Returns:
+        A typecode for array.array with the same size as the field in the header.
+
+    Raises:
+        AttributeError: If the field does not exist in header_format_class.
+        ValueError: If the field does not have an integer type.
+    """
+    typecode = SEG_Y_TYPE_TO_CTYPE[getattr(header_format_class, field_name).value_type.SEG_Y_TYPE]
+    if typecode not in _COLUMN_TYPECODES:
+        raise ValueError("Field {!r} of {} does not have an integer type"
+                         .format(field_name, header_format_class.__name__))
+    return typecode
+
+
+def write_header_store(fh, metadata, columns):
+    """Write a header store to a file.
+
+    Args:
+        fh: A file-like object open for writing in binary mode.
+
+        metadata: A dictionary of JSON-serializable values describing the SEG Y
+            file to which the columns relate.
+
+        columns: A mapping from field names to array.array objects, each with an
+            integer typecode, containing the value of the field for each trace.
+    """
+    descriptions = []
+    pos = 0
+    for field_name, column in columns.items():
+        if column.typecode not in _COLUMN_TYPECODES:
+            raise TypeError("Column {!r} has unsupported typecode {!r}".format(field_name, column.typecode))
+        num_bytes = len(column) * column.itemsize
+        descriptions.append({'name': field_name, 'typecode': column.typecode, 'pos': pos, 'count': len(column)})
+        pos += num_bytes + padding(num_bytes)
+
+    header = dict(metadata)
+    header['columns'] = descriptions
+    write_metadata(fh, HEADER_STORE_MAGIC, HEADER_STORE_FORMAT_VERSION, header)
+    for column in columns.values():
+        column_bytes = column.tobytes()
+        fh.write(column_bytes)
+        fh.write(bytes(padding(len(column_bytes))))
+
+
+def read_header_store(fh):
+    """Read a header store from a file.
+
+    The columns are memory mapped, so fh must be a real file. The memory map
+    remains open for as long as the columns are in use.
+
+    Args:
+        fh: A file-like object open for reading in binary mode.
+
+    Returns:
+        A 2-tuple containing the metadata dictionary and an OrderedDict mapping
+        field names to columns of integers. Each column is a memoryview with the
+        typecode of the column as its format, in the native byte order, whatever
+        the byte order in which the header store was written.
+
+    Raises:
+        HeaderStoreFormatError: If fh does not contain a header store in a format
+            which can be read by this version of segpy.
+    """
+    header, arrays = read_metadata(fh, HEADER_STORE_MAGIC, HEADER_STORE_FORMAT_VERSION, HeaderStoreFormatError,
+                                   "Header store file")
+    try:
+        descriptions = header.pop('columns')
+    except KeyError as e:
+        raise HeaderStoreFormatError("Header store file metadata is corrupt") from e
+
+    columns = OrderedDict()
+    try:
+        for description in descriptions:
+            typecode = description['typecode']
+            if typecode not in _COLUMN_TYPECODES:
+                raise HeaderStoreFormatError("Header store column typecode {!r} is not supported".format(typecode))
+            columns[description['name']] = arrays.array_at(description['pos'], description['count'], typecode)
+    except (KeyError, TypeError) as e:
+        raise HeaderStoreFormatError("Header store file column descriptions are corrupt") from e
+    return header, columns
@@ -0,0 +1,118 @@
+"""Conversion of IBM floats using Numpy.
+
+Whole arrays of IBM floats are converted by manipulating their bits with Numpy,
+so that no Python object is created for each value. The results are identical
+to those of ibm2ieee() and ieee2ibm() in segpy.ibm_float, including the
+handling of subnormal values and of values which cannot be represented.
+
+This module requires Numpy, and importing it will raise ImportError if Numpy is
+not installed.
+"""
+
+from array import array
+
+import numpy
+
+from segpy.ibm_float import MIN_IBM_FLOAT, MAX_IBM_FLOAT, EXPONENT_BIAS, MAX_BITS_PRECISION_IBM_FLOAT
+
+_SIGN_MASK = 0x80000000
+_EXPONENT_MASK = 0x7f
+_MANTISSA_MASK = 0x00ffffff
+
+# Shifting the 24-bit mantissa right by this many bits, or more, always leaves zero
+_MAX_MANTISSA_SHIFT = 32
+
+
+def unpack_ibm_floats_numpy(data, num_items):
+    """Unpack a series of binary-encoded big-endian single-precision IBM floats.
+
+    Args:
+        data: A bytes-like object.
+
+        num_items: The number of floats to be read.
+
+    Returns:
+        An array.array of double-precision floats, which can represent every
+        IBM float exactly.
+    """
+    words = numpy.frombuffer(data, dtype='>u4', count=num_items)
+    mantissas = (words & _MANTISSA_MASK).astype(numpy.float64)
+    exponents = ((words >> 24) & _EXPONENT_MASK).astype(numpy.int32)
+    values = numpy.ldexp(mantissas, 4 * (exponents - EXPONENT_BIAS) - MAX_BITS_PRECISION_IBM_FLOAT)
+    # Zero is positive whatever the sign bit, as with ibm2ieee()
+    numpy.negative(values, out=values, where=(words & _SIGN_MASK != 0) & (mantissas != 0))
+    result = array('d')
+    result.frombytes(values.tobytes())
+    return result
+
+
+def pack_ibm_floats_numpy(values):
+    """Pack floats into binary-encoded big-endian single-precision IBM floats.
+
+    Args:
+        values: An iterable series of numeric values.
+
+    Returns:
+        A bytes object.
+
+    Raises:
+        OverflowError: If a value is outside the representable range.
+        ValueError: If a value is NaN or infinite.
+        FloatingPointError: If a value cannot be represented without total loss of precision.
+
+        As with ieee2ibm(), the exception raised is that for the first value which
+        cannot be represented.
+    """
+    if isinstance(values, (bytes, bytearray)) or not hasattr(values, '__len__'):
+        values = list(values)
+    values = numpy.asarray(values, dtype=numpy.float64).ravel()
+
+    is_zero = values == 0
+    is_non_finite = ~numpy.isfinite(values)
+    is_out_of_range = ~is_non_finite & ((values < MIN_IBM_FLOAT) | (values > MAX_IBM_FLOAT))
+
+    fractions, exponents = numpy.frexp(values)
+    with numpy.errstate(invalid='ignore'):
+        # The mantissas of non-finite values are meaningless, but they are rejected below
+        mantissas = numpy.trunc(numpy.abs(fractions) * 2.0 ** MAX_BITS_PRECISION_IBM_FLOAT).astype(numpy.int64)
+
+    # Adjust the exponent, and the mantissa in sympathy, so it is a multiple of four
+    remainders = exponents % 4
+    shifts = numpy.where(remainders != 0, 4 - remainders, 0)
+    mantissas >>= shifts
+    exponents_16_biased = ((exponents + shifts) >> 2) + EXPONENT_BIAS
+
+    # If the biased exponent is negative, use a subnormal representation
+    is_subnormal = exponents_16_biased < 0
+    subnormal_shifts = numpy.minimum(numpy.where(is_subnormal, -4 * exponents_16_biased, 0), _MAX_MANTISSA_SHIFT)
+    mantissas >>= subnormal_shifts
+    exponents_16_biased[is_subnormal] = 0
+    is_underflow = ~is_zero & ~is_non_finite & ~is_out_of_range & is_subnormal & (mantissas == 0)
+
+    is_invalid = is_non_finite | is_out_of_range | is_underflow
+    if is_invalid.any():
+        _raise_for_invalid(values, int(numpy.argmax(is_invalid)), is_non_finite, is_out_of_range)
+
+    words = ((numpy.where(values < 0, _SIGN_MASK, 0)
+              | (exponents_16_biased.astype(numpy.int64) << 24)
+              | mantissas)
+             .astype('>u4'))
+    # There are many potential representations of zero - this is the standard one
+    words[is_zero] = 0
+    return words.tobytes()
+
+
+def _raise_for_invalid(values, index, is_non_finite, is_out_of_range):
+    f = float(values[index])
+    if is_non_finite[index]:
+        if numpy.isnan(f):
+            raise ValueError("NaN cannot be represented in IBM floating point")
+        raise ValueError("Infinities cannot be represented in IBM floating point")
+    if is_out_of_range[index]:
+        if f < MIN_IBM_FLOAT:
+            raise OverflowError("IEEE Floating point value {} is less than the "
+                                "representable minimum for IBM floats.".format(f))
+        raise OverflowError("IEEE Floating point value {} is greater than the "
+                            "representable maximum for IBM floats".format(f))
+    raise FloatingPointError("IEEE Floating point value {} is smaller than the "
+                             "smallest subnormal number for IBM floats.".format(f))
@@ -0,0 +1,188 @@
+"""A compact binary format for persisting the catalogs of a SegYReader.
+
+An index file records the trace catalogs built by scanning a SEG Y file,
+together with the few other facts needed to reconstruct a reader for that
+file. Regular catalogs are stored as the handful of parameters which define
+them. Irregular catalogs are stored as typed arrays of 64-bit integers which
+are memory mapped when the index is loaded, so loading takes the same time
+however many traces the SEG Y file contains.
+
+The layout of an index file is:
+
+    magic           8 bytes    INDEX_MAGIC
+    format version  4 bytes    unsigned, little-endian
+    metadata length 4 bytes    unsigned, little-endian
+    metadata        UTF-8 encoded JSON, padded to a multiple of eight bytes
+    arrays          int64 arrays in the byte order given in the metadata,
+                    each aligned to a multiple of eight bytes
+
+The format version is independent of the segpy version, and is changed only
+when the layout changes, so index files remain readable across upgrades of
+segpy which do not affect them. The layout is shared with header stores, and is
+read and written by segpy.mapped_arrays.
+"""
+
+from array import array
+
+from segpy.catalog import (ArrayCatalog, ArrayCatalog2D, Catalog2D, FirstIndexVariesQuickestCatalog2D,
+                           LastIndexVariesQuickestCatalog2D, LinearRegularCatalog, RegularConstantCatalog)
+from segpy.mapped_arrays import read_metadata, write_metadata
+from segpy.util import first, make_sorted_distinct_sequence
+
+INDEX_MAGIC = b'SEGPYIDX'
+
+INDEX_FORMAT_VERSION = 1
+
+INDEX_FILE_EXTENSION = '.idx'
+
+CATALOG_NAMES = ('trace_offset', 'trace_length', 'cdp', 'line')
+
+_ARRAY_TYPECODE = 'q'
+
+_ARRAY_ITEM_NUM_BYTES = 8
+
+
+class IndexFormatError(Exception):
+    """Raised when an index file cannot be read with this version of segpy."""
+    pass
+
+
+def write_index(fh, metadata, catalogs):
+    """Write an index to a file.
+
+    Args:
+        fh: A file-like object open for writing in binary mode.
+
+        metadata: A dictionary of JSON-serializable values describing the SEG Y
+            file to which the catalogs relate.
+
+        catalogs: A mapping from the names in CATALOG_NAMES to catalogs, or to None
+            if there is no such catalog. Catalog keys and values must be integers
+            representable in 64 bits, or pairs of such integers for 2D keys.
+
+    Raises:
+        TypeError: If a catalog contains keys or values which cannot be represented.
+        OverflowError: If a catalog contains integers which cannot be represented in 64 bits.
+    """
+    arrays = []
+    descriptions = {name: _describe_catalog(catalogs.get(name), arrays) for name in CATALOG_NAMES}
+
+    header = dict(metadata)
+    header['catalogs'] = descriptions
+    write_metadata(fh, INDEX_MAGIC, INDEX_FORMAT_VERSION, header)
+    # Each item occupies eight bytes, so the arrays need no padding to remain aligned
+    for a in arrays:
+        fh.write(a.tobytes())
+
+
+def read_index(fh):
+    """Read an index from a file.
+
+    The arrays underlying irregular catalogs are memory mapped, so fh must be a
+    real file. The memory map remains open for as long as the catalogs are in use.
+
+    Args:
+        fh: A file-like object open for reading in binary mode.
+
+    Returns:
+        A 2-tuple containing the metadata dictionary and a dictionary mapping
+        the names in CATALOG_NAMES to catalogs or None. The arrays underlying
+        irregular catalogs are memoryviews in the native byte order.
+
+    Raises:
+        IndexFormatError: If fh does not contain an index in a format which can be
+            read by this version of segpy.
+    """
+    header, arrays = read_metadata(fh, INDEX_MAGIC, INDEX_FORMAT_VERSION, IndexFormatError, "Index file")
+    try:
+        descriptions = header.pop('catalogs')
+    except KeyError as e:
+        raise IndexFormatError("Index file metadata is corrupt") from e
+
+    def array_at(a):
+        pos, count = a
+        return arrays.array_at(pos, count, _ARRAY_TYPECODE)
+
+    try:
+        catalogs = {name: _create_catalog(descriptions[name], array_at) for name in CATALOG_NAMES}
+    except (KeyError, TypeError, ValueError) as e:
+        raise IndexFormatError("Index file catalog descriptions are corrupt") from e
+    return header, catalogs
+
+
+def _range_params(r):
+    return [r.start, r.stop, r.step]
+
+
+def _add_array(arrays, items):
+    pos = sum(len(a) for a in arrays) * _ARRAY_ITEM_NUM_BYTES
+    a = array(_ARRAY_TYPECODE, items)
+    arrays.append(a)
+    return [pos, len(a)]
+
+
+def _describe_catalog(catalog, arrays):
+    """Describe a catalog as a JSON-serializable dictionary, appending any arrays to arrays."""
+    if catalog is None:
+        return None
+
+    if isinstance(catalog, LinearRegularCatalog):
+        return {'type': 'linear_regular',
+                'params': [catalog._key_min, catalog._key_max, catalog._key_stride,
+                           catalog._value_start, catalog._value_stop, catalog._value_stride]}
+
+    if isinstance(catalog, RegularConstantCatalog):
+        return {'type': 'regular_constant',
+                'params': [catalog._key_min, catalog._key_max, catalog._key_stride, catalog._value]}
+
+    if isinstance(catalog, (LastIndexVariesQuickestCatalog2D, FirstIndexVariesQuickestCatalog2D)) \
+            and all(isinstance(r, range) for r in (catalog.i_range, catalog.j_range, catalog.v_range)):
+        return {'type': ('last_index_varies_quickest_2d'
+                         if isinstance(catalog, LastIndexVariesQuickestCatalog2D)
+                         else 'first_index_varies_quickest_2d'),
+                'params': [_range_params(r) for r in (catalog.i_range, catalog.j_range, catalog.v_range)]}
+
+    items = sorted(catalog.items(), key=first)
+    if isinstance(catalog, Catalog2D) or any(isinstance(key, tuple) for key, _ in items):
+        return {'type': 'array_2d',
+                'i_range': _add_array(arrays, sorted({i for (i, _), _ in items})),
+                'j_range': _add_array(arrays, sorted({j for (_, j), _ in items})),
+                'i_keys': _add_array(arrays, (i for (i, _), _ in items)),
+                'j_keys': _add_array(arrays, (j for (_, j), _ in items)),
+                'values': _add_array(arrays, (v for _, v in items))}
+
+    return {'type': 'array',
+            'keys': _add_array(arrays, (k for k, _ in items)),
+            'values': _add_array(arrays, (v for _, v in items))}
+
+
+def _create_catalog(description, array_at):
+    """Create a catalog from a description produced by _describe_catalog()."""
+    if description is None:
+        return None
+
+    catalog_type = description['type']
+
+    if catalog_type == 'linear_regular':
+        return LinearRegularCatalog(*description['params'])
+
+    if catalog_type == 'regular_constant':
+        return RegularConstantCatalog(*description['params'])
+
+    if catalog_type == 'last_index_varies_quickest_2d':
+        return LastIndexVariesQuickestCatalog2D(*(range(*p) for p in description['params']))
+
+    if catalog_type == 'first_index_varies_quickest_2d':
+        return FirstIndexVariesQuickestCatalog2D(*(range(*p) for p in description['params']))
+
+    if catalog_type == 'array':
+        return ArrayCatalog(array_at(description['keys']), array_at(description['values']))
+
+    if catalog_type == 'array_2d':
+        return ArrayCatalog2D(make_sorted_distinct_sequence(array_at(description['i_range'])),
+                              make_sorted_distinct_sequence(array_at(description['j_range'])),
+                              array_at(description['i_keys']),
+                              array_at(description['j_keys']),
+                              array_at(description['values']))
+
+    raise ValueError("Unrecognised catalog type {!r}".format(catalog_type))
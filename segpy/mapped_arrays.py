@@ -0,0 +1,140 @@
+"""Binary files comprising JSON metadata followed by memory mapped typed arrays.
+
+Index files and header stores share this layout, which allows typed arrays of
+any length to be loaded in constant time:
+
+    magic           8 bytes
+    format version  4 bytes    unsigned, little-endian
+    metadata length 4 bytes    unsigned, little-endian
+    metadata        UTF-8 encoded JSON, padded to a multiple of eight bytes
+    arrays          typed arrays in the byte order given in the metadata,
+                    each aligned to a multiple of eight bytes
+
+Arrays are always read as memoryviews in the native byte order. Arrays written
+on a machine with the other byte order are copied and byte swapped.
+"""
+
+import json
+import mmap
+import os
+import sys
+from array import array
+from struct import Struct
+
+PREAMBLE = Struct('<8sII')
+
+ALIGNMENT_NUM_BYTES = 8
+
+
+def padding(num_bytes):
+    """The number of bytes required to extend num_bytes to a multiple of ALIGNMENT_NUM_BYTES."""
+    return -num_bytes % ALIGNMENT_NUM_BYTES
+
+
+def write_metadata(fh, magic, version, metadata):
+    """Write the preamble and the metadata to the beginning of a file.
+
+    The native byte order, in which the arrays following the metadata must be
+    written, is recorded with the metadata.
+
+    Args:
+        fh: A file-like object open for writing in binary mode.
+
+        magic: Eight bytes identifying the kind of file.
+
+        version: The format version of the file.
+
+        metadata: A dictionary of JSON-serializable values.
+    """
+    header = dict(metadata)
+    header['byteorder'] = sys.byteorder
+    encoded_header = json.dumps(header, sort_keys=True).encode('utf-8')
+    encoded_header += b' ' * padding(PREAMBLE.size + len(encoded_header))
+
+    fh.write(PREAMBLE.pack(magic, version, len(encoded_header)))
+    fh.write(encoded_header)
+
+
+def read_metadata(fh, magic, version, error_type, description):
+    """Read the preamble and the metadata from the beginning of a file.
+
+    Args:
+        fh: A file-like object open for reading in binary mode.
+
+        magic: The eight bytes expected at the beginning of the file.
+
+        version: The supported format version.
+
+        error_type: The exception type to be raised if the file cannot be read.
+
+        description: A description of the kind of file, for use in error messages.
+
+    Returns:
+        A 2-tuple containing the metadata dictionary and a MappedArrays from which
+        the arrays following the metadata can be obtained.
+
+    Raises:
+        error_type: If fh does not begin with the preamble and metadata of a file
+            of the expected kind and version.
+    """
+    preamble = fh.read(PREAMBLE.size)
+    if len(preamble) != PREAMBLE.size:
+        raise error_type("{} is too short".format(description))
+    file_magic, file_version, header_num_bytes = PREAMBLE.unpack(preamble)
+    if file_magic != magic:
+        raise error_type("{} does not begin with {!r}".format(description, magic))
+    if file_version != version:
+        raise error_type("{} format version {} is not supported. Expected version {}"
+                         .format(description, file_version, version))
+    try:
+        header = json.loads(fh.read(header_num_bytes).decode('utf-8'))
+        byteorder = header.pop('byteorder')
+    except (ValueError, KeyError) as e:
+        raise error_type("{} metadata is corrupt".format(description)) from e
+
+    arrays = MappedArrays(fh, PREAMBLE.size + header_num_bytes, byteorder, error_type, description)
+    return header, arrays
+
+
+class MappedArrays:
+    """The typed arrays following the metadata of a file, memory mapped.
+
+    The memory map remains open for as long as any of the arrays are in use.
+    """
+
+    def __init__(self, fh, arrays_begin, byteorder, error_type, description):
+        fh.seek(0, os.SEEK_END)
+        if fh.tell() <= arrays_begin:
+            self._view = memoryview(b'')
+        else:
+            file_map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(file_map)[arrays_begin:]
+        self._byteorder = byteorder
+        self._error_type = error_type
+        self._description = description
+
+    def array_at(self, pos, count, typecode):
+        """Obtain an array.
+
+        Args:
+            pos: The offset of the array in bytes from the end of the metadata.
+
+            count: The number of items in the array.
+
+            typecode: The array.array typecode of the items.
+
+        Returns:
+            A memoryview with format typecode, in the native byte order.
+
+        Raises:
+            error_type: If the file ends before the end of the array.
+        """
+        num_bytes = count * array(typecode).itemsize
+        if pos + num_bytes > len(self._view):
+            raise self._error_type("{} is truncated".format(self._description))
+        data = self._view[pos:pos + num_bytes].cast(typecode)
+        if self._byteorder != sys.byteorder:
+            swapped = array(typecode, data)
+            swapped.byteswap()
+            data = memoryview(swapped)
+        return data
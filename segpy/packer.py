@@ -4,6 +4,7 @@ from itertools import zip_longest
 
 from segpy import __version__
 from segpy.datatypes import SEG_Y_TYPE_TO_CTYPE
+from segpy.field_types import IntFieldMeta
 from segpy.util import pairwise, intervals_partially_overlap, complementary_intervals
 
 
@@ -115,7 +116,37 @@ def compile_struct(header_format_class, start_offset=0, length_in_bytes=None, en
     return cformat, field_name_allocations
 
 
+# Header packers which have been created by make_header_packer(), keyed by (header_format_class, endian)
+_header_packers = {}
+
+
 def make_header_packer(header_format_class, endian='>'):
+    """Obtain a HeaderPacker for a header format.
+
+    Header packers are created once for each header format class and endianness, and are
+    thereafter shared by all callers, so that repeated requests cost only a dictionary lookup.
+
+    Args:
+        header_format_class: A header_format class.
+
+        endian: '>' for big-endian data (the standard and default), '<'
+            for little-endian (non-standard).
+
+    Returns:
+        A HeaderPacker.
+    """
+    key = (header_format_class, endian)
+    try:
+        return _header_packers[key]
+    except KeyError:
+        pass
+
+    header_packer = _compile_header_packer(header_format_class, endian)
+    # If another thread has created an equivalent packer in the meantime, use that one
+    return _header_packers.setdefault(key, header_packer)
+
+
+def _compile_header_packer(header_format_class, endian):
     cformat, field_name_allocations = compile_struct(
         header_format_class,
         header_format_class.START_OFFSET_IN_BYTES,
@@ -130,19 +161,112 @@ def make_header_packer(header_format_class, endian='>'):
     return SurjectiveHeaderPacker(header_format_class, structure, field_name_allocations)
 
 
+# The range of values which can be unpacked for each integer format character of the struct module
+_CTYPE_LIMITS = {
+    'b': (-2**7, 2**7 - 1),
+    'B': (0, 2**8 - 1),
+    'h': (-2**15, 2**15 - 1),
+    'H': (0, 2**16 - 1),
+    'i': (-2**31, 2**31 - 1),
+    'I': (0, 2**32 - 1)}
+
+
+def _is_trusted(value_type):
+    """Determine whether every value unpacked for a field type is already a valid value of that type.
+
+    Such values can be assigned to header fields without conversion. Enumerated field types, and field types
+    with a narrower range than their struct format character, must always be converted.
+    """
+    if type(value_type) is not IntFieldMeta:
+        return False
+    ctype_limits = _CTYPE_LIMITS.get(SEG_Y_TYPE_TO_CTYPE[value_type.SEG_Y_TYPE])
+    return ctype_limits is not None and (value_type.MINIMUM, value_type.MAXIMUM) == ctype_limits
+
+
+def _compile_unpack(header_format_class, structure, field_name_allocations):
+    """Generate a function which unpacks a buffer directly into a new header instance.
+
+    The header is created without calling its __init__() method, and the list of field values in the
+    order given by ordered_field_names() is built directly from the unpacked values. Only values of
+    field types for which _is_trusted() is False are converted by calling the field type.
+
+    Returns:
+        A unary function accepting a buffer and returning a header_format_class instance.
+    """
+    field_names = header_format_class._all_field_names
+    field_indexes = {field_name: index for index, field_name in enumerate(field_names)}
+    namespace = {'_new_header': header_format_class.__new__,
+                 '_header_format_class': header_format_class,
+                 '_unpack_struct': structure.unpack,
+                 '_defaults': header_format_class._field_defaults}
+
+    # Each field value is a default unless it is assigned an unpacked value
+    value_expressions = ['_defaults[{}]'.format(index) for index in range(len(field_names))]
+    for item_index, names in enumerate(field_name_allocations):
+        for name in names:
+            value_type = getattr(header_format_class, name).value_type
+            if _is_trusted(value_type):
+                expression = 'v{}'.format(item_index)
+            else:
+                type_name = '_type_{}'.format(item_index)
+                namespace[type_name] = value_type
+                expression = '{}(v{})'.format(type_name, item_index)
+            value_expressions[field_indexes[name]] = expression
+
+    item_names = ''.join('v{}, '.format(item_index) for item_index in range(len(field_name_allocations)))
+    source = (
+        "def unpack(buffer):\n"
+        "    {items} = _unpack_struct(buffer)\n"
+        "    header = _new_header(_header_format_class)\n"
+        "    header._values = [{values}]\n"
+        "    return header\n").format(items=item_names, values=', '.join(value_expressions))
+    exec(source, namespace)
+    return namespace['unpack']
+
+
+def _compile_pack(header_format_class, structure, field_name_allocations):
+    """Generate a function which packs the field values of a header into a buffer.
+
+    Returns:
+        A unary function accepting a header_format_class instance and returning a bytes object.
+    """
+    field_indexes = {field_name: index for index, field_name in enumerate(header_format_class._all_field_names)}
+    namespace = {'_pack_struct': structure.pack}
+    value_expressions = ('values[{}]'.format(field_indexes[names[0]]) for names in field_name_allocations)
+    source = (
+        "def pack(header):\n"
+        "    values = header._values\n"
+        "    return _pack_struct({values})\n").format(values=', '.join(value_expressions))
+    exec(source, namespace)
+    return namespace['pack']
+
+
 class HeaderPacker:
-    """Packing and unpacking header instances."""
+    """Packing and unpacking header instances.
+
+    Specialised functions for packing and unpacking headers of the format are generated when the
+    HeaderPacker is created, so that field values need not be assigned one at a time.
+    """
 
     def __init__(self, header_format_class, structure, field_name_allocations):
         self._header_format_class = header_format_class
         self._structure = structure
         self._field_name_allocations = field_name_allocations
+        self._compile()
+
+    def _compile(self):
+        self._unpack_header = _compile_unpack(self._header_format_class, self._structure,
+                                              self._field_name_allocations)
+        self._pack_header = _compile_pack(self._header_format_class, self._structure,
+                                          self._field_name_allocations)
 
     def __getstate__(self):
         state = self.__dict__.copy()
         state['__version__'] = __version__
         state['_structure_format'] = self._structure.format
         del state['_structure']
+        del state['_unpack_header']
+        del state['_pack_header']
         return state
 
     def __setstate__(self, state):
@@ -157,6 +281,7 @@ class HeaderPacker:
         state['_structure'] = structure
         del state['_structure_format']
         self.__dict__.update(state)
+        self._compile()
 
     @property
     def header_format_class(self):
@@ -171,51 +296,44 @@ class HeaderPacker:
                 self._header_format_class.__name__,
                 header.__class__.__name__
             ))
-        values = [getattr(header, names[0]) for names in self._field_name_allocations]
-        return self._structure.pack(*values)
-
-    def __repr__(self):
-        return "{}({})".format(
-            self.__class__.__name__,
-            self._header_format_class.__name__)
-
-
-class BijectiveHeaderPacker(HeaderPacker):
-    """One-to-one packing/unpacking of serialised values to header fields."""
+        return self._pack_header(header)
 
     def unpack(self, buffer):
         """Unpack a header into a header object.
 
-        Overwrites any existing header field values with new values
-        obtained from the buffer.
-
         Returns:
             The header object.
-        """
-        values = self._structure.unpack(buffer)
-        return self._header_format_class(*values)
-
-
-class SurjectiveHeaderPacker(HeaderPacker):
-    """One-to-many unpacking of serialised values to header fields."""
-
-    def unpack(self, buffer):
-        """Unpack a header into a header object.
-
-        Overwrites any existing header field values with new values
-        obtained from the buffer.
 
-        Returns:
-            The header object.
+        Raises:
+            ValueError: If a value in the buffer cannot be converted to the type of its field.
         """
+        try:
+            return self._unpack_header(buffer)
+        except ValueError:
+            # Construct the header conventionally to report which field is invalid
+            self._unpack_header_fields(buffer)
+            raise
+
+    def _unpack_header_fields(self, buffer):
         values = self._structure.unpack(buffer)
-
         kwargs = {name: value
                   for names, value in zip(self._field_name_allocations, values)
                   for name in names}
-
         return self._header_format_class(**kwargs)
 
+    def __repr__(self):
+        return "{}({})".format(
+            self.__class__.__name__,
+            self._header_format_class.__name__)
+
+
+class BijectiveHeaderPacker(HeaderPacker):
+    """One-to-one packing/unpacking of serialised values to header fields."""
+
+
+class SurjectiveHeaderPacker(HeaderPacker):
+    """One-to-many unpacking of serialised values to header fields."""
+
 
 def main():
     from segpy.trace_header import TraceHeaderRev0
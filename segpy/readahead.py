@@ -0,0 +1,269 @@
+"""Reading ahead of sequential requests for trace samples.
+
+Programs which process a whole SEG Y file commonly request the samples of
+each trace in turn. Each request is a small synchronous read, so the time
+spent waiting for the file is not overlapped with decoding the samples or with
+the processing done by the program. When a Readahead is attached to a
+SegYReader it watches the requests made, and once it detects that successive
+traces are being requested, a background thread reads and decodes the
+following traces in large blocks into a bounded queue, from which subsequent
+requests are satisfied. Any request which breaks the sequence stops the
+background thread, and requests are read directly until a new sequence is
+detected.
+
+The background thread reads through its own file object, opened using the
+name of the file underlying the reader, so reading ahead is only possible for
+files with a name.
+"""
+
+import logging
+import queue
+import threading
+
+from segpy.access import make_access, plan_reads, STREAM_ACCESS
+from segpy.trace_samples import LazyIBMSamples, unpack_trace_samples
+from segpy.util import filename_from_handle, UNKNOWN_FILENAME
+
+log = logging.getLogger(__name__)
+
+# The number of consecutive requests for successive traces which begin reading ahead
+SEQUENTIAL_THRESHOLD = 3
+
+# The approximate number of bytes read at a time by the background thread
+READAHEAD_BLOCK_NUM_BYTES = 1024 * 1024
+
+# The interval in seconds at which a request waiting for a trace checks whether reading ahead has stopped
+_POLL_INTERVAL = 0.1
+
+_END = object()
+
+
+class Readahead:
+    """Reads ahead of sequential requests for the samples of traces."""
+
+    def __init__(self, num_traces, block_num_bytes=READAHEAD_BLOCK_NUM_BYTES,
+                 sequential_threshold=SEQUENTIAL_THRESHOLD):
+        """Initialize a Readahead.
+
+        Args:
+            num_traces: The maximum number of decoded traces held ahead of the
+                requests.
+
+            block_num_bytes: The approximate number of bytes read from the file
+                at a time.
+
+            sequential_threshold: The number of consecutive requests for
+                successive traces after which reading ahead begins.
+
+        Raises:
+            ValueError: If num_traces or sequential_threshold is less than one.
+        """
+        if num_traces < 1:
+            raise ValueError("num_traces {} is less than one".format(num_traces))
+        if sequential_threshold < 1:
+            raise ValueError("sequential_threshold {} is less than one".format(sequential_threshold))
+        self._num_traces = num_traces
+        self._block_num_bytes = block_num_bytes
+        self._sequential_threshold = sequential_threshold
+        self._lock = threading.Lock()
+        self._last_request = None
+        self._num_sequential = 0
+        self._stream = None
+        self._num_hits = 0
+
+    @property
+    def num_traces(self):
+        """The maximum number of decoded traces held ahead of the requests."""
+        return self._num_traces
+
+    @property
+    def num_hits(self):
+        """The number of requests which have been satisfied by reading ahead."""
+        return self._num_hits
+
+    @property
+    def is_active(self):
+        """True if traces are currently being read ahead."""
+        return self._stream is not None
+
+    def trace_samples(self, reader, trace_index, start=None, stop=None):
+        """Obtain the samples of a trace if they have been read ahead.
+
+        Each call is also taken as a request for the trace, which may begin or
+        end reading ahead.
+
+        Args:
+            reader: The SegYReader for which traces are read ahead.
+
+            trace_index: The index of the requested trace, which must be in range.
+
+            start: The optional zero-based start sample index of the request.
+
+            stop: The optional zero-based stop sample index of the request.
+
+        Returns:
+            The sequence of samples, or None if the samples have not been read
+            ahead, in which case they should be read directly.
+        """
+        request = (trace_index, start, stop)
+        with self._lock:
+            stream = self._stream
+
+        # Wait for the samples without holding the lock, so that other requests are not blocked meanwhile
+        if stream is not None:
+            samples = stream.next_samples(request)
+            if samples is not None:
+                with self._lock:
+                    self._last_request = request
+                    self._num_hits += 1
+                return samples
+
+        with self._lock:
+            self._stop_stream()
+
+            last_request = self._last_request
+            if last_request is not None and last_request[1:] == request[1:] and last_request[0] + 1 == trace_index:
+                self._num_sequential += 1
+            else:
+                self._num_sequential = 1
+            self._last_request = request
+
+            if self._num_sequential >= self._sequential_threshold:
+                self._stream = _ReadaheadStream.start(reader, trace_index + 1, start, stop, self._num_traces,
+                                                      self._block_num_bytes)
+            return None
+
+    def stop(self):
+        """Stop reading ahead until a new sequence of requests is detected."""
+        with self._lock:
+            self._stop_stream()
+            self._last_request = None
+            self._num_sequential = 0
+
+    def _stop_stream(self):
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream = None
+
+    def __reduce__(self):
+        # Traces read ahead are not pickled
+        return self.__class__, (self._num_traces, self._block_num_bytes, self._sequential_threshold)
+
+    def __repr__(self):
+        return "{}(num_traces={})".format(self.__class__.__name__, self._num_traces)
+
+
+class _ReadaheadStream:
+    """A background thread reading successive traces into a bounded queue."""
+
+    @classmethod
+    def start(cls, reader, trace_index, start, stop, num_traces, block_num_bytes):
+        """Begin reading ahead from a trace.
+
+        Returns:
+            A _ReadaheadStream, or None if the file could not be opened.
+        """
+        if trace_index >= reader.num_traces():
+            return None
+        seg_y_path = filename_from_handle(reader._fh)
+        if seg_y_path == UNKNOWN_FILENAME:
+            log.debug("Cannot read ahead in a file with an unknown name")
+            return None
+        try:
+            fh = open(seg_y_path, 'rb')
+        except OSError as os_error:
+            log.debug("Cannot read ahead in {} because {}".format(seg_y_path, os_error))
+            return None
+        return cls(reader, fh, trace_index, start, stop, num_traces, block_num_bytes)
+
+    def __init__(self, reader, fh, trace_index, start, stop, num_traces, block_num_bytes):
+        self._next_trace_index = trace_index
+        self._start = start
+        self._stop = stop
+        self._queue = queue.Queue(maxsize=num_traces)
+        self._stopped = threading.Event()
+        self._next_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, args=(reader, fh, trace_index, block_num_bytes),
+                                        name='segpy-readahead', daemon=True)
+        self._thread.start()
+
+    def next_samples(self, request):
+        """Wait for the samples of the next trace read ahead.
+
+        Args:
+            request: A (trace_index, start, stop) tuple.
+
+        Returns:
+            The sequence of samples, or None if the request is not for the next
+            trace read ahead, or the trace could not be read ahead.
+        """
+        if not self._is_next(request):
+            return None
+        with self._next_lock:
+            # Another request may have taken the trace while this one was waiting for the lock
+            if not self._is_next(request):
+                return None
+            while True:
+                # Poll so that a request waiting here ends when another request stops reading ahead
+                if self._stopped.is_set():
+                    return None
+                try:
+                    samples = self._queue.get(timeout=_POLL_INTERVAL)
+                except queue.Empty:
+                    continue
+                if samples is _END:
+                    # Leave the end marker for any subsequent request
+                    self._queue.put(_END)
+                    return None
+                self._next_trace_index += 1
+                return samples
+
+    def _is_next(self, request):
+        return request == (self._next_trace_index, self._start, self._stop)
+
+    def stop(self):
+        """Stop reading ahead."""
+        self._stopped.set()
+        # Unblock the thread if it is waiting for space in the queue
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+
+    def _run(self, reader, fh, trace_index, block_num_bytes):
+        try:
+            with fh:
+                access = make_access(fh, STREAM_ACCESS)
+                bps = reader.bytes_per_sample
+                seg_y_type = reader.data_sample_format
+                endian = reader.endian
+                num_traces = reader.num_traces()
+                while trace_index < num_traces and not self._stopped.is_set():
+                    extents = []
+                    num_block_bytes = 0
+                    while trace_index < num_traces and num_block_bytes < block_num_bytes:
+                        pos, num_samples = reader._trace_samples_extent(trace_index, self._start, self._stop)
+                        extents.append((pos, num_samples * bps))
+                        num_block_bytes += num_samples * bps
+                        trace_index += 1
+                    decoded = [None] * len(extents)
+                    for read in plan_reads(extents):
+                        buf = memoryview(access.read(read.pos, read.num_bytes))
+                        for extent_index in read.extent_indexes:
+                            pos, num_bytes = extents[extent_index]
+                            offset = pos - read.pos
+                            samples = unpack_trace_samples(buf[offset:offset + num_bytes], seg_y_type,
+                                                           num_bytes // bps, endian)
+                            # The samples have the same type as those read directly, but are decoded on this thread
+                            if isinstance(samples, LazyIBMSamples):
+                                samples.decode()
+                            decoded[extent_index] = samples
+                    for samples in decoded:
+                        if self._stopped.is_set():
+                            return
+                        self._queue.put(samples)
+        except Exception as error:
+            log.debug("Stopped reading ahead because {}".format(error))
+        if not self._stopped.is_set():
+            self._queue.put(_END)
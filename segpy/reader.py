@@ -5,24 +5,41 @@ a SegYReader object.  The properties and methods of the SegYReader
 instance can be used to extract SEG Y data.
 """
 
-import os
-import pickle
+from array import array
+from collections import OrderedDict
+from itertools import islice
 from pathlib import Path
 import logging
+import os
 
 from segpy import __version__
-from segpy.dataset import Dataset
+from segpy.access import make_access, plan_reads, STREAM_ACCESS, ACCESS_MODES, COALESCE_MAX_GAP_NUM_BYTES
+from segpy.background import BackgroundCataloguer
+from segpy.cache import CacheManager, configured_cache
+from segpy.catalog import CatalogBuilder
+from segpy.dataset import Dataset, RawTraceSamples
 from segpy.encoding import ASCII
+from segpy.header import make_sub_format
+from segpy.header_store import write_header_store, read_header_store, column_typecode, HeaderStoreFormatError
+from segpy.index import write_index, read_index, IndexFormatError, CATALOG_NAMES
 from segpy.packer import make_header_packer
+from segpy.readahead import Readahead
+from segpy.trace_cache import TraceCache
 from segpy.trace_header import TraceHeaderRev1
-from segpy.util import file_length, filename_from_handle, make_sorted_distinct_sequence, hash_for_file, UNKNOWN_FILENAME
+from segpy.trace_samples import unpack_trace_samples
+from segpy.util import (file_length, filename_from_handle, make_sorted_distinct_sequence, hash_for_file,
+                        fingerprint_for_file, restored_position_seek, UNKNOWN_FILENAME, UNSET)
 from segpy.datatypes import SEG_Y_TYPE_TO_CTYPE, size_in_bytes
 from segpy.toolkit import (extract_revision,
                            bytes_per_sample,
+                           samples_per_trace,
                            read_binary_reel_header,
-                           read_trace_header,
                            catalog_traces,
-                           read_binary_values,
+                           catalog_fixed_length_traces,
+                           extend_catalogs,
+                           scan_trace_headers,
+                           CATALOG_FIELD_NAMES,
+                           NUM_SAMPLED_TRACE_HEADERS,
                            REEL_HEADER_NUM_BYTES,
                            TRACE_HEADER_NUM_BYTES,
                            read_textual_reel_header,
@@ -33,6 +50,18 @@ from segpy.toolkit import (extract_revision,
 log = logging.getLogger(__name__)
 log.setLevel('INFO')
 
+# The cache directory, relative to each SEG Y file, used if no central cache is configured
+DEFAULT_CACHE_DIRECTORY = '.segpy'
+
+# Catalog modes for create_reader()
+SCAN_CATALOG = 'scan'
+FIXED_LENGTH_CATALOG = 'fixed-length'
+
+CATALOG_MODES = (SCAN_CATALOG, FIXED_LENGTH_CATALOG)
+
+# The number of trace headers read at a time when building a header store
+HEADER_STORE_BLOCK_NUM_TRACES = 4096
+
 
 def create_reader(
         fh,
@@ -40,8 +69,14 @@ def create_reader(
         trace_header_format=TraceHeaderRev1,
         endian='>',
         progress=None,
-        cache_directory=".segpy",
-        dimensionality=None):
+        cache_directory=UNSET,
+        dimensionality=None,
+        access_mode=STREAM_ACCESS,
+        catalog_mode=SCAN_CATALOG,
+        strict_cache=False,
+        background=False,
+        trace_cache_num_bytes=None,
+        readahead_num_traces=None):
     """Create a SegYReader based on performing a scan of SEG Y data.
 
     This function is the preferred method for creating SegYReader
@@ -73,14 +108,67 @@ def create_reader(
 
         cache_directory: The directory for the cache file. Relative paths
             are interpreted as being relative to the directory containing
-            the SEG Y file. Absolute paths are used as is. If
-            cache_directory is None, caching is disabled.
+            the SEG Y file. Absolute paths are used as is. A CacheManager
+            may be supplied instead of a path. If cache_directory is not
+            specified, the central cache configured with
+            cache.configure_cache() is used or, if there is none, a
+            directory called DEFAULT_CACHE_DIRECTORY alongside the SEG Y
+            file. If cache_directory is None, caching is disabled.
 
         dimensionality: An optional integer to force the dimensionality of
             the created reader. Accepted values are None, 1, 2 and 3. If None
             (the default) various heuristics will be used to guess the
             dimensionality of the data.
 
+        access_mode: How the returned reader obtains data from the file. The
+            default, access.STREAM_ACCESS, seeks and reads through fh.
+            access.MEMORY_MAP_ACCESS memory maps the file so that trace
+            headers and samples are sliced directly from the map, which
+            avoids system calls and, for samples which need no conversion,
+            copying. access.POSITIONAL_ACCESS reads with os.pread(), which
+            does not use the position of fh, so that the reader can be used
+            from several threads at once, as it can with memory mapping.
+            Memory mapping and positional reads require fh to have a file
+            descriptor.
+
+        catalog_mode: How the trace catalogs are built. The default,
+            SCAN_CATALOG, reads every trace header. FIXED_LENGTH_CATALOG
+            assumes that every trace has the number of samples given in the
+            binary reel header, derives the trace offsets and lengths from
+            the file length, and infers the line and CDP catalogs from a
+            strided sample of trace headers. If the file is not consistent
+            with that assumption all trace headers are scanned as usual.
+            Inferred catalogs can be checked with SegYReader.verify_catalogs().
+
+        strict_cache: Cached readers are found using a fingerprint of the
+            file computed from its length, modification time and a sample of
+            its contents, which takes the same time whatever the
+            size of the file. If strict_cache is True the entire contents of
+            the file are hashed instead, so that any modification is detected
+            at the cost of reading the whole file.
+
+        background: If True, and the catalogs cannot be loaded from the cache,
+            the reader is returned as soon as the reel headers have been read,
+            while the trace headers are scanned in a background thread. Reading
+            a trace waits only until its header has been scanned, but methods
+            such as num_traces() wait until the scan is complete. The
+            dimensionality of the reader is guessed from the first few trace
+            headers unless it is specified. The progress callback is called
+            from the background thread, and the catalogs are cached once the
+            scan is complete. Background scanning requires a file with a name,
+            so that it can be opened separately, and is only used with
+            SCAN_CATALOG. Otherwise the catalogs are built before returning.
+
+        trace_cache_num_bytes: If not None, decoded trace samples are kept in a
+            TraceCache of this size in bytes, so that traces which are read
+            repeatedly are read and decoded only once. See
+            SegYReader.trace_cache.
+
+        readahead_num_traces: If not None, when successive traces are requested
+            from trace_samples(), up to this number of the following traces are
+            read and decoded in a background thread, so that reading overlaps
+            with processing. See SegYReader.readahead.
+
     Raises:
         TypeError: ``fh`` has an encoding which is not ``None``, or ``fh`` is
             not seekable.
@@ -89,6 +177,10 @@ def create_reader(
             such as not being open, or being too short.
         ValueError: ``endian`` is not one of '<' or '>'.
         ValueError: ``dimensionality`` is not one of ``None``, 1, 2, or 3.
+        ValueError: ``access_mode`` is not a recognised access mode.
+        ValueError: ``catalog_mode`` is not a recognised catalog mode.
+        ValueError: ``trace_cache_num_bytes`` is negative.
+        ValueError: ``readahead_num_traces`` is less than one.
 
     Returns:
         A SegYReader object. Depending on the exact type of the
@@ -130,117 +222,409 @@ def create_reader(
     if dimensionality not in {None, 1, 2, 3}:
         raise ValueError("dimensionality {!r} is not an of 1, 2, 3 or None.".format(dimensionality))
 
+    if access_mode not in ACCESS_MODES:
+        raise ValueError("Unrecognised access mode {!r}".format(access_mode))
+
+    if catalog_mode not in CATALOG_MODES:
+        raise ValueError("Unrecognised catalog mode {!r}".format(catalog_mode))
+
+    if trace_cache_num_bytes is not None and trace_cache_num_bytes < 0:
+        raise ValueError("trace_cache_num_bytes {} is negative".format(trace_cache_num_bytes))
+
+    if readahead_num_traces is not None and readahead_num_traces < 1:
+        raise ValueError("readahead_num_traces {} is less than one".format(readahead_num_traces))
+
     reader = None
-    cache_file_path = None
+    background = background and catalog_mode == SCAN_CATALOG
+    is_background_reader = False
 
     if cache_directory is not None:
-        sha1 = hash_for_file(fh, encoding, trace_header_format, endian)
         seg_y_path = filename_from_handle(fh)
-        cache_file_path = _locate_cache_file(seg_y_path, cache_directory, sha1)
-        if cache_file_path is not None:
-            reader = _load_reader_from_cache(cache_file_path, seg_y_path)
+        cache = _locate_cache(seg_y_path, cache_directory)
+        if cache is not None:
+            cache_key = _cache_key(fh, encoding, trace_header_format, endian, strict_cache)
+            file_hash = hash_for_file if strict_cache else fingerprint_for_file
+            reader = _load_reader_from_cache(cache, cache_key, file_hash, seg_y_path, fh, trace_header_format,
+                                             access_mode, catalog_mode=catalog_mode)
+            if reader is None and background:
+                def save_catalogs(reader, catalog_fh, catalogs):
+                    _save_reader_to_cache(reader, catalogs, cache, cache_key, file_hash, catalog_fh)
+
+                reader = _make_background_reader(fh, encoding, trace_header_format, endian, progress_callback,
+                                                 dimensionality, access_mode, save_catalogs)
+                is_background_reader = reader is not None
+            if reader is None:
+                # Only one process builds or updates the index, while any others wait to load it
+                with cache.lock(cache_key):
+                    reader = _load_reader_from_cache(cache, cache_key, file_hash, seg_y_path, fh,
+                                                     trace_header_format, access_mode, progress_callback,
+                                                     update=True, catalog_mode=catalog_mode)
+                    if reader is None:
+                        reader, catalogs = _make_reader(fh, encoding, trace_header_format, endian,
+                                                        progress_callback, dimensionality, access_mode,
+                                                        catalog_mode)
+                        _save_reader_to_cache(reader, catalogs, cache, cache_key, file_hash,
+                                              catalog_mode=catalog_mode)
+
+    if reader is None and background:
+        reader = _make_background_reader(fh, encoding, trace_header_format, endian, progress_callback,
+                                         dimensionality, access_mode)
+        is_background_reader = reader is not None
 
     if reader is None:
-        reader = _make_reader(fh, encoding, trace_header_format, endian, progress_callback, dimensionality)
-        if cache_directory is not None:
-            _save_reader_to_cache(reader, cache_file_path)
+        reader, _ = _make_reader(fh, encoding, trace_header_format, endian, progress_callback, dimensionality,
+                                 access_mode, catalog_mode)
 
-    progress_callback(1)
+    if trace_cache_num_bytes is not None:
+        reader.trace_cache = TraceCache(trace_cache_num_bytes)
+
+    if readahead_num_traces is not None:
+        reader.readahead = Readahead(readahead_num_traces)
+
+    if not is_background_reader:
+        # Otherwise the progress callback is completed by the background thread
+        progress_callback(1)
 
     return reader
 
 
-def _locate_cache_file(seg_y_path, cache_directory, sha1):
-    """Determine the location of the cache file.
+def warm_cache(seg_y_paths, cache_directory=UNSET, **kwargs):
+    """Ensure that the cache contains indexes for SEG Y files.
+
+    Each file is opened and a reader created for it, which requires a full scan
+    of any file not already in the cache.
 
     Args:
-        seg_y_path: The path to the SEG Y file.
+        seg_y_paths: An iterable series of paths to SEG Y files.
 
-        cache_directory: The directory for the cache file. Relative paths
-            are interpreted as being relative to the directory containing
-            the SEG Y file. Absolute paths are used as is.
+        cache_directory: The cache to be warmed, as accepted by create_reader().
+
+        **kwargs: Further keyword arguments for create_reader(), which must match
+            those which will subsequently be used to create readers from the
+            cache.
+
+    Returns:
+        A list of the paths of any files which could not be read.
+    """
+    failed_paths = []
+    for seg_y_path in seg_y_paths:
+        try:
+            with open(str(seg_y_path), 'rb') as fh:
+                create_reader(fh, cache_directory=cache_directory, **kwargs)
+        except (OSError, EOFError, ValueError, TypeError) as error:
+            log.warn("Could not warm cache for {} because {}".format(seg_y_path, error))
+            failed_paths.append(seg_y_path)
+    return failed_paths
+
+
+def trace_header_columns(reader, fields, cache_directory=UNSET, strict_cache=False):
+    """Obtain the values of trace header fields for all traces, as columns.
+
+    The first time that columns are requested for a SEG Y file and a sequence of
+    fields, every trace header is read and the columns are saved in a header
+    store in the cache used for reader indexes. Subsequent requests load the
+    columns from the header store, which is memory mapped, without reading any
+    trace headers. The header store is rebuilt if the SEG Y file has changed,
+    using the same test as for indexes.
+
+    Args:
+        reader: A SegYReader.
+
+        fields: An iterable series where each item is either the name of a field
+            as a string or an object such as a NamedField with a 'name' attribute
+            which in turn is the name of a field as a string.
 
-        sha1: The SHA1 hash corresponding to the file.
+        cache_directory: The cache for the header store, as accepted by
+            create_reader(). If None, the columns are built but not saved.
+
+        strict_cache: If True, whether the header store is up-to-date is
+            determined by hashing the whole SEG Y file, as for create_reader().
+
+    Returns:
+        An OrderedDict mapping each field name to a sequence of integer values,
+        containing one value for each trace in the order of trace_indexes().
+
+    Raises:
+        ValueError: If fields contains a name which is not a field of the trace
+            header format, or a field which does not have an integer type.
+    """
+    trace_header_format = reader.trace_header_format_class
+    field_names = tuple(getattr(field, 'name', field) for field in fields)
+    for field_name in field_names:
+        if field_name not in trace_header_format.ordered_field_names():
+            raise ValueError("{!r} is not a field of {}".format(field_name, trace_header_format.__name__))
+    typecodes = [column_typecode(trace_header_format, field_name) for field_name in field_names]
+
+    cache = None if cache_directory is None else _locate_cache(reader.filename, cache_directory)
+    if cache is None:
+        return _build_trace_header_columns(reader, field_names, typecodes)
+
+    fh = reader._fh
+    cache_key = _cache_key(fh, 'trace_header_columns', trace_header_format, reader.endian, field_names,
+                           strict_cache)
+    file_hash = hash_for_file if strict_cache else fingerprint_for_file
+    with restored_position_seek(fh, fh.tell()):
+        columns = _load_trace_header_columns(cache, cache_key, file_hash, reader)
+        if columns is None:
+            with cache.lock(cache_key):
+                columns = _load_trace_header_columns(cache, cache_key, file_hash, reader)
+                if columns is None:
+                    columns = _build_trace_header_columns(reader, field_names, typecodes)
+                    metadata = {'file_hash': file_hash(fh),
+                                'num_traces': reader.num_traces()}
+                    try:
+                        cache.write(cache_key, lambda store_file: write_header_store(store_file, metadata, columns))
+                    except OSError as os_error:
+                        log.warn("Could not cache trace header columns of {} because {}".format(reader, os_error))
+    return columns
+
+
+def _build_trace_header_columns(reader, field_names, typecodes):
+    """Read the trace headers of a reader into columns of values."""
+    columns = OrderedDict((field_name, array(typecode)) for field_name, typecode in zip(field_names, typecodes))
+    trace_indexes = reader.trace_indexes()
+    while True:
+        block_trace_indexes = list(islice(trace_indexes, HEADER_STORE_BLOCK_NUM_TRACES))
+        if len(block_trace_indexes) == 0:
+            break
+        trace_headers = reader.trace_headers_many(block_trace_indexes, fields=field_names)
+        for field_name, column in columns.items():
+            column.extend(getattr(trace_header, field_name) for trace_header in trace_headers)
+    return columns
+
+
+def _load_trace_header_columns(cache, cache_key, file_hash, reader):
+    """Attempt to load columns of trace header values from a header store in a cache.
+
+    Any cache entry that can be located but not successfully read is removed.
+
+    Returns:
+        An OrderedDict of columns, or None if the cache entry does not exist, could
+        not be read or is out-of-date.
+    """
+    store_file_path = cache.lookup(cache_key)
+    if store_file_path is None:
+        return None
+
+    try:
+        with store_file_path.open('rb') as store_file:
+            metadata, columns = read_header_store(store_file)
+        stored_file_hash = metadata['file_hash']
+        num_stored_traces = metadata['num_traces']
+    except (HeaderStoreFormatError, OSError, ValueError, KeyError) as store_error:
+        log.info("Could not read trace header columns for {} because {}".format(reader.filename, store_error))
+        try:
+            cache.remove(cache_key)
+        except OSError as os_error:
+            log.warn("Could not remove stale cache entry {} for {} because {}"
+                     .format(store_file_path, reader.filename, os_error))
+        return None
+
+    if num_stored_traces != reader.num_traces() or file_hash(reader._fh) != stored_file_hash:
+        log.info("Trace header columns for {} are out-of-date".format(reader.filename))
+        return None
+
+    log.info("Successfully loaded trace header columns for {}".format(reader.filename))
+    return columns
+
+
+def _locate_cache(seg_y_path, cache_directory):
+    """Determine the cache to be used for a SEG Y file.
+
+    Args:
+        seg_y_path: The path to the SEG Y file.
+
+        cache_directory: The directory for the cache, or a CacheManager, or UNSET
+            for the configured cache. Relative paths are interpreted as being
+            relative to the directory containing the SEG Y file. Absolute paths
+            are used as is.
 
     Returns:
-        A Path object containing the absolute path of the cache file or None
-        if the cache file path could not be determined.
+        A CacheManager, or None if the cache directory could not be determined.
     """
+    if cache_directory is UNSET:
+        cache_directory = configured_cache() or DEFAULT_CACHE_DIRECTORY
+    if isinstance(cache_directory, CacheManager):
+        return cache_directory
     cache_dir_path = Path(cache_directory)
-    cache_filename = (sha1 + '.p')
     if cache_dir_path.is_absolute():
-        cache_file_path = cache_dir_path / cache_filename
+        return CacheManager(cache_dir_path)
+    if seg_y_path == UNKNOWN_FILENAME:
+        return None
+    normalized_seg_y_path = Path(seg_y_path).resolve()
+    return CacheManager(normalized_seg_y_path.parent / cache_dir_path)
+
+
+def _cache_key(fh, *args):
+    """Determine the key identifying a SEG Y file in a cache.
+
+    The key is derived from the resolved path of the file and its reel headers, so
+    it is unchanged when traces are appended to the file. Whether the cache entry
+    for the key is up-to-date is determined separately, by _load_reader_from_cache().
+    The device and inode of the file are not used, as they differ between the
+    machines sharing a cache on a network filesystem, and change when a file is
+    restored from a copy. Files without a path, such as in-memory files, are instead
+    distinguished by a fingerprint of their contents, as many files may have
+    identical reel headers.
+
+    Args:
+        fh: A file-like object open in binary mode on the SEG Y file.
+
+        *args: Any additional arguments on which the cache entry depends.
+
+    Returns:
+        A string containing the key.
+    """
+    seg_y_path = filename_from_handle(fh)
+    if isinstance(seg_y_path, str) and seg_y_path != UNKNOWN_FILENAME:
+        identity = os.path.realpath(seg_y_path)
     else:
-        if seg_y_path != UNKNOWN_FILENAME:
-            normalized_seg_y_path = Path(seg_y_path).resolve()
-            cache_file_path = normalized_seg_y_path.parent / cache_directory / cache_filename
-        else:
-            cache_file_path = None
-    return cache_file_path
+        identity = fingerprint_for_file(fh)
+    return hash_for_file(fh, identity, *args, num_bytes=REEL_HEADER_NUM_BYTES)
 
 
-def _save_reader_to_cache(reader, cache_file_path):
-    """Save a reader object to a pickle file.
+def _save_reader_to_cache(reader, catalogs, cache, cache_key, file_hash, fh=None, catalog_mode=SCAN_CATALOG):
+    """Save the catalogs of a reader object to an index file in a cache.
 
     Args:
         reader: The Reader instance to be persisted.
-        cache_file_path: A Path instance giving the path to the pickle file location.
+
+        catalogs: The 4-tuple of catalogs built for the reader by catalog_traces().
+
+        cache: The CacheManager in which to store the index.
+
+        cache_key: The key identifying the SEG Y file in the cache.
+
+        file_hash: The function used to check whether the index is up-to-date; either
+            hash_for_file or fingerprint_for_file.
+
+        fh: An optional file-like object open in binary mode on the SEG Y file, to
+            be used instead of the file of the reader.
+
+        catalog_mode: The catalog mode with which the catalogs were built.
     """
-    cache_path = cache_file_path.parent
-    os.makedirs(str(cache_path), exist_ok=True)
+    fh = reader._fh if fh is None else fh
+    num_file_bytes = file_length(fh)
+    metadata = reader._index_metadata()
+    prefix_hash = file_hash(fh, num_bytes=num_file_bytes)
+    # The hash of the whole file is the hash of its first num_file_bytes bytes
+    metadata['file_hash'] = prefix_hash if file_hash is hash_for_file else file_hash(fh)
+    metadata['num_file_bytes'] = num_file_bytes
+    metadata['prefix_hash'] = prefix_hash
+    metadata['catalog_mode'] = catalog_mode
     try:
-        with cache_file_path.open('wb') as cache_file:
-            try:
-                pickle.dump(reader, cache_file)
-            except (pickle.PicklingError, TypeError) as pickling_error:
-                log.warn("Could not pickle {} because {}".format(reader, pickling_error))
-                pass
+        cache.write(cache_key, lambda index_file: write_index(index_file, metadata,
+                                                              dict(zip(CATALOG_NAMES, catalogs))))
+    except (TypeError, OverflowError) as index_error:
+        log.warn("Could not index {} because {}".format(reader, index_error))
     except OSError as os_error:
         log.warn("Could not cache {} because {}".format(reader, os_error))
 
 
-def _load_reader_from_cache(cache_file_path, seg_y_path):
+def _load_reader_from_cache(cache, cache_key, file_hash, seg_y_path, fh, trace_header_format,
+                            access_mode=STREAM_ACCESS, progress=None, update=False, catalog_mode=SCAN_CATALOG):
     """Attempt to load a reader object from cache.
 
-    Any cache file that can be located but not successfully read is removed.
+    Any cache entry that can be located but not successfully read is removed.
 
     Args:
-        cache_file_path: A Path object referring to the pickle file.
+        cache: The CacheManager in which to look for the index.
+
+        cache_key: The key identifying the SEG Y file in the cache.
 
-        seg_y_path: The name of the SEG Y file which the pickled reader is expected
+        file_hash: The function used to check whether the index is up-to-date; either
+            hash_for_file or fingerprint_for_file.
+
+        seg_y_path: The name of the SEG Y file which the reader is expected
             to be able to read (used for error reporting).
 
-    Returns:
-        A Reader instance associated with seg_y_filename.
+        fh: A file-like object open in binary mode on the SEG Y file, positioned at
+            the beginning of the reel header.
 
-    Raises:
-        TypeError: If the pickle could be read, but did not contain a SegYReader.
-    """
+        trace_header_format: The class defining the layout of the trace header.
+
+        access_mode: The access mode for the reader.
+
+        progress: A unary callable which will be passed a number between zero and
+            one indicating the progress made in updating the index.
+
+        update: If True, and the SEG Y file has only had traces appended to it since
+            the index was built, the index is extended with the new traces and saved.
 
-    if not (cache_file_path.exists() and cache_file_path.is_file()):
+        catalog_mode: The catalog mode requested for the reader. Catalogs built with
+            FIXED_LENGTH_CATALOG are inferred from a sample of the trace headers, so
+            are not used when SCAN_CATALOG is requested.
+
+    Returns:
+        A Reader instance associated with seg_y_filename, or None if the cache entry
+        does not exist, could not be read, is out-of-date or was built with a less
+        thorough catalog mode than that requested.
+    """
+    cache_file_path = cache.lookup(cache_key)
+    if cache_file_path is None:
         return None
 
-    with cache_file_path.open('rb') as pickle_file:
+    try:
+        with cache_file_path.open('rb') as index_file:
+            metadata, catalogs = read_index(index_file)
+        catalogs = tuple(catalogs[name] for name in CATALOG_NAMES)
+        dimensionality = metadata['dimensionality']
+        encoding = metadata['encoding']
+        endian = metadata['endian']
+        indexed_file_hash = metadata['file_hash']
+        num_indexed_file_bytes = metadata['num_file_bytes']
+        indexed_prefix_hash = metadata['prefix_hash']
+        indexed_catalog_mode = metadata['catalog_mode']
+    except (IndexFormatError, OSError, ValueError, KeyError) as index_error:
+        log.info("Could not read index for {} because {}".format(seg_y_path, index_error))
         try:
-            reader = pickle.load(pickle_file)
-        except Exception as unpickling_error:
-            log.info("Could not unpickle reader for {} because {}".format(seg_y_path, unpickling_error))
-            try:
-                cache_file_path.unlink()
-            except OSError as os_error:
-                log.warn("Could not remove stale cache entry {} for {} because {}"
-                         .format(cache_file_path, seg_y_path, os_error))
-            else:
-                log.info("Removed stale cache entry {} for {}".format(cache_file_path, seg_y_path))
-            return None
+            cache.remove(cache_key)
+        except OSError as os_error:
+            log.warn("Could not remove stale cache entry {} for {} because {}"
+                     .format(cache_file_path, seg_y_path, os_error))
         else:
-            log.info("Successfully unpickled reader for {}".format(seg_y_path))
-    if not isinstance(reader, SegYReader):
-        raise TypeError("Pickle at {} does not contain a {} instance.".format(cache_file_path, SegYReader.__name__))
+            log.info("Removed stale cache entry {} for {}".format(cache_file_path, seg_y_path))
+        return None
+
+    if catalog_mode == SCAN_CATALOG and indexed_catalog_mode != SCAN_CATALOG:
+        log.info("Index for {} was inferred from sampled trace headers, so is not used".format(seg_y_path))
+        return None
+
+    is_up_to_date = file_hash(fh) == indexed_file_hash
+    if not is_up_to_date:
+        if not update:
+            return None
+        has_grown = (file_length(fh) > num_indexed_file_bytes
+                     and file_hash(fh, num_bytes=num_indexed_file_bytes) == indexed_prefix_hash)
+        if not has_grown:
+            log.info("Index for {} is out-of-date".format(seg_y_path))
+            return None
+
+    encoding, textual_reel_header, binary_reel_header, extended_textual_header = _read_reel_headers(
+        fh, encoding, endian)
+
+    if not is_up_to_date:
+        log.info("Extending index for {} with appended traces".format(seg_y_path))
+        catalogs = extend_catalogs(fh, bytes_per_sample(binary_reel_header), catalogs, trace_header_format,
+                                   endian, progress)
+        if catalogs is None or (dimensionality == 2 and catalogs[2] is None) \
+                or (dimensionality == 3 and catalogs[3] is None):
+            log.info("Could not extend index for {}".format(seg_y_path))
+            fh.seek(0)
+            return None
+
+    reader = _construct_reader(fh, dimensionality, textual_reel_header, binary_reel_header,
+                               extended_textual_header, *catalogs, trace_header_format=trace_header_format,
+                               encoding=encoding, endian=endian, access_mode=access_mode)
+
+    if is_up_to_date:
+        log.info("Successfully loaded index for {}".format(seg_y_path))
+    else:
+        _save_reader_to_cache(reader, catalogs, cache, cache_key, file_hash, catalog_mode=indexed_catalog_mode)
     return reader
 
 
-def _make_reader(fh, encoding, trace_header_format, endian, progress, dimensionality):
+def _read_reel_headers(fh, encoding, endian):
     if encoding is None:
         encoding = guess_textual_header_encoding(fh)
     if encoding is None:
@@ -249,35 +633,161 @@ def _make_reader(fh, encoding, trace_header_format, endian, progress, dimensiona
     binary_reel_header = read_binary_reel_header(fh, endian)
     validate_binary_reel_header(binary_reel_header, endian)
     extended_textual_header = read_extended_textual_headers(fh, binary_reel_header, encoding)
+    return encoding, textual_reel_header, binary_reel_header, extended_textual_header
+
+
+def _make_reader(fh, encoding, trace_header_format, endian, progress, dimensionality, access_mode=STREAM_ACCESS,
+                 catalog_mode=SCAN_CATALOG):
+    encoding, textual_reel_header, binary_reel_header, extended_textual_header = _read_reel_headers(
+        fh, encoding, endian)
     bps = bytes_per_sample(binary_reel_header)
 
-    trace_offset_catalog, trace_length_catalog, cdp_catalog, line_catalog = catalog_traces(fh, bps, trace_header_format,
-                                                                                           endian, progress)
+    catalogs = None
+    if catalog_mode == FIXED_LENGTH_CATALOG:
+        first_trace_pos = fh.tell()
+        catalogs = catalog_fixed_length_traces(fh, bps, samples_per_trace(binary_reel_header), trace_header_format,
+                                               endian)
+        if catalogs is None:
+            log.info("Could not infer catalogs for {} from sampled trace headers, so scanning all trace headers"
+                     .format(filename_from_handle(fh)))
+            fh.seek(first_trace_pos)
+
+    if catalogs is None:
+        catalogs = catalog_traces(fh, bps, trace_header_format, endian, progress)
+
+    trace_offset_catalog, trace_length_catalog, cdp_catalog, line_catalog = catalogs
 
     if dimensionality is None:
-        if cdp_catalog is not None and line_catalog is None:
-            dimensionality = 2
-        elif line_catalog is not None:
-            dimensionality = 3
-        else:
-            dimensionality = 1
+        dimensionality = _dimensionality_of(cdp_catalog, line_catalog)
+
+    reader = _construct_reader(fh, dimensionality, textual_reel_header, binary_reel_header, extended_textual_header,
+                               trace_offset_catalog, trace_length_catalog, cdp_catalog, line_catalog,
+                               trace_header_format, encoding, endian, access_mode)
+    return reader, catalogs
+
+
+def _make_background_reader(fh, encoding, trace_header_format, endian, progress, dimensionality,
+                            access_mode=STREAM_ACCESS, save_catalogs=None):
+    """Make a reader whose catalogs are built in a background thread.
+
+    Args:
+        save_catalogs: An optional callable which will be passed the reader, a file
+            object open on the SEG Y file and the 4-tuple of catalogs returned by
+            catalog_traces() once the catalogs are complete.
+
+    Returns:
+        A Reader instance, or None if the file could not be opened for scanning in
+        the background, in which case fh is left at its original position.
+    """
+    seg_y_path = filename_from_handle(fh)
+    if seg_y_path == UNKNOWN_FILENAME:
+        log.info("Cannot catalog traces in the background for a file with an unknown name")
+        return None
+    try:
+        catalog_fh = open(seg_y_path, 'rb')
+    except OSError as os_error:
+        log.info("Cannot catalog traces in {} in the background because {}".format(seg_y_path, os_error))
+        return None
 
+    encoding, textual_reel_header, binary_reel_header, extended_textual_header = _read_reel_headers(
+        fh, encoding, endian)
+    bps = bytes_per_sample(binary_reel_header)
+    first_trace_pos = fh.tell()
+    catalog_fh.seek(first_trace_pos)
+
+    if dimensionality is None:
+        dimensionality = _guess_dimensionality(fh, bps, samples_per_trace(binary_reel_header),
+                                               trace_header_format, endian)
+
+    reader = None
+
+    def on_complete(catalog_fh, catalogs):
+        if save_catalogs is not None:
+            save_catalogs(reader, catalog_fh, catalogs)
+
+    cataloguer = BackgroundCataloguer(catalog_fh, bps, trace_header_format, endian, progress, on_complete)
+    reader = _construct_reader(fh, dimensionality, textual_reel_header, binary_reel_header, extended_textual_header,
+                               *cataloguer.catalogs(), trace_header_format=trace_header_format, encoding=encoding,
+                               endian=endian, access_mode=access_mode)
+    cataloguer.start()
+    return reader
+
+
+def _guess_dimensionality(fh, bps, num_samples, trace_header_format, endian):
+    """Guess the dimensionality of a SEG Y file from the headers of its first traces.
+
+    Args:
+        fh: A file-like-object open in binary mode, positioned at the start of the
+            first trace header.
+
+        bps: The number of bytes per sample.
+
+        num_samples: The number of samples per trace given in the binary reel header,
+            used to size the block of trace headers read.
+
+        trace_header_format: The class defining the trace header format.
+
+        endian: '>' for big-endian data, '<' for little-endian.
+
+    Returns:
+        The dimensionality of the reader which catalog_traces() would be expected
+        to produce, on the assumption that the remaining traces follow the pattern
+        of the first NUM_SAMPLED_TRACE_HEADERS.
+    """
+    CatalogSubFormat = make_sub_format(trace_header_format, CATALOG_FIELD_NAMES)
+
+    block_size = NUM_SAMPLED_TRACE_HEADERS * (TRACE_HEADER_NUM_BYTES + num_samples * bps)
+    trace_headers = scan_trace_headers(fh, fh.tell(), bps, CatalogSubFormat, endian, block_size=block_size)
+
+    cdp_catalog_builder = CatalogBuilder()
+    line_catalog_builder = CatalogBuilder()
+    alt_line_catalog_builder = CatalogBuilder()
+    num_sampled_traces = 0
+    for trace_number, (pos, fields) in enumerate(islice(trace_headers, NUM_SAMPLED_TRACE_HEADERS)):
+        file_sequence_num, ensemble_num, num_samples, inline_number, crossline_number = fields
+        line_catalog_builder.add((inline_number, crossline_number), trace_number)
+        alt_line_catalog_builder.add((file_sequence_num, ensemble_num), trace_number)
+        cdp_catalog_builder.add(ensemble_num, trace_number)
+        num_sampled_traces += 1
+
+    if num_sampled_traces == 0:
+        return 1
+    line_catalog = line_catalog_builder.create()
+    if line_catalog is None:
+        line_catalog = alt_line_catalog_builder.create()
+    return _dimensionality_of(cdp_catalog_builder.create(), line_catalog)
+
+
+def _dimensionality_of(cdp_catalog, line_catalog):
+    """The dimensionality of the reader for a file with the given catalogs."""
+    if cdp_catalog is not None and line_catalog is None:
+        return 2
+    elif line_catalog is not None:
+        return 3
+    return 1
+
+
+def _construct_reader(fh, dimensionality, textual_reel_header, binary_reel_header, extended_textual_header,
+                      trace_offset_catalog, trace_length_catalog, cdp_catalog, line_catalog,
+                      trace_header_format, encoding, endian, access_mode):
     assert 1 <= dimensionality <= 3
 
     trace_offset_catalog, trace_length_catalog, cdp_catalog, line_catalog = tuple(
-        catalog or {}
+        {} if catalog is None else catalog
         for catalog
         in (trace_offset_catalog, trace_length_catalog, cdp_catalog, line_catalog))
 
     if dimensionality == 1:
         return SegYReader(fh, textual_reel_header, binary_reel_header, extended_textual_header, trace_offset_catalog,
-                          trace_length_catalog, trace_header_format, encoding, endian)
+                          trace_length_catalog, trace_header_format, encoding, endian, access_mode)
     elif dimensionality == 2:
         return SegYReader2D(fh, textual_reel_header, binary_reel_header, extended_textual_header, trace_offset_catalog,
-                            trace_length_catalog, cdp_catalog, trace_header_format, encoding, endian)
+                            trace_length_catalog, cdp_catalog, trace_header_format, encoding, endian,
+                            access_mode)
     elif dimensionality == 3:
         return SegYReader3D(fh, textual_reel_header, binary_reel_header, extended_textual_header, trace_offset_catalog,
-                            trace_length_catalog, line_catalog, trace_header_format, encoding, endian)
+                            trace_length_catalog, line_catalog, trace_header_format, encoding, endian,
+                            access_mode)
     else:
         assert False, "dimensionality out of range 1-3 inclusive."
 
@@ -298,7 +808,8 @@ class SegYReader(Dataset):
                  trace_length_catalog,
                  trace_header_format,
                  encoding,
-                 endian='>'):
+                 endian='>',
+                 access_mode=STREAM_ACCESS):
         """Initialize a SegYReader around a file-like-object.
 
         Note:
@@ -329,8 +840,12 @@ class SegYReader(Dataset):
             endian: '>' for big-endian data (the standard and default), '<' for
                 little-endian (non-standard)
 
+            access_mode: One of the access mode constants from the segpy.access
+                module, determining how data are obtained from fh. Defaults to
+                STREAM_ACCESS.
         """
         self._fh = fh
+        self._attach_access(access_mode)
         self._endian = endian
         self._encoding = encoding
 
@@ -355,6 +870,8 @@ class SegYReader(Dataset):
         self._revision = extract_revision(self._binary_reel_header)
         self._bytes_per_sample = bytes_per_sample(self._binary_reel_header)
         self._max_num_trace_samples = None
+        self._trace_cache = None
+        self._readahead = None
 
     def __getstate__(self):
         """Copy the reader's state to a pickleable dictionary.
@@ -381,7 +898,9 @@ class SegYReader(Dataset):
         state['_file_name'] = filename
         state['_file_pos'] = file_pos
         state['_file_mode'] = file_mode
+        state['_access_mode'] = self.access_mode
         del state['_fh']
+        del state['_access']
         return state
 
     def __setstate__(self, state):
@@ -411,8 +930,50 @@ class SegYReader(Dataset):
         fh.seek(file_pos)
         del state['_file_pos']
 
+        self._attach_access(state['_access_mode'])
+        del state['_access_mode']
+
         self.__dict__.update(state)
 
+    def _attach_access(self, access_mode):
+        """Configure how data are obtained from the underlying file.
+
+        Args:
+            access_mode: One of the access mode constants from the segpy.access module.
+        """
+        self._access = make_access(self._fh, access_mode)
+
+    def verify_catalogs(self, progress=None):
+        """Check the catalogs of this reader against a scan of all trace headers.
+
+        Catalogs built by create_reader() with FIXED_LENGTH_CATALOG are inferred
+        from a sample of the trace headers. Use this method to confirm them.
+
+        Args:
+            progress: A unary callable which will be passed a number
+                between zero and one indicating the progress made.
+
+        Returns:
+            True if the catalogs agree with those built by scanning all trace
+            headers, otherwise False.
+        """
+        if self.num_traces() == 0:
+            return True
+        with restored_position_seek(self._fh, self._trace_offset_catalog[0]):
+            catalogs = catalog_traces(self._fh, self._bytes_per_sample, self.trace_header_format_class,
+                                      self._endian, progress)
+        return self._catalogs_agree(*(catalog or {} for catalog in catalogs))
+
+    def _catalogs_agree(self, trace_offset_catalog, trace_length_catalog, cdp_catalog, line_catalog):
+        return (self._trace_offset_catalog == trace_offset_catalog
+                and self._trace_length_catalog == trace_length_catalog)
+
+    def _index_metadata(self):
+        # A plain SegYReader, of dimensionality 0 or 1, is reconstructed for dimensionality 1
+        return {'dimensionality': max(1, self.dimensionality),
+                'encoding': self._encoding,
+                'endian': self._endian}
+
     def trace_indexes(self):
         """An iterator over zero-based trace_samples indexes.
 
@@ -456,14 +1017,130 @@ class SegYReader(Dataset):
                 slice convention this is one beyond the end.
 
         Returns:
-            A sequence of numeric trace_samples samples.
+            A sequence of numeric trace_samples samples. IBM float samples are
+            returned as a LazyIBMSamples sequence, which decodes only the
+            samples which are accessed.
 
         Usage:
 
             first_trace_samples = segy_reader.trace_samples(0)
             part_of_second_trace_samples = segy_reader.trace_samples(1, 1000, 2000)
         """
-        if not (0 <= trace_index < self.num_traces()):
+        extent = self._trace_samples_extent(trace_index, start, stop)
+        if self._readahead is not None:
+            trace_values = self._readahead.trace_samples(self, trace_index, start, stop)
+            if trace_values is not None:
+                if self._trace_cache is not None:
+                    self._trace_cache.put(extent, trace_values)
+                return trace_values
+
+        if self._trace_cache is not None:
+            trace_values = self._trace_cache.get(extent)
+            if trace_values is not None:
+                return trace_values
+
+        start_pos, num_samples_to_read = extent
+        buf = self._access.read(start_pos, num_samples_to_read * self._bytes_per_sample)
+        trace_values = unpack_trace_samples(buf, self.data_sample_format, num_samples_to_read, self._endian)
+
+        if self._trace_cache is not None:
+            self._trace_cache.put(extent, trace_values)
+        return trace_values
+
+    def trace_samples_raw(self, trace_index, start=None, stop=None):
+        """Read the encoded samples of a specific trace, without decoding them.
+
+        Args:
+            trace_index: An integer in the range zero to num_traces() - 1
+
+            start: Optional zero-based start sample index. The default
+                is to read from the first (i.e. zeroth) sample.
+
+            stop: Optional zero-based stop sample index. Following Python
+                slice convention this is one beyond the end.
+
+        Returns:
+            A RawTraceSamples. If the reader uses memory map access, the data
+            are a view of the memory map, which is valid only while the reader
+            remains open.
+
+        Raises:
+            EOFError: If the file ends before the last sample.
+        """
+        start_pos, num_samples_to_read = self._trace_samples_extent(trace_index, start, stop)
+        num_bytes = num_samples_to_read * self._bytes_per_sample
+        buf = self._access.read(start_pos, num_bytes)
+        if len(buf) < num_bytes:
+            raise EOFError("{} bytes requested but only {} available".format(num_bytes, len(buf)))
+        return RawTraceSamples(buf, self.data_sample_format, self._endian)
+
+    def trace_samples_many(self, trace_indexes, start=None, stop=None, max_gap=COALESCE_MAX_GAP_NUM_BYTES):
+        """Read the samples of many traces.
+
+        Rather than reading each trace separately, the traces are read in order
+        of their position in the file, and traces which are close together are
+        read with a single large read. This is much faster than calling
+        trace_samples() repeatedly where the traces are scattered through the
+        file, such as when extracting a crossline from a file sorted by inline.
+
+        Args:
+            trace_indexes: An iterable series of integers in the range zero to
+                num_traces() - 1
+
+            start: Optional zero-based start sample index, applied to every trace.
+                The default is to read from the first (i.e. zeroth) sample.
+
+            stop: Optional zero-based stop sample index, applied to every trace.
+                Following Python slice convention this is one beyond the end.
+
+            max_gap: The largest number of unwanted bytes between two traces
+                which will be read in order to read them together.
+
+        Returns:
+            A list containing a sequence of numeric samples for each trace index,
+            in the same order as trace_indexes.
+
+        Usage:
+
+            crossline_samples = segy_reader.trace_samples_many(
+                segy_reader.trace_index((inline, xline)) for inline in segy_reader.inline_numbers())
+        """
+        extents = [self._trace_samples_extent(trace_index, start, stop) for trace_index in trace_indexes]
+        trace_cache = self._trace_cache
+        if trace_cache is None:
+            trace_values = [None] * len(extents)
+        else:
+            trace_values = [trace_cache.get(extent) for extent in extents]
+        uncached_extent_indexes = [extent_index for extent_index, values in enumerate(trace_values)
+                                   if values is None]
+
+        bps = self._bytes_per_sample
+        seg_y_type = self.data_sample_format
+        uncached_extents = ((extents[extent_index][0], extents[extent_index][1] * bps)
+                            for extent_index in uncached_extent_indexes)
+        for read in plan_reads(uncached_extents, max_gap):
+            buf = memoryview(self._access.read(read.pos, read.num_bytes))
+            for extent_index in (uncached_extent_indexes[i] for i in read.extent_indexes):
+                pos, num_samples = extents[extent_index]
+                offset = pos - read.pos
+                values = unpack_trace_samples(buf[offset:offset + num_samples * bps],
+                                              seg_y_type, num_samples, self._endian)
+                trace_values[extent_index] = values
+                if trace_cache is not None:
+                    trace_cache.put(extents[extent_index], values)
+        return trace_values
+
+    def _trace_samples_extent(self, trace_index, start, stop):
+        """Locate a range of samples within a trace.
+
+        Returns:
+            A 2-tuple containing the file offset of the first sample to be read and
+            the number of samples to be read.
+
+        Raises:
+            ValueError: If trace_index, start or stop are out of range.
+        """
+        if trace_index not in self._trace_offset_catalog:
             raise ValueError("Trace index out of range.")
 
         num_samples_in_trace = self.num_trace_samples(trace_index)
@@ -484,12 +1161,9 @@ class SegYReader(Dataset):
                      + TRACE_HEADER_NUM_BYTES
                      + start_sample * size_in_bytes(SEG_Y_TYPE_TO_CTYPE[seg_y_type]))
         num_samples_to_read = stop_sample - start_sample
+        return start_pos, num_samples_to_read
 
-        trace_values = read_binary_values(
-            self._fh, start_pos, seg_y_type, num_samples_to_read, self._endian)
-        return trace_values
-
-    def trace_header(self, trace_index, header_packer_override=None):
+    def trace_header(self, trace_index, header_packer_override=None, fields=None):
         """Read a specific trace_samples.
 
         Args:
@@ -498,16 +1172,146 @@ class SegYReader(Dataset):
             header_packer_override: Override the default header packer (for example
                to more efficiently extract only a few fields)
 
+            fields: An optional iterable series of the fields to be decoded, each
+                of which is either the name of a field as a string, or an object
+                such as a NamedField with a 'name' attribute. If provided, the
+                returned header has only these fields, which is more efficient
+                when only a few fields are needed.
+
         Returns:
             A TraceHeader corresponding to the requested trace_samples.
+
+        Raises:
+            ValueError: If both header_packer_override and fields are provided, or if
+                fields contains a name which is not a field of the trace header format.
         """
-        if not (0 <= trace_index < self.num_traces()):
+        if trace_index not in self._trace_offset_catalog:
             raise ValueError("Trace index {} out of range".format(trace_index))
-        header_packer = self._trace_header_packer if header_packer_override is None else header_packer_override
+        header_packer = self._select_trace_header_packer(header_packer_override, fields)
         pos = self._trace_offset_catalog[trace_index]
-        trace_header = read_trace_header(self._fh, header_packer, pos)
+        buf = self._access.read(pos, TRACE_HEADER_NUM_BYTES)
+        trace_header = header_packer.unpack(buf)
         return trace_header
 
+    def trace_headers_many(self, trace_indexes, header_packer_override=None, max_gap=COALESCE_MAX_GAP_NUM_BYTES,
+                           fields=None):
+        """Read the headers of many traces.
+
+        As with trace_samples_many(), headers which are close together in the
+        file are read with a single large read.
+
+        Args:
+            trace_indexes: An iterable series of integers in the range zero to
+                num_traces() - 1
+
+            header_packer_override: Override the default header packer (for example
+               to more efficiently extract only a few fields)
+
+            max_gap: The largest number of unwanted bytes between two trace headers
+                which will be read in order to read them together.
+
+            fields: An optional iterable series of the fields to be decoded, as for
+                trace_header().
+
+        Returns:
+            A list of TraceHeaders, in the same order as trace_indexes.
+
+        Raises:
+            ValueError: If both header_packer_override and fields are provided, or if
+                fields contains a name which is not a field of the trace header format.
+        """
+        header_packer = self._select_trace_header_packer(header_packer_override, fields)
+        buf = memoryview(self.trace_header_bytes_many(trace_indexes, max_gap))
+        return [header_packer.unpack(buf[offset:offset + TRACE_HEADER_NUM_BYTES])
+                for offset in range(0, len(buf), TRACE_HEADER_NUM_BYTES)]
+
+    def trace_header_bytes_many(self, trace_indexes, max_gap=COALESCE_MAX_GAP_NUM_BYTES):
+        """Read the undecoded headers of many traces.
+
+        Headers which are close together in the file are read with a single
+        large read, as for trace_headers_many(). The result is suitable for
+        decoding many headers at once, for example as a Numpy structured array.
+
+        Args:
+            trace_indexes: An iterable series of integers in the range zero to
+                num_traces() - 1
+
+            max_gap: The largest number of unwanted bytes between two trace headers
+                which will be read in order to read them together.
+
+        Returns:
+            A bytearray containing the TRACE_HEADER_NUM_BYTES bytes of each
+            trace header, in the same order as trace_indexes, and in the
+            endianness of the file.
+
+        Raises:
+            EOFError: If the file ends before the last trace header.
+        """
+        positions = []
+        for trace_index in trace_indexes:
+            if trace_index not in self._trace_offset_catalog:
+                raise ValueError("Trace index {} out of range".format(trace_index))
+            positions.append(self._trace_offset_catalog[trace_index])
+        header_bytes = bytearray(len(positions) * TRACE_HEADER_NUM_BYTES)
+        for read in plan_reads(((pos, TRACE_HEADER_NUM_BYTES) for pos in positions), max_gap):
+            buf = memoryview(self._access.read(read.pos, read.num_bytes))
+            if len(buf) < read.num_bytes:
+                raise EOFError("{} bytes requested but only {} available".format(read.num_bytes, len(buf)))
+            for extent_index in read.extent_indexes:
+                offset = positions[extent_index] - read.pos
+                header_offset = extent_index * TRACE_HEADER_NUM_BYTES
+                header_bytes[header_offset:header_offset + TRACE_HEADER_NUM_BYTES] = \
+                    buf[offset:offset + TRACE_HEADER_NUM_BYTES]
+        return header_bytes
+
+    def _select_trace_header_packer(self, header_packer_override, fields):
+        """Obtain the header packer for reading trace headers.
+
+        Packers for subsets of fields are shared by all readers with the same
+        trace header format and endianness.
+        """
+        if fields is None:
+            return self._trace_header_packer if header_packer_override is None else header_packer_override
+        if header_packer_override is not None:
+            raise ValueError("Only one of header_packer_override and fields may be provided")
+        field_names = tuple(getattr(field, 'name', field) for field in fields)
+        trace_header_format = self.trace_header_format_class
+        for field_name in field_names:
+            if field_name not in trace_header_format.ordered_field_names():
+                raise ValueError("{!r} is not a field of {}".format(field_name, trace_header_format.__name__))
+        return make_header_packer(make_sub_format(trace_header_format, field_names), self._endian)
+
+    @property
+    def trace_cache(self):
+        """The TraceCache in which decoded trace samples are kept, or None if samples are not cached.
+
+        Samples are cached for each distinct range of samples within a trace, so
+        trace_samples(i) and trace_samples(i, start, stop) are cached separately
+        unless start and stop span the whole trace. Samples obtained from the
+        cache are shared, so should not be modified. A TraceCache may be
+        assigned to this property, or it may be set to None to stop caching.
+        """
+        return self._trace_cache
+
+    @trace_cache.setter
+    def trace_cache(self, trace_cache):
+        self._trace_cache = trace_cache
+
+    @property
+    def readahead(self):
+        """The Readahead which reads traces ahead of sequential calls to trace_samples(), or None.
+
+        A Readahead may be assigned to this property, or it may be set to None to
+        stop reading ahead.
+        """
+        return self._readahead
+
+    @readahead.setter
+    def readahead(self, readahead):
+        if self._readahead is not None:
+            self._readahead.stop()
+        self._readahead = readahead
+
     @property
     def trace_header_format_class(self):
         """The trace header format class. Instances of this class are returned from trace_header() unless the
@@ -560,6 +1364,12 @@ class SegYReader(Dataset):
         """
         return self._bytes_per_sample
 
+    @property
+    def access_mode(self):
+        """How data are obtained from the underlying file. One of the access mode constants
+           from the segpy.access module."""
+        return self._access.mode
+
     @property
     def encoding(self):
         """The encoding, of the data in the underlying file. Either ASCII ('ascii'),
@@ -591,7 +1401,8 @@ class SegYReader3D(SegYReader):
                  line_catalog,
                  trace_header_format,
                  encoding,
-                 endian='>'):
+                 endian='>',
+                 access_mode=STREAM_ACCESS):
         """Initialize a SegYReader3D around a file-like-object.
 
         Note:
@@ -619,10 +1430,14 @@ class SegYReader3D(SegYReader):
 
             endian: '>' for big-endian data (the standard and default), '<' for
                 little-endian (non-standard)
+
+            access_mode: One of the access mode constants from the segpy.access
+                module, determining how data are obtained from fh. Defaults to
+                STREAM_ACCESS.
         """
         super(SegYReader3D, self).__init__(fh, textual_reel_header, binary_reel_header, extended_textual_headers,
                                            trace_offset_catalog, trace_length_catalog, trace_header_format,
-                                           encoding, endian)
+                                           encoding, endian, access_mode)
 
         if line_catalog is None:
             raise TypeError(
@@ -642,6 +1457,10 @@ class SegYReader3D(SegYReader):
     def _dimensionality(self):
         return 3
 
+    def _catalogs_agree(self, trace_offset_catalog, trace_length_catalog, cdp_catalog, line_catalog):
+        return (super()._catalogs_agree(trace_offset_catalog, trace_length_catalog, cdp_catalog, line_catalog)
+                and self._line_catalog == line_catalog)
+
     def inline_numbers(self):
         """A sorted immutable collection of inline numbers.
 
@@ -738,7 +1557,8 @@ class SegYReader2D(SegYReader):
                  cdp_catalog,
                  trace_header_format,
                  encoding,
-                 endian='>'):
+                 endian='>',
+                 access_mode=STREAM_ACCESS):
         """Initialize a SegYReader2D around a file-like-object.
 
         Note:
@@ -765,10 +1585,14 @@ class SegYReader2D(SegYReader):
 
             endian: '>' for big-endian data (the standard and default), '<' for
                 little-endian (non-standard)
+
+            access_mode: One of the access mode constants from the segpy.access
+                module, determining how data are obtained from fh. Defaults to
+                STREAM_ACCESS.
         """
         super(SegYReader2D, self).__init__(fh, textual_reel_header, binary_reel_header, extended_textual_headers,
                                            trace_offset_catalog, trace_length_catalog, trace_header_format,
-                                           encoding, endian)
+                                           encoding, endian, access_mode)
 
         if cdp_catalog is None:
             raise TypeError(
@@ -786,6 +1610,10 @@ class SegYReader2D(SegYReader):
     def _dimensionality(self):
         return 2
 
+    def _catalogs_agree(self, trace_offset_catalog, trace_length_catalog, cdp_catalog, line_catalog):
+        return (super()._catalogs_agree(trace_offset_catalog, trace_length_catalog, cdp_catalog, line_catalog)
+                and self._cdp_catalog == cdp_catalog)
+
     def cdp_numbers(self):
         """A sorted immutable collection of CDP numbers.
 
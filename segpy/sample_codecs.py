@@ -0,0 +1,221 @@
+"""A registry of codecs for encoding and decoding trace samples.
+
+Each SEG Y data type ('ibm', 'int8', 'int16', 'int32', 'float32') may have
+several registered codecs, such as the C++ extension, Numpy and pure Python
+implementations of IBM float conversion. The codec used for each data type is
+chosen the first time that data type is encoded or decoded. By default the
+available codec with the highest priority is chosen, but the choice can instead
+be made by timing each available codec on a sample of values, by calling
+configure_codecs(benchmark=True) or by setting the SEGPY_BENCHMARK_CODECS
+environment variable before any samples are decoded.
+
+The codec chosen for each data type can be found with active_codec() or
+active_codecs(), and a particular codec can be required with use_codec(), so
+that a slow fallback implementation is never used unknowingly.
+"""
+
+import logging
+import os
+import time
+from collections import namedtuple
+
+log = logging.getLogger(__name__)
+
+BENCHMARK_CODECS_ENV_VAR = 'SEGPY_BENCHMARK_CODECS'
+
+# The number of values encoded and decoded by each codec when benchmarking
+BENCHMARK_NUM_ITEMS = 4096
+
+# The number of times each codec is timed when benchmarking, of which the fastest is used
+BENCHMARK_NUM_REPEATS = 3
+
+SampleCodec = namedtuple('SampleCodec', ['seg_y_type', 'name', 'unpack', 'pack', 'priority'])
+SampleCodec.__doc__ = """A codec for the samples of one SEG Y data type.
+
+    Attributes:
+        seg_y_type: The SEG Y data type, such as 'ibm'.
+
+        name: The name of the codec, unique for the data type, such as 'numpy'.
+
+        unpack: A callable accepting a bytes-like object, a number of items and an
+            endianness ('>' or '<'), and returning a sequence of decoded values.
+
+        pack: A callable accepting a sequence of values and an endianness, and
+            returning a bytes-like object containing the encoded values.
+
+        priority: The codec with the highest priority among those registered for
+            a data type is used, unless codecs are benchmarked.
+    """
+
+# A mapping from SEG Y data types to dictionaries mapping codec names to SampleCodecs
+_codecs = {}
+
+# A mapping from SEG Y data types to the SampleCodec chosen for the type
+_active_codecs = {}
+
+# The SEG Y data types for which a codec has been required by use_codec()
+_required_types = set()
+
+_benchmark = None
+
+
+def register_codec(seg_y_type, name, unpack, pack, priority=0):
+    """Register a codec for a SEG Y data type.
+
+    Registering a codec with the same data type and name as an existing codec
+    replaces it. The codec for the data type is chosen again when next used,
+    unless one has been required by use_codec().
+
+    Args:
+        seg_y_type: The SEG Y data type, such as 'ibm'.
+
+        name: The name of the codec, such as 'numpy'.
+
+        unpack: A callable as described for SampleCodec.unpack.
+
+        pack: A callable as described for SampleCodec.pack.
+
+        priority: An optional number. The registered codec with the highest
+            priority is used for the data type, unless codecs are benchmarked.
+
+    Returns:
+        The registered SampleCodec.
+    """
+    codec = SampleCodec(seg_y_type, name, unpack, pack, priority)
+    _codecs.setdefault(seg_y_type, {})[name] = codec
+    if seg_y_type not in _required_types:
+        _active_codecs.pop(seg_y_type, None)
+    return codec
+
+
+def registered_codecs(seg_y_type):
+    """The codecs registered for a SEG Y data type.
+
+    Returns:
+        A list of SampleCodecs, in order of decreasing priority.
+    """
+    return sorted(_codecs.get(seg_y_type, {}).values(), key=lambda codec: codec.priority, reverse=True)
+
+
+def active_codec(seg_y_type):
+    """The codec used for a SEG Y data type, choosing one if necessary.
+
+    Args:
+        seg_y_type: The SEG Y data type, such as 'ibm'.
+
+    Returns:
+        A SampleCodec.
+
+    Raises:
+        ValueError: If no codec is registered for seg_y_type.
+    """
+    try:
+        return _active_codecs[seg_y_type]
+    except KeyError:
+        pass
+
+    codecs = registered_codecs(seg_y_type)
+    if len(codecs) == 0:
+        raise ValueError("No codec is registered for SEG Y type {!r}".format(seg_y_type))
+    if len(codecs) > 1 and _benchmark_configured():
+        codec = _fastest_codec(codecs)
+    else:
+        codec = codecs[0]
+    log.info("Using {!r} codec for SEG Y type {!r}".format(codec.name, seg_y_type))
+    _active_codecs[seg_y_type] = codec
+    return codec
+
+
+def active_codecs():
+    """The names of the codecs used for all SEG Y data types with registered codecs.
+
+    Codecs are chosen for any data types for which a codec has not yet been chosen.
+
+    Returns:
+        A dictionary mapping SEG Y data types to codec names.
+    """
+    return {seg_y_type: active_codec(seg_y_type).name for seg_y_type in _codecs}
+
+
+def use_codec(seg_y_type, name):
+    """Require that a particular codec be used for a SEG Y data type.
+
+    Args:
+        seg_y_type: The SEG Y data type, such as 'ibm'.
+
+        name: The name of a registered codec for seg_y_type, or None to have
+            the codec chosen automatically.
+
+    Returns:
+        The SampleCodec which will be used, or None if it is to be chosen automatically.
+
+    Raises:
+        ValueError: If no codec called name is registered for seg_y_type.
+    """
+    if name is None:
+        _required_types.discard(seg_y_type)
+        _active_codecs.pop(seg_y_type, None)
+        return None
+    try:
+        codec = _codecs[seg_y_type][name]
+    except KeyError:
+        raise ValueError("No codec {!r} is registered for SEG Y type {!r}. Available codecs are {}"
+                         .format(name, seg_y_type, [c.name for c in registered_codecs(seg_y_type)])) from None
+    _required_types.add(seg_y_type)
+    _active_codecs[seg_y_type] = codec
+    return codec
+
+
+def configure_codecs(benchmark):
+    """Configure how codecs are chosen.
+
+    Codecs which have already been chosen are chosen again when next used,
+    unless they have been required by use_codec().
+
+    Args:
+        benchmark: If True, the codec for each data type is chosen by timing each
+            registered codec on a sample of values. If False, the registered codec
+            with the highest priority is chosen.
+    """
+    global _benchmark
+    _benchmark = bool(benchmark)
+    for seg_y_type in list(_active_codecs):
+        if seg_y_type not in _required_types:
+            del _active_codecs[seg_y_type]
+
+
+def _benchmark_configured():
+    global _benchmark
+    if _benchmark is None:
+        _benchmark = os.environ.get(BENCHMARK_CODECS_ENV_VAR, '') not in ('', '0')
+    return _benchmark
+
+
+def _fastest_codec(codecs):
+    """Determine which of several codecs for the same data type is fastest.
+
+    Each codec is timed packing, and then unpacking, a sample of small values.
+    Codecs which fail are not chosen.
+    """
+    values = [i % 100 for i in range(BENCHMARK_NUM_ITEMS)]
+    fastest_codec = None
+    fastest_duration = None
+    for codec in codecs:
+        try:
+            duration = min(_time_codec(codec, values) for _ in range(BENCHMARK_NUM_REPEATS))
+        except Exception as error:
+            log.warning("Could not benchmark {!r} codec for SEG Y type {!r} because {}"
+                        .format(codec.name, codec.seg_y_type, error))
+            continue
+        log.debug("{!r} codec for SEG Y type {!r} took {} seconds"
+                  .format(codec.name, codec.seg_y_type, duration))
+        if fastest_duration is None or duration < fastest_duration:
+            fastest_codec, fastest_duration = codec, duration
+    return fastest_codec if fastest_codec is not None else codecs[0]
+
+
+def _time_codec(codec, values):
+    start_time = time.perf_counter()
+    buf = codec.pack(values, '>')
+    codec.unpack(buf, len(values), '>')
+    return time.perf_counter() - start_time
@@ -2,7 +2,9 @@ from __future__ import print_function
 
 from array import array
 from collections import OrderedDict
-from itertools import zip_longest, count
+from itertools import zip_longest
+from operator import itemgetter
+from struct import Struct
 
 import os
 import struct
@@ -11,13 +13,15 @@ import logging
 
 from segpy import textual_reel_header
 from segpy.binary_reel_header import BinaryReelHeader
-from segpy.catalog import CatalogBuilder
+from segpy.catalog import (CatalogBuilder, LinearRegularCatalog, RegularConstantCatalog,
+                           LastIndexVariesQuickestCatalog2D, FirstIndexVariesQuickestCatalog2D)
 from segpy.datatypes import SEG_Y_TYPE_TO_CTYPE, size_in_bytes, DATA_SAMPLE_FORMAT_TO_SEG_Y_TYPE, CTYPE_TO_SIZE, ENDIAN
 from segpy.encoding import guess_encoding, is_supported_encoding, UnsupportedEncodingError
-from segpy.header import SubFormatMeta
+from segpy.header import make_sub_format
 from segpy.ibm_float import IBMFloat
-from segpy.packer import make_header_packer
+from segpy.packer import make_header_packer, compile_struct
 from segpy.revisions import canonicalize_revision
+from segpy.sample_codecs import register_codec, active_codec
 from segpy.trace_header import TraceHeaderRev1
 from segpy.util import file_length, batched, pad, complementary_intervals, NATIVE_ENDIANNESS, EMPTY_BYTE_STRING, \
     restored_position_seek
@@ -30,6 +34,19 @@ except ImportError:
     pack_ibm_floats_cpp = None
     unpack_ibm_floats_cpp = None
 
+try:
+    from segpy.ibm_float_numpy import pack_ibm_floats_numpy, unpack_ibm_floats_numpy
+except ImportError:
+    pack_ibm_floats_numpy = None
+    unpack_ibm_floats_numpy = None
+
+try:
+    from segpy.values_numpy import pack_values_numpy, unpack_values_numpy, is_numpy_array
+except ImportError:
+    pack_values_numpy = None
+    unpack_values_numpy = None
+    is_numpy_array = None
+
 
 HEADER_NEWLINE = '\r\n'
 
@@ -46,8 +63,9 @@ END_TEXT_STANZA = "((SEG: EndText))"
 
 # Boolean controller whether the Python implementation of IBM floating points
 # numbers will be required. If this is True, then the Python implementation
-# will always be used. If it is False (default) then the C++ implementation
-# will be used if it's available.
+# will always be used. If it is False (default) then the codec chosen by the
+# sample_codecs registry is used, which by default is the C++ implementation
+# if it's available, otherwise the Numpy implementation if Numpy is installed.
 force_python_ibm_floats = False
 
 
@@ -354,8 +372,19 @@ def read_extended_textual_headers(fh, binary_reel_header, encoding):
 _READ_PROPORTION = 0.75  # The proportion of time spent in catalog_traces
                          # reading the file. Determined empirically.
 
+CATALOG_BLOCK_NUM_BYTES = 4 * 1024 * 1024  # The size of the blocks read when cataloguing traces
+
+CATALOG_FIELD_NAMES = (
+    'file_sequence_num',
+    'ensemble_num',
+    'num_samples',
+    'inline_number',
+    'crossline_number',
+)
 
-def catalog_traces(fh, bps, trace_header_format=TraceHeaderRev1, endian='>', progress=None):
+
+def catalog_traces(fh, bps, trace_header_format=TraceHeaderRev1, endian='>', progress=None,
+                   block_size=CATALOG_BLOCK_NUM_BYTES, observer=None):
     """Build catalogs to facilitate random access to trace_samples data.
 
     Note:
@@ -393,6 +422,14 @@ def catalog_traces(fh, bps, trace_header_format=TraceHeaderRev1, endian='>', pro
             provided, this callback will be invoked at least once with
             an argument equal to 1
 
+        block_size: The number of bytes to read from the file at a time.
+            Many trace headers are decoded from each block.
+
+        observer: An optional callable which will be passed the trace index,
+            the file offset of the trace header and the number of samples in
+            the trace as each trace header is scanned, so that traces can be
+            located before the catalogs are complete.
+
     Returns:
         A 4-tuple of the form::
 
@@ -409,18 +446,10 @@ def catalog_traces(fh, bps, trace_header_format=TraceHeaderRev1, endian='>', pro
     if not callable(progress_callback):
         raise TypeError("catalog_traces(): progress callback must be callable")
 
-    class CatalogSubFormat(metaclass=SubFormatMeta,
-                           parent_format=trace_header_format,
-                           parent_field_names=(
-                               'file_sequence_num',
-                               'ensemble_num',
-                               'num_samples',
-                               'inline_number',
-                               'crossline_number',
-                           )):
-        pass
+    if observer is not None and not callable(observer):
+        raise TypeError("catalog_traces(): observer must be callable")
 
-    trace_header_packer = make_header_packer(CatalogSubFormat, endian)
+    CatalogSubFormat = make_sub_format(trace_header_format, CATALOG_FIELD_NAMES)
 
     length = file_length(fh)
 
@@ -432,28 +461,26 @@ def catalog_traces(fh, bps, trace_header_format=TraceHeaderRev1, endian='>', pro
     alt_line_catalog_builder = CatalogBuilder()
     cdp_catalog_builder = CatalogBuilder()
 
-    for trace_number in count():
-        progress_callback(_READ_PROPORTION * pos_begin / length)
-        fh.seek(pos_begin)
-        data = fh.read(TRACE_HEADER_NUM_BYTES)
-        if len(data) < TRACE_HEADER_NUM_BYTES:
-            break
-        trace_header = trace_header_packer.unpack(data)
+    add_trace_offset = trace_offset_catalog_builder.add
+    add_trace_length = trace_length_catalog_builder.add
+    add_line = line_catalog_builder.add
+    add_alt_line = alt_line_catalog_builder.add
+    add_cdp = cdp_catalog_builder.add
 
-        num_samples = trace_header.num_samples
-        trace_length_catalog_builder.add(trace_number, num_samples)
-        samples_bytes = num_samples * bps
-        trace_offset_catalog_builder.add(trace_number, pos_begin)
+    trace_headers = scan_trace_headers(fh, pos_begin, bps, CatalogSubFormat, endian,
+                                       lambda pos: progress_callback(_READ_PROPORTION * pos / length),
+                                       block_size)
+
+    for trace_number, (pos, fields) in enumerate(trace_headers):
+        file_sequence_num, ensemble_num, num_samples, inline_number, crossline_number = fields
+        add_trace_length(trace_number, num_samples)
+        add_trace_offset(trace_number, pos)
         # Should we check the data actually exists?
-        line_catalog_builder.add((trace_header.inline_number,
-                                  trace_header.crossline_number),
-                                 trace_number)
-        alt_line_catalog_builder.add((trace_header.file_sequence_num,
-                                     trace_header.ensemble_num),
-                                     trace_number)
-        cdp_catalog_builder.add(trace_header.ensemble_num, trace_number)
-        pos_end = pos_begin + TRACE_HEADER_NUM_BYTES + samples_bytes
-        pos_begin = pos_end
+        add_line((inline_number, crossline_number), trace_number)
+        add_alt_line((file_sequence_num, ensemble_num), trace_number)
+        add_cdp(ensemble_num, trace_number)
+        if observer is not None:
+            observer(trace_number, pos, num_samples)
 
     progress_callback(_READ_PROPORTION)
 
@@ -480,6 +507,387 @@ def catalog_traces(fh, bps, trace_header_format=TraceHeaderRev1, endian='>', pro
             line_catalog)
 
 
+def extend_catalogs(fh, bps, catalogs, trace_header_format=TraceHeaderRev1, endian='>', progress=None,
+                    block_size=CATALOG_BLOCK_NUM_BYTES):
+    """Extend catalogs to include traces appended to a file since they were built.
+
+    The trace headers following the last trace in the catalogs are scanned, and
+    the existing catalogs are merged with the new entries. The existing part of the
+    file is not read again, apart from a couple of trace headers.
+
+    Args:
+        fh: A file-like-object open in binary mode.
+
+        bps: The number of bytes per sample, such as obtained by a call
+            to bytes_per_sample()
+
+        catalogs: A 4-tuple of catalogs as returned by catalog_traces() for the file
+            before traces were appended to it.
+
+        trace_header_format: The class defining the trace header format.
+            Defaults to TraceHeaderRev1.
+
+        endian: '>' for big-endian data (the standard and default), '<'
+            for little-endian (non-standard)
+
+        progress: A unary callable which will be passed a number
+            between zero and one indicating the progress made.
+
+        block_size: The number of bytes to read from the file at a time.
+
+    Returns:
+        A 4-tuple of catalogs in the same form as returned by catalog_traces(), or
+        None if the catalogs cannot be extended so as to be the same as those which
+        catalog_traces() would build for the whole file.
+    """
+    progress_callback = progress if progress is not None else lambda p: None
+
+    if not callable(progress_callback):
+        raise TypeError("extend_catalogs(): progress callback must be callable")
+
+    trace_offset_catalog, trace_length_catalog, cdp_catalog, line_catalog = catalogs
+    num_traces = len(trace_offset_catalog)
+    if num_traces == 0:
+        return None
+
+    CatalogSubFormat = make_sub_format(trace_header_format, CATALOG_FIELD_NAMES)
+
+    last_trace_index = num_traces - 1
+    pos_begin = (trace_offset_catalog[last_trace_index] + TRACE_HEADER_NUM_BYTES
+                 + trace_length_catalog[last_trace_index] * bps)
+
+    # Determine whether the line catalog was built from (inline, crossline) or
+    # (file sequence, ensemble) numbers, by looking up the first and last traces
+    alt_line_keys = False
+    if line_catalog is not None:
+        header_packer = make_header_packer(CatalogSubFormat, endian)
+        for trace_index in (0, last_trace_index):
+            fh.seek(trace_offset_catalog[trace_index])
+            header = header_packer.unpack(fh.read(TRACE_HEADER_NUM_BYTES))
+            is_line_key = line_catalog.get((header.inline_number, header.crossline_number)) == trace_index
+            is_alt_line_key = line_catalog.get((header.file_sequence_num, header.ensemble_num)) == trace_index
+            if is_line_key != is_alt_line_key:
+                alt_line_keys = is_alt_line_key
+                break
+
+    trace_offset_catalog_builder = CatalogBuilder(trace_offset_catalog)
+    trace_length_catalog_builder = CatalogBuilder(trace_length_catalog)
+    cdp_catalog_builder = CatalogBuilder(cdp_catalog) if cdp_catalog is not None else None
+    line_catalog_builder = CatalogBuilder(line_catalog) if line_catalog is not None else None
+
+    length = file_length(fh)
+    num_new_bytes = max(1, length - pos_begin)
+    trace_headers = scan_trace_headers(fh, pos_begin, bps, CatalogSubFormat, endian,
+                                       lambda pos: progress_callback(
+                                           _READ_PROPORTION * (pos - pos_begin) / num_new_bytes),
+                                       block_size)
+
+    for trace_number, (pos, fields) in enumerate(trace_headers, start=num_traces):
+        file_sequence_num, ensemble_num, num_samples, inline_number, crossline_number = fields
+        trace_offset_catalog_builder.add(trace_number, pos)
+        trace_length_catalog_builder.add(trace_number, num_samples)
+        if cdp_catalog_builder is not None:
+            cdp_catalog_builder.add(ensemble_num, trace_number)
+        if line_catalog_builder is not None:
+            if alt_line_keys:
+                line_catalog_builder.add((file_sequence_num, ensemble_num), trace_number)
+            else:
+                line_catalog_builder.add((inline_number, crossline_number), trace_number)
+
+    progress_callback(_READ_PROPORTION)
+
+    extended_line_catalog = line_catalog_builder.create() if line_catalog_builder is not None else None
+    if line_catalog is not None and extended_line_catalog is None and not alt_line_keys:
+        # A full scan might now build the line catalog from the alternative keys
+        return None
+
+    extended_catalogs = (trace_offset_catalog_builder.create(),
+                         trace_length_catalog_builder.create(),
+                         cdp_catalog_builder.create() if cdp_catalog_builder is not None else None,
+                         extended_line_catalog)
+    progress_callback(1)
+    return extended_catalogs
+
+
+NUM_SAMPLED_TRACE_HEADERS = 64  # The approximate number of headers read by catalog_fixed_length_traces
+
+
+def catalog_fixed_length_traces(fh, bps, num_samples, trace_header_format=TraceHeaderRev1, endian='>',
+                                num_sampled_headers=NUM_SAMPLED_TRACE_HEADERS):
+    """Build catalogs for a file in which all traces have the same length, without a full scan.
+
+    The trace offset and trace length catalogs are derived arithmetically from the
+    file length and the number of samples per trace. The CDP and line catalogs are
+    inferred from a strided sample of trace headers, on the assumption that the
+    ensemble numbers vary linearly with trace index and that the inline and crossline
+    numbers describe a regular grid in which traces are ordered with one index varying
+    quickest.
+
+    The catalogs returned are identical to those which catalog_traces() would return,
+    provided that the unsampled trace headers follow the same pattern as the sampled
+    ones. Use catalog_traces() to verify them if necessary.
+
+    Args:
+        fh: A file-like-object open in binary mode, positioned at the
+            start of the first trace_samples header.
+
+        bps: The number of bytes per sample, such as obtained by a call
+            to bytes_per_sample()
+
+        num_samples: The number of samples in every trace, such as obtained by a
+            call to samples_per_trace()
+
+        trace_header_format: The class defining the trace header format.
+            Defaults to TraceHeaderRev1.
+
+        endian: '>' for big-endian data (the standard and default), '<'
+            for little-endian (non-standard)
+
+        num_sampled_headers: The approximate number of trace headers to be read.
+
+    Returns:
+        A 4-tuple of catalogs in the same form as returned by catalog_traces(), or
+        None if the file does not consist of traces of num_samples samples, or if
+        the sampled headers do not follow a pattern from which the catalogs can be
+        inferred.
+    """
+
+    CatalogSubFormat = make_sub_format(trace_header_format, CATALOG_FIELD_NAMES)
+
+    header_packer = make_header_packer(CatalogSubFormat, endian)
+
+    pos_begin = fh.tell()
+    trace_num_bytes = TRACE_HEADER_NUM_BYTES + num_samples * bps
+    num_trace_bytes = file_length(fh) - pos_begin
+    num_traces, remainder = divmod(num_trace_bytes, trace_num_bytes)
+    if num_traces < 1 or remainder != 0:
+        return None
+
+    def read_header(trace_index):
+        fh.seek(pos_begin + trace_index * trace_num_bytes)
+        return header_packer.unpack(fh.read(TRACE_HEADER_NUM_BYTES))
+
+    sample_stride = max(1, num_traces // num_sampled_headers)
+    sampled_trace_indexes = set(range(0, num_traces, sample_stride))
+    sampled_trace_indexes.update((1, num_traces - 1))
+    sampled_headers = {trace_index: read_header(trace_index)
+                       for trace_index in sorted(sampled_trace_indexes)
+                       if trace_index < num_traces}
+
+    if any(header.num_samples != num_samples for header in sampled_headers.values()):
+        return None
+
+    if num_traces == 1:
+        trace_offset_catalog = CatalogBuilder([(0, pos_begin)]).create()
+        trace_length_catalog = CatalogBuilder([(0, num_samples)]).create()
+    else:
+        trace_offset_catalog = LinearRegularCatalog(0, num_traces - 1, 1,
+                                                    pos_begin, pos_begin + (num_traces - 1) * trace_num_bytes,
+                                                    trace_num_bytes)
+        trace_length_catalog = RegularConstantCatalog(0, num_traces - 1, 1, num_samples)
+
+    cdp_catalog = _infer_catalog_1d(
+        {trace_index: header.ensemble_num for trace_index, header in sampled_headers.items()},
+        num_traces)
+
+    line_keys = {trace_index: (header.inline_number, header.crossline_number)
+                 for trace_index, header in sampled_headers.items()}
+    line_catalog = _infer_catalog_2d(line_keys, num_traces)
+
+    if line_catalog is None:
+        # Some 3D files put Inline and Crossline numbers in (TraceSequenceFile, cdp) pair
+        alt_line_keys = {trace_index: (header.file_sequence_num, header.ensemble_num)
+                         for trace_index, header in sampled_headers.items()}
+        line_catalog = _infer_catalog_2d(alt_line_keys, num_traces)
+
+    if cdp_catalog is _UNKNOWN_CATALOG or line_catalog is _UNKNOWN_CATALOG:
+        return None
+
+    return (trace_offset_catalog,
+            trace_length_catalog,
+            cdp_catalog,
+            line_catalog)
+
+
+_UNKNOWN_CATALOG = object()
+
+
+def _infer_catalog_1d(sampled_keys, num_traces):
+    """Infer a catalog mapping keys to trace indexes from a sample of keys.
+
+    Args:
+        sampled_keys: A mapping of trace indexes, including the first and last, to scalar keys.
+
+        num_traces: The total number of traces.
+
+    Returns:
+        The catalog which CatalogBuilder would create if the keys vary linearly with
+        trace index, None if the sampled keys contain duplicates, otherwise _UNKNOWN_CATALOG.
+    """
+    if len(set(sampled_keys.values())) != len(sampled_keys):
+        return None
+
+    first_key = sampled_keys[0]
+    if num_traces == 1:
+        return CatalogBuilder([(first_key, 0)]).create()
+
+    last_key = sampled_keys[num_traces - 1]
+    key_stride, remainder = divmod(last_key - first_key, num_traces - 1)
+    if remainder != 0 or any(key != first_key + trace_index * key_stride
+                             for trace_index, key in sampled_keys.items()):
+        return _UNKNOWN_CATALOG
+
+    if key_stride > 0:
+        return LinearRegularCatalog(first_key, last_key, key_stride, 0, num_traces - 1, 1)
+    return LinearRegularCatalog(last_key, first_key, -key_stride, num_traces - 1, 0, -1)
+
+
+def _infer_catalog_2d(sampled_keys, num_traces):
+    """Infer a catalog mapping (i, j) keys to trace indexes from a sample of keys.
+
+    Args:
+        sampled_keys: A mapping of trace indexes, including the first, second and last,
+            to 2-tuple keys.
+
+        num_traces: The total number of traces.
+
+    Returns:
+        The catalog which CatalogBuilder would create if the keys form a regular grid
+        with both i and j ascending and traces ordered with one index varying quickest,
+        None if the sampled keys contain duplicates, otherwise _UNKNOWN_CATALOG.
+    """
+    if len(set(sampled_keys.values())) != len(sampled_keys):
+        return None
+
+    i_first, j_first = sampled_keys[0]
+    if num_traces == 1:
+        return CatalogBuilder([((i_first, j_first), 0)]).create()
+
+    i_second, j_second = sampled_keys[1]
+    i_last, j_last = sampled_keys[num_traces - 1]
+
+    if i_second == i_first:
+        j_quickest = True
+        quick_first, quick_second, quick_last, slow_first, slow_last = j_first, j_second, j_last, i_first, i_last
+    elif j_second == j_first:
+        j_quickest = False
+        quick_first, quick_second, quick_last, slow_first, slow_last = i_first, i_second, i_last, j_first, j_last
+    else:
+        return _UNKNOWN_CATALOG
+
+    quick_stride = quick_second - quick_first
+    if quick_stride <= 0 or (quick_last - quick_first) % quick_stride != 0:
+        return _UNKNOWN_CATALOG
+    num_quick = (quick_last - quick_first) // quick_stride + 1
+
+    num_slow, remainder = divmod(num_traces, num_quick)
+    if remainder != 0:
+        return _UNKNOWN_CATALOG
+
+    if num_slow == 1:
+        slow_stride = 1
+    else:
+        slow_stride, remainder = divmod(slow_last - slow_first, num_slow - 1)
+        if slow_stride <= 0 or remainder != 0:
+            return _UNKNOWN_CATALOG
+
+    quick_range = range(quick_first, quick_first + num_quick * quick_stride, quick_stride)
+    slow_range = range(slow_first, slow_first + num_slow * slow_stride, slow_stride)
+
+    for trace_index, key in sampled_keys.items():
+        slow_index, quick_index = divmod(trace_index, num_quick)
+        expected_key = ((slow_range[slow_index], quick_range[quick_index])
+                        if j_quickest
+                        else (quick_range[quick_index], slow_range[slow_index]))
+        if key != expected_key:
+            return _UNKNOWN_CATALOG
+
+    v_range = range(0, num_traces)
+    if j_quickest:
+        return LastIndexVariesQuickestCatalog2D(slow_range, quick_range, v_range)
+    if num_slow == 1:
+        return LastIndexVariesQuickestCatalog2D(quick_range, slow_range, v_range)
+    return FirstIndexVariesQuickestCatalog2D(quick_range, slow_range, v_range)
+
+
+def scan_trace_headers(fh, pos, bps, trace_header_format, endian='>', progress=None,
+                       block_size=CATALOG_BLOCK_NUM_BYTES):
+    """Walk the chain of trace headers, decoding the fields of each.
+
+    The file is read in large blocks, and the field values of each trace
+    header lying within a block are decoded directly from the block, without
+    constructing header objects. The position of each subsequent header is
+    determined from the num_samples field of the previous header.
+
+    Args:
+        fh: A file-like-object open in binary mode.
+
+        pos: The file offset in bytes of the first trace header.
+
+        bps: The number of bytes per sample, such as obtained by a call
+            to bytes_per_sample()
+
+        trace_header_format: The class defining the fields to be decoded.
+            It must have a num_samples field.
+
+        endian: '>' for big-endian data (the standard and default), '<'
+            for little-endian (non-standard)
+
+        progress: An optional unary callable which will be passed the file
+            offset in bytes of the start of each block read.
+
+        block_size: The number of bytes to read from the file at a time.
+
+    Yields:
+        For each trace, a 2-tuple containing the file offset in bytes of the
+        trace header and a tuple of field values in the order given by
+        trace_header_format.ordered_field_names(). Scanning stops when fewer
+        than TRACE_HEADER_NUM_BYTES remain in the file.
+    """
+    progress_callback = progress if progress is not None else lambda p: None
+
+    cformat, field_name_allocations = compile_struct(trace_header_format,
+                                                     trace_header_format.START_OFFSET_IN_BYTES,
+                                                     TRACE_HEADER_NUM_BYTES,
+                                                     endian)
+    structure = Struct(cformat)
+    item_indexes = {name: item_index
+                    for item_index, names in enumerate(field_name_allocations)
+                    for name in names}
+    field_item_indexes = [item_indexes[name] for name in trace_header_format.ordered_field_names()]
+    if len(field_item_indexes) == 1:
+        # itemgetter() with a single item does not return a tuple
+        field_item_index = field_item_indexes[0]
+        field_getter = lambda items: (items[field_item_index],)
+    else:
+        field_getter = itemgetter(*field_item_indexes)
+    num_samples_item_index = item_indexes['num_samples']
+    unpack_from = structure.unpack_from
+
+    buffer = bytearray(max(block_size, TRACE_HEADER_NUM_BYTES))
+    view = memoryview(buffer)
+    num_bytes_to_read = len(buffer)
+
+    while True:
+        progress_callback(pos)
+        fh.seek(pos)
+        num_bytes_read = fh.readinto(view[:num_bytes_to_read])
+        if num_bytes_read < TRACE_HEADER_NUM_BYTES:
+            break
+        buffer_pos = pos
+        header_stop = TRACE_HEADER_NUM_BYTES
+        offset = 0
+        while 0 <= offset and header_stop <= num_bytes_read:
+            items = unpack_from(buffer, offset)
+            yield pos, field_getter(items)
+            trace_num_bytes = TRACE_HEADER_NUM_BYTES + items[num_samples_item_index] * bps
+            pos += trace_num_bytes
+            offset = pos - buffer_pos
+            header_stop = offset + TRACE_HEADER_NUM_BYTES
+        # Avoid reading whole blocks where only one header per block would be used
+        num_bytes_to_read = len(buffer) if trace_num_bytes <= len(buffer) else TRACE_HEADER_NUM_BYTES
+
+
 def read_trace_header(fh, trace_header_packer, pos=None):
     """Read a trace_samples header.
 
@@ -523,13 +931,43 @@ def read_binary_values(fh, pos=None, seg_y_type='int32', num_items=1, endian='>'
     fh.seek(pos, os.SEEK_SET)
     buf = fh.read(block_size)
 
+    return unpack_binary_values(buf, seg_y_type, num_items, endian)
+
+
+def unpack_binary_values(buf, seg_y_type='int32', num_items=1, endian='>'):
+    """Decode a series of values from a bytes-like object.
+
+    Args:
+        buf: A bytes-like object. If buf is a memoryview and the values
+            require no conversion, because they are single bytes or
+            already have the native endianness, the result is a memoryview
+            over the same memory and no data are copied.
+
+        seg_y_type: The SEG Y data type.
+
+        num_items: The number of items to be decoded.
+
+        endian: '>' for big-endian data (the standard and default), '<'
+            for little-endian (non-standard)
+
+    Returns:
+        A sequence containing num_items items.
+
+    Raises:
+        EOFError: If buf contains fewer bytes than required for num_items items.
+    """
+    ctype = SEG_Y_TYPE_TO_CTYPE[seg_y_type]
+    item_size = size_in_bytes(ctype)
+    block_size = item_size * num_items
+
     if len(buf) < block_size:
         raise EOFError("{} bytes requested but only {} available".format(
             block_size, len(buf)))
 
-    values = (unpack_ibm_floats(buf, num_items)
-              if ctype == 'ibm'
-              else unpack_values(buf, ctype, endian))
+    if ctype == 'ibm':
+        values = unpack_ibm_floats(buf, num_items)
+    else:
+        values = active_codec(seg_y_type).unpack(buf, num_items, endian)
     assert len(values) == num_items
     return values
 
@@ -550,10 +988,9 @@ def unpack_ibm_floats(data, num_items):
     Returns:
         A sequence of floats.
     """
-    if force_python_ibm_floats or not unpack_ibm_floats_cpp:
+    if force_python_ibm_floats:
         return unpack_ibm_floats_py(data, num_items)
-    else:
-        return unpack_ibm_floats_cpp(data, num_items)
+    return active_codec('ibm').unpack(data, num_items, '>')
 
 
 def unpack_values(buf, ctype, endian='>'):
@@ -571,12 +1008,35 @@ def unpack_values(buf, ctype, endian='>'):
     Returns:
         A sequence of objects with type corresponding to the format code.
     """
-    a = array(ctype, buf)
+    a = array(ctype)
+    a.frombytes(buf)
     if endian != NATIVE_ENDIANNESS:
         a.byteswap()
     return a
 
 
+def view_values(buf, ctype, endian='>'):
+    """Interpret a bytes-like object as a series of items, without copying if possible.
+
+    Args:
+        buf: A bytes-like object.
+
+        ctype: A format code (one of the values in the datatype.CTYPES
+            dictionary)
+
+        endian: '>' for big-endian data (the standard and default), '<'
+            for little-endian (non-standard)
+
+    Returns:
+        A memoryview over buf if the items are single bytes or have the
+        native endianness, otherwise a byte-swapped copy of the items as
+        returned by unpack_values().
+    """
+    if endian != NATIVE_ENDIANNESS and size_in_bytes(ctype) != 1:
+        return unpack_values(buf, ctype, endian)
+    return memoryview(buf).cast('B').cast(ctype)
+
+
 def format_standard_textual_header(revision, **kwargs):
     """Produce a standard SEG Y textual header.
 
@@ -872,7 +1332,9 @@ def write_trace_samples(fh, samples, seg_y_type, pos=None, endian='>'):
     Args:
         fh: A file-like-object open for writing in binary mode.
 
-        values: An iterable series of values.
+        values: An iterable series of values, an object supporting the buffer
+            protocol or a Numpy array. Buffers and Numpy arrays are packed
+            without creating a Python object for each value.
 
         seg_y_type: The SEG Y data type.
 
@@ -891,7 +1353,9 @@ def write_binary_values(fh, values, seg_y_type, pos=None, endian='>'):
     Args:
         fh: A file-like-object open for writing in binary mode.
 
-        values: An iterable series of values.
+        values: An iterable series of values, an object supporting the buffer
+            protocol or a Numpy array. Buffers and Numpy arrays are packed
+            without creating a Python object for each value.
 
         seg_y_type: The SEG Y data type.
 
@@ -908,7 +1372,7 @@ def write_binary_values(fh, values, seg_y_type, pos=None, endian='>'):
 
     buf = (pack_ibm_floats(values)
            if ctype == 'ibm'
-           else pack_values(values, ctype, endian))
+           else active_codec(seg_y_type).pack(values, endian))
 
     fh.write(buf)
 
@@ -927,23 +1391,131 @@ def pack_ibm_floats(values):
     Returns:
         A sequence of bytes.
     """
-    if force_python_ibm_floats or not pack_ibm_floats_cpp:
+    if force_python_ibm_floats:
         return pack_ibm_floats_py(values)
-    else:
-        return pack_ibm_floats_cpp(values)
+    return active_codec('ibm').pack(values, '>')
 
 
 def pack_values(values, ctype, endian='>'):
-    """Pack values into binary encoded big-endian byte strings.
+    """Pack values into binary encoded byte strings.
+
+    Numpy arrays (if Numpy is installed) and objects supporting the buffer
+    protocol with an item format matching ctype, such as array.array objects,
+    are converted to a typed array and byte-swapped if necessary, without
+    creating a Python object for each value.
 
     Args:
-        values: An iterable series of values.
+        values: An iterable series of values, an object supporting the buffer
+            protocol or a Numpy array.
 
-        fmt: A format code (one of the values in the datatype.CTYPES
-            dictionary)
+        ctype: A format code (one of the values in the datatype.CTYPES
+            dictionary) other than 'ibm'.
 
         endian: '>' for big-endian data (the standard and default), '<'
             for little-endian (non-standard)
+
+    Returns:
+        A bytes object.
     """
+    if is_numpy_array is not None and is_numpy_array(values):
+        return pack_values_numpy(values, ctype, endian)
+
+    view = _typed_view(values, ctype)
+    if view is not None:
+        if endian == NATIVE_ENDIANNESS:
+            return view.tobytes()
+        a = array(ctype)
+        a.frombytes(view.cast('B') if view.c_contiguous else view.tobytes())
+        a.byteswap()
+        return a.tobytes()
+
+    # For other series of values, struct is faster than conversion to a typed array
+    if not hasattr(values, '__len__'):
+        values = list(values)
     c_format = '{}{}{}'.format(endian, len(values), ctype)
     return struct.pack(c_format, *values)
+
+
+def _typed_view(values, ctype):
+    """A memoryview of values if they support the buffer protocol with native items of type ctype, otherwise None."""
+    try:
+        view = memoryview(values)
+    except TypeError:
+        return None
+    return view if view.format.lstrip('@') == ctype else None
+
+
+# Sample codecs. These refer to the implementations through module attributes
+# when called, so that the implementations can be replaced.
+
+def _unpack_ibm_floats_cpp_codec(data, num_items, endian):
+    return unpack_ibm_floats_cpp(data, num_items)
+
+
+def _pack_ibm_floats_cpp_codec(values, endian):
+    return pack_ibm_floats_cpp(values)
+
+
+def _unpack_ibm_floats_numpy_codec(data, num_items, endian):
+    return unpack_ibm_floats_numpy(data, num_items)
+
+
+def _pack_ibm_floats_numpy_codec(values, endian):
+    return pack_ibm_floats_numpy(values)
+
+
+def _unpack_ibm_floats_py_codec(data, num_items, endian):
+    return unpack_ibm_floats_py(data, num_items)
+
+
+def _pack_ibm_floats_py_codec(values, endian):
+    return pack_ibm_floats_py(values)
+
+
+class _ArrayCodec:
+    """Encoding and decoding of the samples of a fixed-size type using the array and struct modules."""
+
+    def __init__(self, ctype):
+        self._ctype = ctype
+        self._item_size = size_in_bytes(ctype)
+
+    def unpack(self, buf, num_items, endian):
+        if isinstance(buf, memoryview):
+            return view_values(buf[:self._item_size * num_items], self._ctype, endian)
+        return unpack_values(buf, self._ctype, endian)
+
+    def pack(self, values, endian):
+        return pack_values(values, self._ctype, endian)
+
+
+class _NumpyArrayCodec:
+    """Encoding and decoding of the samples of a fixed-size type using Numpy."""
+
+    def __init__(self, ctype):
+        self._ctype = ctype
+
+    def unpack(self, buf, num_items, endian):
+        return unpack_values_numpy(buf, num_items, self._ctype, endian)
+
+    def pack(self, values, endian):
+        return pack_values_numpy(values, self._ctype, endian)
+
+
+def _register_builtin_codecs():
+    if unpack_ibm_floats_cpp is not None and pack_ibm_floats_cpp is not None:
+        register_codec('ibm', 'cpp', _unpack_ibm_floats_cpp_codec, _pack_ibm_floats_cpp_codec, priority=20)
+    if unpack_ibm_floats_numpy is not None and pack_ibm_floats_numpy is not None:
+        register_codec('ibm', 'numpy', _unpack_ibm_floats_numpy_codec, _pack_ibm_floats_numpy_codec, priority=10)
+    register_codec('ibm', 'python', _unpack_ibm_floats_py_codec, _pack_ibm_floats_py_codec)
+
+    for seg_y_type, ctype in SEG_Y_TYPE_TO_CTYPE.items():
+        if ctype != 'ibm':
+            array_codec = _ArrayCodec(ctype)
+            register_codec(seg_y_type, 'python', array_codec.unpack, array_codec.pack)
+            if unpack_values_numpy is not None and pack_values_numpy is not None:
+                # The array codecs can decode samples without copying them, so are preferred unless benchmarked
+                numpy_codec = _NumpyArrayCodec(ctype)
+                register_codec(seg_y_type, 'numpy', numpy_codec.unpack, numpy_codec.pack, priority=-10)
+
+
+_register_builtin_codecs()
@@ -0,0 +1,164 @@
+"""A cache of decoded trace samples, bounded by the memory it occupies.
+
+Decoding trace samples, particularly IBM floating point samples, can take
+much longer than reading them, so applications which repeatedly read the same
+traces, such as interactive viewers, can benefit from keeping the decoded
+samples in memory. A TraceCache can be attached to a SegYReader to do this.
+The cache is bounded by the number of bytes occupied by the samples it holds,
+rather than by the number of entries, so that the memory used is the same
+whatever the length of the traces. When the limit is reached the least
+recently used entries are evicted.
+"""
+
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+
+# The approximate size of a Python float within a list
+_PYTHON_FLOAT_NUM_BYTES = sys.getsizeof(0.0) + 8
+
+TraceCacheStatistics = namedtuple('TraceCacheStatistics',
+                                  ['hits', 'misses', 'evictions', 'num_entries', 'num_bytes', 'max_num_bytes'])
+
+
+class TraceCache:
+    """A least-recently-used cache of decoded trace samples with a limit on its size in bytes.
+
+    The cached sequences of samples are shared by all callers which obtain them
+    from the cache, so they should not be modified. A TraceCache may be used
+    from several threads at once.
+    """
+
+    def __init__(self, max_num_bytes):
+        """Initialize a TraceCache.
+
+        Args:
+            max_num_bytes: The limit on the total size in bytes of the samples
+                held in the cache.
+
+        Raises:
+            ValueError: If max_num_bytes is negative.
+        """
+        if max_num_bytes < 0:
+            raise ValueError("max_num_bytes {} is negative".format(max_num_bytes))
+        self._max_num_bytes = max_num_bytes
+        self._entries = OrderedDict()
+        self._num_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_num_bytes(self):
+        """The limit on the total size in bytes of the samples held in the cache."""
+        return self._max_num_bytes
+
+    @property
+    def num_bytes(self):
+        """The total size in bytes of the samples held in the cache."""
+        return self._num_bytes
+
+    @property
+    def hits(self):
+        """The number of lookups which found samples in the cache."""
+        return self._hits
+
+    @property
+    def misses(self):
+        """The number of lookups which did not find samples in the cache."""
+        return self._misses
+
+    @property
+    def evictions(self):
+        """The number of entries evicted to keep the cache within its size limit."""
+        return self._evictions
+
+    def statistics(self):
+        """A consistent snapshot of the counters and size of the cache.
+
+        Returns:
+            A TraceCacheStatistics named tuple.
+        """
+        with self._lock:
+            return TraceCacheStatistics(self._hits, self._misses, self._evictions, len(self._entries),
+                                        self._num_bytes, self._max_num_bytes)
+
+    def get(self, key):
+        """Look up samples, marking them as the most recently used.
+
+        Args:
+            key: The key identifying the samples.
+
+        Returns:
+            The cached sequence of samples, or None if there is no entry for key.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key, samples):
+        """Add samples to the cache, evicting least recently used entries as necessary.
+
+        Samples larger than the size limit of the cache are not added.
+
+        Args:
+            key: The key identifying the samples.
+
+            samples: A sequence of samples.
+        """
+        num_bytes = samples_num_bytes(samples)
+        if num_bytes > self._max_num_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._num_bytes -= previous[1]
+            self._entries[key] = (samples, num_bytes)
+            self._num_bytes += num_bytes
+            while self._num_bytes > self._max_num_bytes:
+                _, (_, evicted_num_bytes) = self._entries.popitem(last=False)
+                self._num_bytes -= evicted_num_bytes
+                self._evictions += 1
+
+    def clear(self):
+        """Remove all entries from the cache. The counters are not reset."""
+        with self._lock:
+            self._entries.clear()
+            self._num_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __reduce__(self):
+        # The cached samples may be views of memory which cannot be pickled, so caches are unpickled empty
+        return self.__class__, (self._max_num_bytes,)
+
+    def __repr__(self):
+        return "{}(max_num_bytes={})".format(self.__class__.__name__, self._max_num_bytes)
+
+
+def samples_num_bytes(samples):
+    """The approximate number of bytes of memory occupied by a sequence of samples.
+
+    Args:
+        samples: A memoryview, array, LazyIBMSamples or other sequence of numbers.
+
+    Returns:
+        The number of bytes.
+    """
+    num_bytes = getattr(samples, 'nbytes', None)
+    if num_bytes is not None:
+        return num_bytes
+    item_size = getattr(samples, 'itemsize', None)
+    if item_size is not None:
+        return len(samples) * item_size
+    return sys.getsizeof(samples) + len(samples) * _PYTHON_FLOAT_NUM_BYTES
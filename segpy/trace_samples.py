@@ -0,0 +1,165 @@
+"""Sequences of trace samples which are decoded when accessed.
+
+Decoding IBM floats is much slower than reading them, yet many programs use
+only a few of the samples of each trace they read, for example when
+extracting a timeslice or picking a horizon. The samples of IBM float traces
+are therefore returned as a LazyIBMSamples sequence, which retains the
+encoded bytes and decodes only the samples which are indexed. Iterating over
+the sequence, or converting it to a Numpy array, decodes all of the samples at
+once, and the decoded values are retained for subsequent use.
+
+The samples are decoded to double-precision floats, and slices are returned as
+array.array('d') objects, whichever IBM float codec is in use.
+"""
+
+from array import array
+from collections.abc import Sequence
+
+from segpy.datatypes import SEG_Y_TYPE_TO_CTYPE
+from segpy.ibm_float import ibm2ieee
+from segpy.toolkit import unpack_binary_values, unpack_ibm_floats
+
+IBM_FLOAT_NUM_BYTES = 4
+
+# The number of bytes occupied by each sample once decoded into a double-precision float
+_DECODED_SAMPLE_NUM_BYTES = 8
+
+
+class LazyIBMSamples(Sequence):
+    """A sequence of big-endian IBM float samples, decoded when accessed.
+
+    Indexing with an integer decodes only that sample as a float, and indexing
+    with a slice decodes only the samples in the slice as an array.array('d').
+    Iterating, or conversion to a Numpy array, decodes all the samples at once.
+    LazyIBMSamples compare equal to any sequence of equal numbers.
+    """
+
+    __slots__ = ['_data', '_num_items', '_values']
+
+    def __init__(self, data, num_items):
+        """Initialise a LazyIBMSamples.
+
+        Args:
+            data: A bytes-like object containing at least num_items big-endian
+                IBM floats. The bytes are copied, so data may be a view of
+                memory which is subsequently released.
+
+            num_items: The number of samples.
+
+        Raises:
+            EOFError: If data contains fewer bytes than required for num_items samples.
+        """
+        num_bytes = num_items * IBM_FLOAT_NUM_BYTES
+        if len(data) < num_bytes:
+            raise EOFError("{} bytes requested but only {} available".format(num_bytes, len(data)))
+        self._data = bytes(data[:num_bytes])
+        self._num_items = num_items
+        self._values = None
+
+    def __len__(self):
+        return self._num_items
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._decode_slice(index)
+        if self._values is not None:
+            return self._values[index]
+        i = index.__index__()
+        if i < 0:
+            i += self._num_items
+        if not (0 <= i < self._num_items):
+            raise IndexError("{} index out of range".format(self.__class__.__name__))
+        pos = i * IBM_FLOAT_NUM_BYTES
+        return ibm2ieee(self._data[pos:pos + IBM_FLOAT_NUM_BYTES])
+
+    def __iter__(self):
+        return iter(self._decoded())
+
+    def __reversed__(self):
+        return reversed(self._decoded())
+
+    def __eq__(self, rhs):
+        if not isinstance(rhs, Sequence):
+            return NotImplemented
+        return len(self) == len(rhs) and all(a == b for a, b in zip(self._decoded(), rhs))
+
+    __hash__ = None
+
+    def __array__(self, dtype=None, copy=None):
+        import numpy
+        return numpy.array(self._decoded(), dtype=dtype if dtype is not None else numpy.float64)
+
+    def __repr__(self):
+        return "{}({!r}, {})".format(self.__class__.__name__, self._data, self._num_items)
+
+    @property
+    def nbytes(self):
+        """The number of bytes of memory occupied by the samples once they are all decoded."""
+        return self._num_items * (IBM_FLOAT_NUM_BYTES + _DECODED_SAMPLE_NUM_BYTES)
+
+    def tolist(self):
+        """All of the samples as a list of floats."""
+        return self._decoded().tolist()
+
+    def decode(self):
+        """Decode all the samples now, rather than when they are next accessed.
+
+        Returns:
+            This LazyIBMSamples.
+        """
+        self._decoded()
+        return self
+
+    def _decoded(self):
+        if self._values is None:
+            self._values = _unpack_ibm_floats_array(self._data, self._num_items)
+        return self._values
+
+    def _decode_slice(self, index):
+        if self._values is not None:
+            return self._values[index]
+        start, stop, step = index.indices(self._num_items)
+        if step == 1:
+            num_items = max(stop - start, 0)
+            data = self._data[start * IBM_FLOAT_NUM_BYTES:stop * IBM_FLOAT_NUM_BYTES]
+        else:
+            positions = range(start * IBM_FLOAT_NUM_BYTES, stop * IBM_FLOAT_NUM_BYTES, step * IBM_FLOAT_NUM_BYTES)
+            num_items = len(positions)
+            data = b''.join(self._data[pos:pos + IBM_FLOAT_NUM_BYTES] for pos in positions)
+        return _unpack_ibm_floats_array(data, num_items)
+
+
+def _unpack_ibm_floats_array(data, num_items):
+    """Unpack IBM floats into an array.array('d'), whatever the type of sequence returned by the active codec."""
+    values = unpack_ibm_floats(data, num_items)
+    if isinstance(values, array) and values.typecode == 'd':
+        return values
+    return array('d', values)
+
+
+def unpack_trace_samples(buf, seg_y_type, num_items, endian='>'):
+    """Decode the samples of a trace from a bytes-like object.
+
+    IBM float samples are returned as a LazyIBMSamples sequence, so they are
+    decoded only when accessed. Samples of other types are decoded immediately,
+    as by unpack_binary_values().
+
+    Args:
+        buf: A bytes-like object.
+
+        seg_y_type: The SEG Y data type.
+
+        num_items: The number of samples to be decoded.
+
+        endian: '>' for big-endian data (the standard and default), '<'
+            for little-endian (non-standard)
+
+    Returns:
+        A sequence containing num_items samples.
+
+    Raises:
+        EOFError: If buf contains fewer bytes than required for num_items samples.
+    """
+    if SEG_Y_TYPE_TO_CTYPE[seg_y_type] == 'ibm':
+        return LazyIBMSamples(buf, num_items)
+    return unpack_binary_values(buf, seg_y_type, num_items, endian)
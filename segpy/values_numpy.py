@@ -0,0 +1,88 @@
+"""Packing and unpacking of binary encoded values using Numpy.
+
+Numpy arrays are converted to the required type and byte order by Numpy, so
+that no Python object is created for each value. Values which cannot be
+represented in the required type are rejected, as they are by the struct
+module, rather than being silently wrapped or converted to infinity.
+
+This module requires Numpy, and importing it will raise ImportError if Numpy is
+not installed.
+"""
+
+from array import array
+
+import numpy
+
+
+def is_numpy_array(values):
+    """Determine whether values is a Numpy array."""
+    return isinstance(values, numpy.ndarray)
+
+
+def pack_values_numpy(values, ctype, endian='>'):
+    """Pack a Numpy array, or a sequence of numbers, into binary encoded values.
+
+    Args:
+        values: A Numpy array of integers or floats, or a sequence of numbers
+            which is converted to one. Multidimensional arrays are packed in
+            C (row-major) order.
+
+        ctype: A format code (one of the values in the datatype.CTYPES
+            dictionary) other than 'ibm'.
+
+        endian: '>' for big-endian data (the standard and default), '<'
+            for little-endian (non-standard)
+
+    Returns:
+        A bytes object.
+
+    Raises:
+        TypeError: If values cannot be converted to ctype without loss of precision.
+        OverflowError: If a value is outside the range representable by ctype.
+    """
+    dtype = numpy.dtype(endian + ctype)
+    if not is_numpy_array(values):
+        values = numpy.asarray(values if hasattr(values, '__len__') else list(values))
+        if values.size == 0:
+            return b''
+    if dtype.kind in 'iu':
+        if values.dtype.kind not in 'biu':
+            raise TypeError("Values of type {} cannot be packed as integers with format {!r}"
+                            .format(values.dtype, ctype))
+        if values.size != 0:
+            limits = numpy.iinfo(dtype)
+            if values.min() < limits.min or values.max() > limits.max:
+                raise OverflowError("Values are outside the range {} to {} of format {!r}"
+                                    .format(limits.min, limits.max, ctype))
+        return values.astype(dtype).tobytes()
+
+    if values.dtype.kind not in 'biuf':
+        raise TypeError("Values of type {} cannot be packed as floats with format {!r}".format(values.dtype, ctype))
+    with numpy.errstate(over='ignore'):
+        packed = values.astype(dtype)
+    if (numpy.isinf(packed) & numpy.isfinite(values)).any():
+        raise OverflowError("Values are too large to pack with format {!r}".format(ctype))
+    return packed.tobytes()
+
+
+def unpack_values_numpy(data, num_items, ctype, endian='>'):
+    """Unpack binary encoded values.
+
+    Args:
+        data: A bytes-like object.
+
+        num_items: The number of values to be read.
+
+        ctype: A format code (one of the values in the datatype.CTYPES
+            dictionary) other than 'ibm'.
+
+        endian: '>' for big-endian data (the standard and default), '<'
+            for little-endian (non-standard)
+
+    Returns:
+        An array.array with typecode ctype.
+    """
+    values = numpy.frombuffer(data, dtype=endian + ctype, count=num_items)
+    result = array(ctype)
+    result.frombytes(values.astype(values.dtype.newbyteorder('=')).tobytes())
+    return result
@@ -1,3 +1,4 @@
+from segpy.datatypes import SEG_Y_TYPE_TO_CTYPE, size_in_bytes
 from segpy.encoding import ASCII, is_supported_encoding, UnsupportedEncodingError
 from segpy.packer import make_header_packer
 from segpy.trace_header import TraceHeaderRev1
@@ -30,6 +31,10 @@ def write_segy(fh,
             provided, this callback will be invoked at least once with
             an argument equal to one.
 
+    If the dataset provides the encoded samples of each trace through
+    trace_samples_raw(), and they are encoded as required for the file being
+    written, they are copied without being decoded and encoded again.
+
     Raises:
         UnsupportedEncodingError: If the specified encoding is neither ASCII nor EBCDIC
         UnicodeError: If textual data provided cannot be encoded into the required encoding.
@@ -52,10 +57,34 @@ def write_segy(fh,
     trace_header_packer = make_header_packer(trace_header_format, endian)
 
     num_traces = dataset.num_traces()
+    seg_y_type = dataset.data_sample_format
+    # Datasets need not be derived from Dataset, so may not provide encoded samples
+    trace_samples_raw = getattr(dataset, 'trace_samples_raw', None)
 
     for trace_index in dataset.trace_indexes():
         write_trace_header(fh, dataset.trace_header(trace_index), trace_header_packer)
-        write_trace_samples(fh, dataset.trace_samples(trace_index), dataset.data_sample_format, endian=endian)
+        raw_samples = trace_samples_raw(trace_index) if trace_samples_raw is not None else None
+        if _is_encoded_as(raw_samples, seg_y_type, endian):
+            fh.write(raw_samples.data)
+        else:
+            write_trace_samples(fh, dataset.trace_samples(trace_index), seg_y_type, endian=endian)
         progress_callback(trace_index / num_traces)
 
     progress_callback(1)
+
+
+def _is_encoded_as(raw_samples, seg_y_type, endian):
+    """Determine whether raw samples are encoded as seg_y_type samples with the given endianness.
+
+    Args:
+        raw_samples: A RawTraceSamples, or None.
+
+        seg_y_type: The SEG Y data type.
+
+        endian: '>' for big-endian, '<' for little-endian.
+    """
+    if raw_samples is None or raw_samples.seg_y_type != seg_y_type:
+        return False
+    # IBM floats are always written big-endian, and single bytes have no endianness
+    ctype = SEG_Y_TYPE_TO_CTYPE[seg_y_type]
+    return raw_samples.endian == endian or ctype == 'ibm' or size_in_bytes(ctype) == 1
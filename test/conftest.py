@@ -1,6 +1,11 @@
+import sys
+
 import pytest
 import test.util
 
+# The async and await syntax used by segpy.async_reader requires Python 3.5
+collect_ignore = ['test_async_reader.py'] if sys.version_info < (3, 5) else []
+
 
 @pytest.fixture(params=[True, False])
 def ibm_floating_point_impls(request):
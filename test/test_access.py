@@ -0,0 +1,93 @@
+import io
+import os
+
+from hypothesis import given
+import hypothesis.strategies as ST
+import pytest
+
+import segpy.access
+from segpy.access import make_access, plan_reads, PlannedRead, POSITIONAL_ACCESS
+
+
+extents_strategy = ST.lists(ST.tuples(ST.integers(0, 10000), ST.integers(0, 500)))
+
+
+class TestPlanReads:
+
+    def test_empty(self):
+        assert plan_reads([]) == []
+
+    def test_nearby_extents_are_coalesced(self):
+        reads = plan_reads([(1000, 10), (0, 10), (20, 10)], max_gap=10)
+        assert reads == [PlannedRead(0, 30, [1, 2]), PlannedRead(1000, 10, [0])]
+
+    def test_distant_extents_are_not_coalesced(self):
+        reads = plan_reads([(0, 10), (21, 10)], max_gap=10)
+        assert reads == [PlannedRead(0, 10, [0]), PlannedRead(21, 10, [1])]
+
+    def test_reads_are_limited_in_size(self):
+        reads = plan_reads([(0, 10), (10, 10), (20, 10)], max_read_num_bytes=20)
+        assert reads == [PlannedRead(0, 20, [0, 1]), PlannedRead(20, 10, [2])]
+
+    def test_long_extent_is_read_whole(self):
+        assert plan_reads([(0, 100)], max_read_num_bytes=20) == [PlannedRead(0, 100, [0])]
+
+    @pytest.mark.parametrize('kwargs', [{'max_gap': -1}, {'max_read_num_bytes': -1}])
+    def test_negative_limits_raise_value_error(self, kwargs):
+        with pytest.raises(ValueError):
+            plan_reads([(0, 10)], **kwargs)
+
+    @given(extents_strategy, ST.integers(0, 1000), ST.integers(0, 5000))
+    def test_every_extent_is_read_once(self, extents, max_gap, max_read_num_bytes):
+        reads = plan_reads(extents, max_gap, max_read_num_bytes)
+        assert sorted(i for read in reads for i in read.extent_indexes) == list(range(len(extents)))
+        for read in reads:
+            for i in read.extent_indexes:
+                pos, num_bytes = extents[i]
+                assert read.pos <= pos
+                assert pos + num_bytes <= read.pos + read.num_bytes
+            assert len(read.extent_indexes) == 1 or read.num_bytes <= max_read_num_bytes
+
+    @given(extents_strategy, ST.integers(0, 1000))
+    def test_reads_are_ordered_and_separated_by_more_than_max_gap(self, extents, max_gap):
+        reads = plan_reads(extents, max_gap)
+        for previous, read in zip(reads, reads[1:]):
+            assert read.pos - (previous.pos + previous.num_bytes) > max_gap
+
+
+class TestPositionalAccess:
+
+    @pytest.fixture
+    def data_file(self, tmpdir):
+        data = bytes(range(256)) * 4
+        path = tmpdir / 'data.bin'
+        path.write_binary(data)
+        with open(str(path), 'rb') as fh:
+            yield fh, data
+
+    @pytest.mark.parametrize('pos, num_bytes', [(0, 10), (100, 500), (1000, 100), (2000, 10), (5, 0)])
+    def test_read_matches_data(self, data_file, pos, num_bytes):
+        fh, data = data_file
+        access = make_access(fh, POSITIONAL_ACCESS)
+        assert access.mode == POSITIONAL_ACCESS
+        assert access.read(pos, num_bytes) == data[pos:pos + num_bytes]
+
+    def test_read_does_not_move_file_position(self, data_file):
+        fh, data = data_file
+        fh.seek(17)
+        make_access(fh, POSITIONAL_ACCESS).read(500, 10)
+        assert fh.tell() == 17
+
+    def test_read_without_pread_matches_data(self, data_file, monkeypatch):
+        fh, data = data_file
+        monkeypatch.setattr(segpy.access, '_pread', None)
+        assert make_access(fh, POSITIONAL_ACCESS).read(100, 50) == data[100:150]
+
+    def test_short_reads_are_continued(self, data_file, monkeypatch):
+        fh, data = data_file
+        monkeypatch.setattr(segpy.access, '_pread', lambda fd, n, pos: os.pread(fd, min(n, 7), pos))
+        assert make_access(fh, POSITIONAL_ACCESS).read(100, 50) == data[100:150]
+
+    def test_type_error_without_file_descriptor(self):
+        with pytest.raises(TypeError):
+            make_access(io.BytesIO(b'data'), POSITIONAL_ACCESS)
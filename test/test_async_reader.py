@@ -0,0 +1,158 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from segpy.access import MEMORY_MAP_ACCESS, POSITIONAL_ACCESS, STREAM_ACCESS
+from segpy.async_reader import AsyncSegYReader, create_async_reader
+from segpy.header import are_equal
+from segpy.reader import create_reader
+from test.util import write_synthetic_segy
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+@pytest.fixture
+def segy_file(tmpdir):
+    segy_path = str(tmpdir / 'test.segy')
+    dataset = write_synthetic_segy(segy_path, num_inlines=4, num_xlines=5, num_samples=20)
+    with open(segy_path, 'rb') as fh:
+        yield fh, dataset
+
+
+class TestAsyncSegYReader:
+
+    @pytest.mark.parametrize('access_mode', [POSITIONAL_ACCESS, MEMORY_MAP_ACCESS])
+    def test_trace_samples_and_headers(self, segy_file, access_mode):
+        fh, dataset = segy_file
+
+        async def read():
+            async with await create_async_reader(fh, cache_directory=None, access_mode=access_mode) as reader:
+                samples = await asyncio.gather(*(reader.trace_samples(i) for i in range(20)))
+                header = await reader.trace_header(7)
+                partial_samples = await reader.trace_samples(3, 2, 5)
+                return samples, header, partial_samples
+
+        samples, header, partial_samples = run(read())
+        assert [list(s) for s in samples] == [dataset.trace_samples(i) for i in range(20)]
+        assert are_equal(header, dataset.trace_header(7))
+        assert list(partial_samples) == dataset.trace_samples(3)[2:5]
+
+    def test_many_traces(self, segy_file):
+        fh, dataset = segy_file
+        reader = AsyncSegYReader(create_reader(fh, cache_directory=None, access_mode=POSITIONAL_ACCESS))
+
+        trace_indexes = [19, 0, 4, 9]
+        samples = run(reader.trace_samples_many(iter(trace_indexes)))
+        headers = run(reader.trace_headers_many(trace_indexes))
+        reader.close()
+        assert [list(s) for s in samples] == [dataset.trace_samples(i) for i in trace_indexes]
+        assert all(are_equal(h, dataset.trace_header(i)) for h, i in zip(headers, trace_indexes))
+
+    @pytest.mark.parametrize('trace_indexes', [None, [5, 1, 1, 17], []])
+    def test_traces_iterates_in_order(self, segy_file, trace_indexes):
+        fh, dataset = segy_file
+
+        async def read():
+            async with await create_async_reader(fh, max_concurrency=3, cache_directory=None) as reader:
+                traces = []
+                async for trace_index, samples in reader.traces(trace_indexes, 1, 3):
+                    traces.append((trace_index, list(samples)))
+                return traces
+
+        expected_indexes = range(20) if trace_indexes is None else trace_indexes
+        assert run(read()) == [(i, dataset.trace_samples(i)[1:3]) for i in expected_indexes]
+
+    def test_concurrency_is_limited(self, segy_file):
+        fh, dataset = segy_file
+        reader = create_reader(fh, cache_directory=None, access_mode=POSITIONAL_ACCESS)
+        lock = threading.Lock()
+        num_in_progress = 0
+        max_num_in_progress = 0
+        trace_samples = reader.trace_samples
+
+        def slow_trace_samples(*args):
+            nonlocal num_in_progress, max_num_in_progress
+            with lock:
+                num_in_progress += 1
+                max_num_in_progress = max(max_num_in_progress, num_in_progress)
+            time.sleep(0.01)
+            with lock:
+                num_in_progress -= 1
+            return trace_samples(*args)
+
+        reader.trace_samples = slow_trace_samples
+
+        async def read():
+            async with AsyncSegYReader(reader, max_concurrency=3) as async_reader:
+                return await asyncio.gather(*(async_reader.trace_samples(i) for i in range(20)))
+
+        assert len(run(read())) == 20
+        assert 1 < max_num_in_progress <= 3
+
+    def test_event_loop_is_not_blocked(self, segy_file):
+        fh, dataset = segy_file
+        reader = create_reader(fh, cache_directory=None, access_mode=POSITIONAL_ACCESS)
+        release = threading.Event()
+        trace_samples = reader.trace_samples
+
+        def blocking_trace_samples(*args):
+            assert release.wait(10)
+            return trace_samples(*args)
+
+        reader.trace_samples = blocking_trace_samples
+
+        async def read():
+            async with AsyncSegYReader(reader) as async_reader:
+                samples = asyncio.ensure_future(async_reader.trace_samples(0))
+                await asyncio.sleep(0.01)
+                assert not samples.done()
+                release.set()
+                return await samples
+
+        assert list(run(read())) == dataset.trace_samples(0)
+
+    def test_event_loop_is_not_blocked_on_exit(self, segy_file):
+        fh, dataset = segy_file
+        reader = create_reader(fh, cache_directory=None, access_mode=POSITIONAL_ACCESS)
+        release = threading.Event()
+        trace_samples = reader.trace_samples
+
+        def blocking_trace_samples(*args):
+            assert release.wait(2)
+            return trace_samples(*args)
+
+        reader.trace_samples = blocking_trace_samples
+
+        async def release_soon():
+            await asyncio.sleep(0.01)
+            release.set()
+
+        async def read():
+            async with AsyncSegYReader(reader) as async_reader:
+                samples = asyncio.ensure_future(async_reader.trace_samples(0))
+                await asyncio.sleep(0.01)
+                # Runs only if the event loop is not blocked while the reader is closed
+                asyncio.ensure_future(release_soon())
+            return await samples
+
+        assert list(run(read())) == dataset.trace_samples(0)
+
+    def test_stream_access_is_rejected(self, segy_file):
+        fh, dataset = segy_file
+        with pytest.raises(ValueError):
+            AsyncSegYReader(create_reader(fh, cache_directory=None, access_mode=STREAM_ACCESS))
+        with pytest.raises(ValueError):
+            run(create_async_reader(fh, cache_directory=None, access_mode=STREAM_ACCESS))
+
+    def test_max_concurrency_must_be_positive(self, segy_file):
+        fh, dataset = segy_file
+        with pytest.raises(ValueError):
+            AsyncSegYReader(create_reader(fh, cache_directory=None, access_mode=POSITIONAL_ACCESS), max_concurrency=0)
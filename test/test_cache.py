@@ -0,0 +1,238 @@
+import os
+import threading
+import time
+
+import pytest
+
+import segpy.cache
+import segpy.reader
+import segpy.util
+from segpy.cache import CacheManager, configure_cache, configured_cache
+from segpy.reader import create_reader, warm_cache
+from test.util import write_synthetic_segy
+
+
+def write_bytes(data):
+    return lambda fh: fh.write(data)
+
+
+def set_last_used(cache, key, timestamp):
+    os.utime(str(cache.entry_path(key)), (timestamp, timestamp))
+
+
+@pytest.fixture
+def unconfigured_cache():
+    original = segpy.cache._configured_cache
+    configure_cache(None)
+    yield
+    segpy.cache._configured_cache = original
+
+
+class TestCacheManager:
+
+    def test_negative_max_num_bytes_raises_value_error(self, tmpdir):
+        with pytest.raises(ValueError):
+            CacheManager(str(tmpdir), max_num_bytes=-1)
+
+    def test_lookup_missing_entry_returns_none(self, tmpdir):
+        cache = CacheManager(str(tmpdir / 'cache'))
+        assert cache.lookup('abc') is None
+
+    def test_written_entry_can_be_looked_up(self, tmpdir):
+        cache = CacheManager(str(tmpdir / 'cache'))
+        cache.write('abc', write_bytes(b'12345'))
+        path = cache.lookup('abc')
+        assert path.read_bytes() == b'12345'
+
+    def test_failed_write_leaves_no_entry(self, tmpdir):
+        cache = CacheManager(str(tmpdir / 'cache'))
+
+        def fail(fh):
+            fh.write(b'partial')
+            raise TypeError("Cannot write entry")
+
+        with pytest.raises(TypeError):
+            cache.write('abc', fail)
+        assert cache.lookup('abc') is None
+        assert os.listdir(str(tmpdir / 'cache')) == []
+
+    def test_entries_are_ordered_least_recently_used_first(self, tmpdir):
+        cache = CacheManager(str(tmpdir / 'cache'))
+        for timestamp, key in enumerate(['c', 'a', 'b']):
+            cache.write(key, write_bytes(b'x'))
+            set_last_used(cache, key, 1000 + timestamp)
+        assert [entry.key for entry in cache.entries()] == ['c', 'a', 'b']
+        cache.lookup('c')
+        assert [entry.key for entry in cache.entries()] == ['a', 'b', 'c']
+
+    def test_writing_beyond_budget_evicts_least_recently_used(self, tmpdir):
+        cache = CacheManager(str(tmpdir / 'cache'), max_num_bytes=25)
+        for timestamp, key in enumerate(['a', 'b', 'c']):
+            cache.write(key, write_bytes(b'x' * 10))
+            set_last_used(cache, key, 1000 + timestamp)
+        assert [entry.key for entry in cache.entries()] == ['b', 'c']
+        assert cache.total_num_bytes() == 20
+
+    def test_entries_do_not_require_scandir(self, tmpdir, monkeypatch):
+        # os.scandir() is not available before Python 3.5
+        monkeypatch.delattr(os, 'scandir')
+        cache = CacheManager(str(tmpdir / 'cache'), max_num_bytes=15)
+        cache.write('a', write_bytes(b'x' * 10))
+        set_last_used(cache, 'a', 1000)
+        cache.write('b', write_bytes(b'x' * 10))
+        assert [entry.key for entry in cache.entries()] == ['b']
+        assert cache.total_num_bytes() == 10
+
+    def test_entry_larger_than_budget_is_kept(self, tmpdir):
+        cache = CacheManager(str(tmpdir / 'cache'), max_num_bytes=5)
+        cache.write('a', write_bytes(b'x' * 10))
+        assert cache.lookup('a') is not None
+
+    def test_prune_by_age(self, tmpdir):
+        cache = CacheManager(str(tmpdir / 'cache'))
+        cache.write('old', write_bytes(b'x'))
+        set_last_used(cache, 'old', 1000)
+        cache.write('new', write_bytes(b'x'))
+        evicted = cache.prune(max_age=3600)
+        assert [entry.key for entry in evicted] == ['old']
+        assert [entry.key for entry in cache.entries()] == ['new']
+
+    def test_clear(self, tmpdir):
+        cache = CacheManager(str(tmpdir / 'cache'))
+        cache.write('a', write_bytes(b'x'))
+        cache.write('b', write_bytes(b'x'))
+        assert len(cache.clear()) == 2
+        assert cache.entries() == []
+
+    def test_remove(self, tmpdir):
+        cache = CacheManager(str(tmpdir / 'cache'))
+        cache.write('a', write_bytes(b'x'))
+        assert cache.remove('a')
+        assert not cache.remove('a')
+
+
+class TestConfiguredCache:
+
+    def test_environment_configures_cache(self, tmpdir, monkeypatch, unconfigured_cache):
+        segpy.cache._configured_cache = segpy.util.UNSET
+        monkeypatch.setenv(segpy.cache.CACHE_DIRECTORY_ENV_VAR, str(tmpdir))
+        monkeypatch.setenv(segpy.cache.CACHE_MAX_NUM_BYTES_ENV_VAR, '1000')
+        cache = configured_cache()
+        assert str(cache.directory) == str(tmpdir)
+        assert cache.max_num_bytes == 1000
+
+    def test_readers_use_configured_cache(self, tmpdir, unconfigured_cache):
+        segy_path = str(tmpdir / 'data' / 'test.segy')
+        os.makedirs(str(tmpdir / 'data'))
+        write_synthetic_segy(segy_path)
+        cache = configure_cache(str(tmpdir / 'central'))
+        with open(segy_path, 'rb') as fh:
+            create_reader(fh)
+        assert len(cache.entries()) == 1
+        assert os.listdir(str(tmpdir / 'data')) == ['test.segy']
+
+    def test_warm_cache(self, tmpdir, unconfigured_cache):
+        segy_paths = [str(tmpdir / 'test{}.segy'.format(i)) for i in range(3)]
+        for i, segy_path in enumerate(segy_paths):
+            write_synthetic_segy(segy_path, num_inlines=i + 1)
+        cache = CacheManager(str(tmpdir / 'central'))
+        failed = warm_cache(segy_paths + [str(tmpdir / 'missing.segy')], cache_directory=cache)
+        assert failed == [str(tmpdir / 'missing.segy')]
+        assert len(cache.entries()) == 3
+
+
+@pytest.mark.skipif(segpy.cache.fcntl is None, reason="fcntl locking is unavailable")
+class TestLocking:
+
+    def test_lock_excludes_other_holders(self, tmpdir):
+        cache = CacheManager(str(tmpdir / 'cache'))
+        events = []
+        acquired = threading.Event()
+
+        def hold():
+            with cache.lock('abc') as locked:
+                assert locked
+                acquired.set()
+                time.sleep(0.2)
+                events.append('first released')
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        acquired.wait()
+        with cache.lock('abc'):
+            events.append('second acquired')
+        holder.join()
+        assert events == ['first released', 'second acquired']
+
+    def test_lock_files_are_not_entries(self, tmpdir):
+        cache = CacheManager(str(tmpdir / 'cache'))
+        with cache.lock('abc'):
+            pass
+        assert cache.entries() == []
+
+    def test_lock_files_of_evicted_entries_are_removed(self, tmpdir):
+        cache = CacheManager(str(tmpdir / 'cache'))
+        for key in ['a', 'b', 'c', 'd']:
+            with cache.lock(key):
+                cache.write(key, write_bytes(b'x'))
+        set_last_used(cache, 'b', 1000)
+        assert cache.remove('a')
+        assert [entry.key for entry in cache.prune(max_age=3600)] == ['b']
+        assert len(cache.clear()) == 2
+        assert os.listdir(str(tmpdir / 'cache')) == []
+
+    def test_held_lock_file_is_not_removed(self, tmpdir):
+        cache = CacheManager(str(tmpdir / 'cache'))
+        with cache.lock('abc'):
+            cache.write('abc', write_bytes(b'x'))
+            assert cache.remove('abc')
+            assert cache.lock_path('abc').exists()
+
+    def test_lock_is_taken_again_if_lock_file_is_removed_while_waiting(self, tmpdir):
+        cache = CacheManager(str(tmpdir / 'cache'))
+        acquired = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with cache.lock('abc'):
+                acquired.set()
+                release.wait(10)
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        acquired.wait()
+        # Release the first holder once the lock file has been removed, while this thread waits for the lock
+        threading.Timer(0.2, lambda: (cache.lock_path('abc').unlink(), release.set())).start()
+        with cache.lock('abc') as locked:
+            assert locked
+            # The lock held is on the lock file which now exists, which excludes any later holders
+            assert cache.lock_path('abc').exists()
+        holder.join()
+
+    def test_concurrent_readers_scan_only_once(self, tmpdir, monkeypatch):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        cache = CacheManager(str(tmpdir / 'cache'))
+        scans = []
+        original_catalog_traces = segpy.reader.catalog_traces
+
+        def counting_catalog_traces(*args, **kwargs):
+            scans.append(None)
+            time.sleep(0.1)
+            return original_catalog_traces(*args, **kwargs)
+
+        monkeypatch.setattr(segpy.reader, 'catalog_traces', counting_catalog_traces)
+
+        num_traces = []
+
+        def read():
+            with open(segy_path, 'rb') as fh:
+                num_traces.append(create_reader(fh, cache_directory=cache).num_traces())
+
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert num_traces == [12] * 4
+        assert len(scans) == 1
@@ -7,7 +7,7 @@ from pytest import raises
 
 from segpy.catalog import (CatalogBuilder, DictionaryCatalog, DictionaryCatalog2D, RegularConstantCatalog,
                            ConstantCatalog, RegularCatalog, LinearRegularCatalog, LastIndexVariesQuickestCatalog2D,
-                           FirstIndexVariesQuickestCatalog2D)
+                           FirstIndexVariesQuickestCatalog2D, ArrayCatalog, ArrayCatalog2D)
 from segpy.sorted_frozen_set import SortedFrozenSet
 from segpy.util import first, last, is_sorted
 from test.predicates import check_balanced
@@ -1056,6 +1056,16 @@ class TestLinearRegularCatalog:
                                        value_range.start, value_range[-1], value_range.step)
         assert all(catalog[k] == v for k, v in zip(key_range, value_range))
 
+    def test_large_descending_values_are_exact_integers(self):
+        # Offsets beyond the precision of a float, with values decreasing by a stride which does not divide the keys
+        key_range = range(-10 ** 20, 10 ** 20 + 1, 10 ** 18)
+        value_range = range(2 ** 70, 2 ** 70 - 3 * len(key_range), -3)
+        catalog = LinearRegularCatalog(key_range.start, key_range[-1], key_range.step,
+                                       value_range.start, value_range[-1], value_range.step)
+        values = [catalog[k] for k in key_range]
+        assert values == list(value_range)
+        assert all(type(v) is int for v in values)
+
     @given(key_range=ranges(min_size=2, max_size=100, min_step_value=1),
            data=data())
     def test_mismatched_value_length_raises_value_error(self, key_range, data):
@@ -1143,3 +1153,58 @@ class TestLinearRegularCatalog:
         assert 'value_last={}'.format(catalog._value_stop) in r
         assert 'value_stride={}'.format(catalog._value_stride) in r
         assert check_balanced(r)
+
+
+class TestArrayCatalog:
+
+    @given(dictionaries(integers(), integers()))
+    def test_mapping_is_preserved(self, mapping):
+        keys = sorted(mapping)
+        catalog = ArrayCatalog(keys, [mapping[k] for k in keys])
+        assert dict(catalog) == mapping
+
+    @given(dictionaries(integers(), integers()), integers())
+    def test_containment(self, mapping, key):
+        keys = sorted(mapping)
+        catalog = ArrayCatalog(keys, [mapping[k] for k in keys])
+        assert (key in catalog) == (key in mapping)
+
+    def test_missing_key_raises_key_error(self):
+        catalog = ArrayCatalog([1, 3, 5], [10, 30, 50])
+        with raises(KeyError):
+            catalog[4]
+
+    def test_mismatched_lengths_raises_value_error(self):
+        with raises(ValueError):
+            ArrayCatalog([1, 2, 3], [4, 5])
+
+    def test_repr(self):
+        r = repr(ArrayCatalog([1, 2, 3], [4, 5, 6]))
+        assert r.startswith('ArrayCatalog')
+        assert check_balanced(r)
+
+
+class TestArrayCatalog2D:
+
+    @given(dictionaries(tuples(integers(), integers()), integers(), min_size=1))
+    def test_mapping_is_preserved(self, mapping):
+        keys = sorted(mapping)
+        catalog = ArrayCatalog2D(sorted({i for i, _ in keys}), sorted({j for _, j in keys}),
+                                 [i for i, _ in keys], [j for _, j in keys], [mapping[k] for k in keys])
+        assert dict(catalog) == mapping
+
+    @given(dictionaries(tuples(integers(), integers()), integers(), min_size=1), tuples(integers(), integers()))
+    def test_containment(self, mapping, key):
+        keys = sorted(mapping)
+        catalog = ArrayCatalog2D(sorted({i for i, _ in keys}), sorted({j for _, j in keys}),
+                                 [i for i, _ in keys], [j for _, j in keys], [mapping[k] for k in keys])
+        assert (key in catalog) == (key in mapping)
+
+    def test_missing_key_raises_key_error(self):
+        catalog = ArrayCatalog2D([1, 2], [3, 4], [1, 2], [3, 4], [10, 20])
+        with raises(KeyError):
+            catalog[(1, 4)]
+
+    def test_mismatched_lengths_raises_value_error(self):
+        with raises(ValueError):
+            ArrayCatalog2D([1, 2], [3, 4], [1, 2], [3, 4], [10])
@@ -0,0 +1,103 @@
+import pickle
+
+import pytest
+
+from segpy.header import are_equal, field, FormatMeta, SubFormatMeta, make_sub_format
+from segpy.field_types import Int16, Int32
+from segpy.trace_header import TraceHeaderRev0, TraceHeaderRev1
+
+
+class BaseFormat(metaclass=FormatMeta):
+    first = field(Int32, offset=1, default=1, documentation="The first field.")
+    second = field(Int16, offset=5, default=2, documentation="The second field.")
+
+
+class DerivedFormat(BaseFormat, metaclass=FormatMeta):
+    third = field(Int32, offset=7, default=3, documentation="The third field.")
+
+
+class SubFormat(metaclass=SubFormatMeta,
+                parent_format=DerivedFormat,
+                parent_field_names=['third', 'first']):
+    pass
+
+
+class TestHeader:
+
+    def test_fields_have_default_values(self):
+        header = DerivedFormat()
+        assert (header.first, header.second, header.third) == (1, 2, 3)
+
+    def test_positional_and_keyword_arguments(self):
+        header = DerivedFormat(10, 20, third=30)
+        assert (header.first, header.second, header.third) == (10, 20, 30)
+
+    def test_unknown_keyword_raises_type_error(self):
+        with pytest.raises(TypeError):
+            DerivedFormat(fourth=4)
+
+    def test_instances_are_independent(self):
+        a = DerivedFormat(first=10)
+        b = DerivedFormat(first=20)
+        assert a.first == 10
+        assert b.first == 20
+
+    def test_base_and_derived_fields_share_storage_order(self):
+        header = DerivedFormat()
+        header.first = 11
+        header.third = 33
+        assert BaseFormat.first.name == 'first'
+        assert (header.first, header.second, header.third) == (11, 2, 33)
+
+    def test_values_are_converted_to_field_type(self):
+        header = BaseFormat()
+        with pytest.raises(ValueError):
+            header.first = 'not a number'
+
+    def test_headers_have_no_instance_dictionary(self):
+        header = TraceHeaderRev1()
+        assert not hasattr(header, '__dict__')
+        with pytest.raises(AttributeError):
+            header.not_a_field = 1
+
+    def test_field_introspection(self):
+        assert TraceHeaderRev1.crossline_number.offset == 193
+        assert TraceHeaderRev1.crossline_number.default == 0
+        assert TraceHeaderRev1.line_sequence_num.name == 'line_sequence_num'
+        assert TraceHeaderRev1.ordered_field_names()[:len(TraceHeaderRev0.ordered_field_names())] == \
+            TraceHeaderRev0.ordered_field_names()
+
+    def test_sub_format_fields(self):
+        header = SubFormat(third=30)
+        assert SubFormat.ordered_field_names() == ('third', 'first')
+        assert (header.third, header.first) == (30, 1)
+
+    def test_pickle_round_trip_includes_inherited_fields(self):
+        header = DerivedFormat(10, 20, 30)
+        unpickled_header = pickle.loads(pickle.dumps(header))
+        assert are_equal(header, unpickled_header)
+
+    def test_copy_with_updates(self):
+        header = DerivedFormat(10, 20, 30)
+        copied_header = header.copy(second=25)
+        assert (copied_header.first, copied_header.second, copied_header.third) == (10, 25, 30)
+        assert header.second == 20
+
+
+class TestMakeSubFormat:
+
+    def test_sub_format_fields(self):
+        sub_format = make_sub_format(DerivedFormat, ['third', 'first'])
+        assert sub_format.ordered_field_names() == ('third', 'first')
+        assert sub_format._parent_format is DerivedFormat
+        assert sub_format.third.offset == DerivedFormat.third.offset
+
+    def test_repeated_calls_return_same_class(self):
+        assert make_sub_format(DerivedFormat, ['third', 'first']) is make_sub_format(DerivedFormat, ('third', 'first'))
+
+    def test_different_fields_return_different_classes(self):
+        assert make_sub_format(DerivedFormat, ['third', 'first']) is not make_sub_format(DerivedFormat, ['first'])
+
+    def test_unknown_field_raises_attribute_error(self):
+        with pytest.raises(AttributeError):
+            make_sub_format(DerivedFormat, ['fourth'])
@@ -0,0 +1,113 @@
+import sys
+from array import array
+from collections import OrderedDict
+
+import pytest
+from pytest import raises
+
+from segpy.binary_reel_header import BinaryReelHeader
+from segpy.header_store import (write_header_store, read_header_store, column_typecode, HeaderStoreFormatError,
+                                HEADER_STORE_FORMAT_VERSION)
+from segpy.trace_header import TraceHeaderRev1
+
+
+def round_trip(tmpdir, columns, metadata=None):
+    store_path = str(tmpdir / 'test.idx')
+    with open(store_path, 'wb') as fh:
+        write_header_store(fh, metadata or {}, columns)
+    with open(store_path, 'rb') as fh:
+        return read_header_store(fh)
+
+
+class TestHeaderStoreRoundTrip:
+
+    def test_metadata_is_preserved(self, tmpdir):
+        metadata, columns = round_trip(tmpdir, OrderedDict(), {'file_hash': 'abc', 'num_traces': 0})
+        assert metadata == {'file_hash': 'abc', 'num_traces': 0}
+        assert len(columns) == 0
+
+    @pytest.mark.parametrize('typecode, values', [
+        ('h', [-32768, 0, 32767]),
+        ('H', [0, 65535, 7]),
+        ('i', [-2**31, 5, 2**31 - 1]),
+        ('I', [0, 2**32 - 1]),
+        ('b', [-1, 2, 3]),
+        ('B', []),
+    ])
+    def test_columns_are_preserved(self, tmpdir, typecode, values):
+        _, columns = round_trip(tmpdir, OrderedDict([('field', array(typecode, values))]))
+        assert list(columns['field']) == values
+
+    def test_column_order_is_preserved(self, tmpdir):
+        original = OrderedDict([('z', array('h', [1, 2, 3])), ('a', array('i', [4, 5, 6])), ('m', array('b', [7]))])
+        _, columns = round_trip(tmpdir, original)
+        assert list(columns.keys()) == ['z', 'a', 'm']
+        assert [list(column) for column in columns.values()] == [[1, 2, 3], [4, 5, 6], [7]]
+
+    @pytest.mark.parametrize('foreign_byteorder', [False, True])
+    def test_columns_are_native_memoryviews(self, tmpdir, monkeypatch, foreign_byteorder):
+        column = array('i', [1, -2, 2**31 - 1])
+        if foreign_byteorder:
+            # Write the store as it would be written on a machine of the other byte order
+            monkeypatch.setattr(sys, 'byteorder', 'big' if sys.byteorder == 'little' else 'little')
+            column.byteswap()
+        store_path = str(tmpdir / 'test.idx')
+        with open(store_path, 'wb') as fh:
+            write_header_store(fh, {}, OrderedDict([('field', column)]))
+        monkeypatch.undo()
+        with open(store_path, 'rb') as fh:
+            _, columns = read_header_store(fh)
+        assert type(columns['field']) is memoryview
+        assert columns['field'].format == 'i'
+        assert columns['field'].tolist() == [1, -2, 2**31 - 1]
+
+    def test_unsupported_typecode_raises_type_error(self, tmpdir):
+        with raises(TypeError):
+            round_trip(tmpdir, OrderedDict([('field', array('d', [1.0]))]))
+
+
+class TestColumnTypecode:
+
+    def test_typecodes_match_field_types(self):
+        assert column_typecode(TraceHeaderRev1, 'source_x') == 'i'
+        assert column_typecode(TraceHeaderRev1, 'num_samples') == 'h'
+
+    def test_enumerated_fields_have_integer_typecodes(self):
+        assert column_typecode(BinaryReelHeader, 'data_sample_format') == 'h'
+
+    def test_unknown_field_raises_attribute_error(self):
+        with raises(AttributeError):
+            column_typecode(TraceHeaderRev1, 'no_such_field')
+
+
+class TestHeaderStoreFormatErrors:
+
+    def test_bad_magic_raises_header_store_format_error(self, tmpdir):
+        store_path = str(tmpdir / 'test.idx')
+        with open(store_path, 'wb') as fh:
+            fh.write(b'NOTAHDRS' + bytes(32))
+        with open(store_path, 'rb') as fh:
+            with raises(HeaderStoreFormatError):
+                read_header_store(fh)
+
+    def test_unsupported_version_raises_header_store_format_error(self, tmpdir):
+        store_path = str(tmpdir / 'test.idx')
+        with open(store_path, 'wb') as fh:
+            write_header_store(fh, {}, OrderedDict())
+        with open(store_path, 'r+b') as fh:
+            fh.seek(8)
+            fh.write((HEADER_STORE_FORMAT_VERSION + 1).to_bytes(4, 'little'))
+        with open(store_path, 'rb') as fh:
+            with raises(HeaderStoreFormatError):
+                read_header_store(fh)
+
+    def test_truncated_file_raises_header_store_format_error(self, tmpdir):
+        store_path = str(tmpdir / 'test.idx')
+        with open(store_path, 'wb') as fh:
+            write_header_store(fh, {}, OrderedDict([('field', array('i', [1, 2, 3, 4]))]))
+        with open(store_path, 'r+b') as fh:
+            fh.seek(-16, 2)
+            fh.truncate()
+        with open(store_path, 'rb') as fh:
+            with raises(HeaderStoreFormatError):
+                read_header_store(fh)
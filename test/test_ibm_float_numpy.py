@@ -0,0 +1,85 @@
+import math
+
+import pytest
+from hypothesis import given
+from hypothesis.strategies import integers, floats, lists, one_of, sampled_from
+
+from segpy.ibm_float import (ieee2ibm, ibm2ieee, MAX_IBM_FLOAT, MIN_IBM_FLOAT, SMALLEST_POSITIVE_NORMAL_IBM_FLOAT)
+
+numpy = pytest.importorskip('numpy')
+from segpy.ibm_float_numpy import pack_ibm_floats_numpy, unpack_ibm_floats_numpy  # noqa: E402
+
+words = integers(min_value=0, max_value=2**32 - 1)
+
+special_floats = sampled_from([0.0, -0.0, MAX_IBM_FLOAT, MIN_IBM_FLOAT,
+                               SMALLEST_POSITIVE_NORMAL_IBM_FLOAT,
+                               SMALLEST_POSITIVE_NORMAL_IBM_FLOAT / 2**20,
+                               -SMALLEST_POSITIVE_NORMAL_IBM_FLOAT / 2**23,
+                               SMALLEST_POSITIVE_NORMAL_IBM_FLOAT / 2**25,
+                               math.nextafter(MAX_IBM_FLOAT, math.inf) if hasattr(math, 'nextafter') else 1e76,
+                               1e300, -1e300, 5e-324, math.inf, -math.inf, math.nan])
+
+any_floats = one_of(floats(), special_floats)
+
+
+def ieee2ibm_or_exception_type(f):
+    try:
+        return ieee2ibm(f)
+    except (ValueError, OverflowError, FloatingPointError) as e:
+        return type(e)
+
+
+class TestUnpackIBMFloatsNumpy:
+
+    @given(lists(words))
+    def test_unpack_matches_ibm2ieee(self, ws):
+        data = b''.join(w.to_bytes(4, 'big') for w in ws)
+        unpacked = unpack_ibm_floats_numpy(data, len(ws))
+        expected = [ibm2ieee(data[i:i + 4]) for i in range(0, len(data), 4)]
+        assert list(unpacked) == expected
+        assert [math.copysign(1.0, u) for u in unpacked] == [math.copysign(1.0, e) for e in expected]
+
+    def test_negative_zero_is_positive(self):
+        unpacked = unpack_ibm_floats_numpy(b'\x80\x00\x00\x00\xc3\x00\x00\x00', 2)
+        assert [math.copysign(1.0, u) for u in unpacked] == [1.0, 1.0]
+
+    def test_unpack_reads_only_num_items(self):
+        assert list(unpack_ibm_floats_numpy(b'A\x10\x00\x00\xc1\x10\x00\x00', 1)) == [1.0]
+
+
+class TestPackIBMFloatsNumpy:
+
+    @given(any_floats)
+    def test_pack_matches_ieee2ibm(self, f):
+        try:
+            packed = pack_ibm_floats_numpy([f])
+        except (ValueError, OverflowError, FloatingPointError) as e:
+            packed = type(e)
+        assert packed == ieee2ibm_or_exception_type(f)
+
+    @given(lists(floats(min_value=MIN_IBM_FLOAT, max_value=MAX_IBM_FLOAT)))
+    def test_pack_many_matches_ieee2ibm(self, fs):
+        expected = [ieee2ibm_or_exception_type(f) for f in fs]
+        first_error = next((e for e in expected if isinstance(e, type)), None)
+        if first_error is None:
+            assert pack_ibm_floats_numpy(fs) == b''.join(expected)
+        else:
+            with pytest.raises(first_error):
+                pack_ibm_floats_numpy(fs)
+
+    def test_first_invalid_value_determines_exception(self):
+        with pytest.raises(OverflowError):
+            pack_ibm_floats_numpy([1.0, 1e300, math.nan])
+        with pytest.raises(ValueError):
+            pack_ibm_floats_numpy([1.0, math.nan, 1e300])
+
+    @pytest.mark.parametrize('values', [[1.0, -2.5, 0.0], (1.0, -2.5, 0.0), iter([1.0, -2.5, 0.0])])
+    def test_pack_accepts_iterables(self, values):
+        assert pack_ibm_floats_numpy(values) == ieee2ibm(1.0) + ieee2ibm(-2.5) + ieee2ibm(0.0)
+
+    def test_pack_accepts_numpy_arrays(self):
+        values = numpy.array([1.0, -2.5, 0.0], dtype=numpy.float32)
+        assert pack_ibm_floats_numpy(values) == ieee2ibm(1.0) + ieee2ibm(-2.5) + ieee2ibm(0.0)
+
+    def test_pack_empty(self):
+        assert pack_ibm_floats_numpy([]) == b''
@@ -0,0 +1,111 @@
+import os
+import tempfile
+from io import BytesIO
+from itertools import product
+
+import pytest
+from hypothesis import given
+from hypothesis.strategies import dictionaries, integers, tuples
+from pytest import raises
+
+from segpy.catalog import CatalogBuilder, LinearRegularCatalog, ArrayCatalog, ArrayCatalog2D
+from segpy.index import write_index, read_index, IndexFormatError, INDEX_FORMAT_VERSION, CATALOG_NAMES
+from test.strategies import ranges
+
+int64s = integers(min_value=-2**63, max_value=2**63 - 1)
+
+
+@pytest.fixture(scope='module')
+def index_dir(tmpdir_factory):
+    """A directory shared by all the examples of a property-based test."""
+    return tmpdir_factory.mktemp('index')
+
+
+def round_trip(directory, catalogs, metadata=None):
+    # Each index is written to a new file, as catalogs read from earlier files may still be memory mapped
+    handle, index_path = tempfile.mkstemp(suffix='.idx', dir=str(directory))
+    os.close(handle)
+    with open(index_path, 'wb') as fh:
+        write_index(fh, metadata or {}, catalogs)
+    with open(index_path, 'rb') as fh:
+        return read_index(fh)
+
+
+class TestIndexRoundTrip:
+
+    def test_metadata_is_preserved(self, tmpdir):
+        metadata, catalogs = round_trip(tmpdir, {}, {'encoding': 'cp037', 'dimensionality': 3})
+        assert metadata == {'encoding': 'cp037', 'dimensionality': 3}
+        assert all(catalogs[name] is None for name in CATALOG_NAMES)
+
+    @given(mapping=dictionaries(int64s, int64s, min_size=1))
+    def test_1d_catalogs_are_preserved(self, index_dir, mapping):
+        catalog = CatalogBuilder(mapping).create()
+        _, catalogs = round_trip(index_dir, {'cdp': catalog})
+        assert dict(catalogs['cdp']) == mapping
+
+    @given(mapping=dictionaries(tuples(int64s, int64s), int64s, min_size=1))
+    def test_2d_catalogs_are_preserved(self, index_dir, mapping):
+        catalog = CatalogBuilder(mapping).create()
+        _, catalogs = round_trip(index_dir, {'line': catalog})
+        assert dict(catalogs['line']) == mapping
+
+    @given(i_range=ranges(min_size=1, max_size=10, min_step_value=1),
+           j_range=ranges(min_size=1, max_size=10, min_step_value=1))
+    def test_regular_2d_catalogs_keep_their_type(self, index_dir, i_range, j_range):
+        mapping = {key: v for v, key in enumerate(product(i_range, j_range))}
+        catalog = CatalogBuilder(mapping).create()
+        _, catalogs = round_trip(index_dir, {'line': catalog})
+        assert type(catalogs['line']) == type(catalog)
+        assert dict(catalogs['line']) == mapping
+
+    @given(key_range=ranges(min_size=2, max_size=100, min_step_value=1))
+    def test_linear_regular_catalogs_are_not_stored_as_arrays(self, index_dir, key_range):
+        catalog = LinearRegularCatalog(key_range.start, key_range[-1], key_range.step,
+                                       0, 240 * (len(key_range) - 1), 240)
+        _, catalogs = round_trip(index_dir, {'trace_offset': catalog})
+        assert isinstance(catalogs['trace_offset'], LinearRegularCatalog)
+        assert dict(catalogs['trace_offset']) == dict(catalog)
+
+    def test_irregular_catalogs_are_array_backed(self, tmpdir):
+        _, catalogs = round_trip(tmpdir, {'cdp': {1: 5, 7: 2, 8: 9},
+                                          'line': {(1, 2): 3, (1, 5): 4, (3, 2): 8}})
+        assert isinstance(catalogs['cdp'], ArrayCatalog)
+        assert isinstance(catalogs['line'], ArrayCatalog2D)
+
+    def test_values_which_are_not_integers_raise_type_error(self):
+        with raises(TypeError):
+            write_index(BytesIO(), {}, {'cdp': {1: 'one'}})
+
+
+class TestIndexFormatErrors:
+
+    def test_bad_magic_raises_index_format_error(self, tmpdir):
+        index_path = str(tmpdir / 'test.idx')
+        with open(index_path, 'wb') as fh:
+            fh.write(b'NOTANIDX' + bytes(32))
+        with open(index_path, 'rb') as fh:
+            with raises(IndexFormatError):
+                read_index(fh)
+
+    def test_unsupported_version_raises_index_format_error(self, tmpdir):
+        index_path = str(tmpdir / 'test.idx')
+        with open(index_path, 'wb') as fh:
+            write_index(fh, {}, {})
+        with open(index_path, 'r+b') as fh:
+            fh.seek(8)
+            fh.write((INDEX_FORMAT_VERSION + 1).to_bytes(4, 'little'))
+        with open(index_path, 'rb') as fh:
+            with raises(IndexFormatError):
+                read_index(fh)
+
+    def test_truncated_file_raises_index_format_error(self, tmpdir):
+        index_path = str(tmpdir / 'test.idx')
+        with open(index_path, 'wb') as fh:
+            write_index(fh, {}, {'cdp': {1: 5, 7: 2, 8: 9}})
+        with open(index_path, 'r+b') as fh:
+            fh.seek(-8, 2)
+            fh.truncate()
+        with open(index_path, 'rb') as fh:
+            with raises(IndexFormatError):
+                read_index(fh)
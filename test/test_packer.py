@@ -0,0 +1,114 @@
+import pickle
+
+import pytest
+
+from segpy.binary_reel_header import BinaryReelHeader, DataSampleFormat
+from segpy.field_types import Int16, Int32, NNInt16
+from segpy.header import are_equal, field, FormatMeta, SubFormatMeta
+from segpy.packer import make_header_packer, BijectiveHeaderPacker, SurjectiveHeaderPacker
+from segpy.trace_header import TraceHeaderRev0, TraceHeaderRev1
+
+
+class CoincidentFormat(metaclass=FormatMeta):
+    START_OFFSET_IN_BYTES = 1
+    LENGTH_IN_BYTES = 12
+
+    first = field(Int32, offset=1, default=1, documentation="The first field.")
+    alias = field(Int32, offset=1, default=1, documentation="The first field, by another name.")
+    second = field(NNInt16, offset=5, default=2, documentation="The second field.")
+    third = field(Int16, offset=9, default=3, documentation="The third field.")
+
+
+class TraceSubFormat(metaclass=SubFormatMeta,
+                     parent_format=TraceHeaderRev1,
+                     parent_field_names=['file_sequence_num', 'ensemble_num', 'num_samples']):
+    pass
+
+
+def _expected_header(packer, buffer):
+    # Unpack by assigning each field in turn, as header constructors do
+    return packer._unpack_header_fields(buffer)
+
+
+@pytest.mark.parametrize('header_format_class', [TraceHeaderRev0, TraceHeaderRev1, BinaryReelHeader,
+                                                 TraceSubFormat, CoincidentFormat])
+@pytest.mark.parametrize('endian', ['>', '<'])
+class TestGeneratedPacking:
+
+    def test_unpack_matches_field_assignment(self, header_format_class, endian):
+        packer = make_header_packer(header_format_class, endian)
+        buffer = packer.pack(header_format_class())
+        header = packer.unpack(buffer)
+        assert type(header) is header_format_class
+        assert are_equal(header, _expected_header(packer, buffer))
+
+    def test_round_trip(self, header_format_class, endian):
+        packer = make_header_packer(header_format_class, endian)
+        buffer = packer.pack(header_format_class())
+        assert packer.pack(packer.unpack(buffer)) == buffer
+
+    def test_pickled_packer_round_trip(self, header_format_class, endian):
+        packer = make_header_packer(header_format_class, endian)
+        buffer = packer.pack(header_format_class())
+        unpickled_packer = pickle.loads(pickle.dumps(packer))
+        assert unpickled_packer.pack(unpickled_packer.unpack(buffer)) == buffer
+
+
+class TestHeaderPacker:
+
+    def test_coincident_fields_use_surjective_packer(self):
+        assert isinstance(make_header_packer(CoincidentFormat), SurjectiveHeaderPacker)
+
+    def test_distinct_fields_use_bijective_packer(self):
+        assert isinstance(make_header_packer(TraceHeaderRev1), BijectiveHeaderPacker)
+
+    def test_unpack_assigns_coincident_fields(self):
+        packer = make_header_packer(CoincidentFormat)
+        header = packer.unpack(packer.pack(CoincidentFormat(first=42, second=7, third=-3)))
+        assert (header.first, header.alias, header.second, header.third) == (42, 42, 7, -3)
+
+    def test_unpacked_header_is_mutable(self):
+        packer = make_header_packer(TraceHeaderRev1)
+        header = packer.unpack(packer.pack(TraceHeaderRev1(num_samples=10)))
+        header.num_samples = 20
+        assert header.num_samples == 20
+
+    def test_unpack_converts_enumerated_fields(self):
+        packer = make_header_packer(BinaryReelHeader)
+        header = packer.unpack(packer.pack(BinaryReelHeader(data_sample_format=DataSampleFormat.FLOAT32)))
+        assert header.data_sample_format is DataSampleFormat.FLOAT32
+
+    def test_unpack_invalid_enumerated_value_raises_value_error(self):
+        packer = make_header_packer(BinaryReelHeader)
+        buffer = bytearray(packer.pack(BinaryReelHeader()))
+        data_sample_format_offset = BinaryReelHeader.data_sample_format.offset - BinaryReelHeader.START_OFFSET_IN_BYTES
+        buffer[data_sample_format_offset:data_sample_format_offset + 2] = (99).to_bytes(2, 'big')
+        with pytest.raises(ValueError):
+            packer.unpack(bytes(buffer))
+
+    def test_unpack_out_of_range_value_raises_value_error(self):
+        packer = make_header_packer(CoincidentFormat)
+        buffer = bytearray(packer.pack(CoincidentFormat()))
+        buffer[4:6] = (40000).to_bytes(2, 'big')
+        with pytest.raises(ValueError):
+            packer.unpack(bytes(buffer))
+
+    def test_unpack_value_outside_narrowed_range_raises_value_error(self):
+        packer = make_header_packer(BinaryReelHeader)
+        buffer = bytearray(packer.pack(BinaryReelHeader()))
+        field_offset = (BinaryReelHeader.num_extended_textual_headers.offset
+                        - BinaryReelHeader.START_OFFSET_IN_BYTES)
+        buffer[field_offset:field_offset + 2] = (-5).to_bytes(2, 'big', signed=True)
+        with pytest.raises(ValueError):
+            packer.unpack(bytes(buffer))
+
+    def test_repeated_calls_return_same_packer(self):
+        assert make_header_packer(TraceHeaderRev1, '<') is make_header_packer(TraceHeaderRev1, '<')
+
+    def test_endians_have_distinct_packers(self):
+        assert make_header_packer(TraceHeaderRev1, '<') is not make_header_packer(TraceHeaderRev1, '>')
+
+    def test_pack_wrong_header_type_raises_type_error(self):
+        packer = make_header_packer(TraceHeaderRev1)
+        with pytest.raises(TypeError):
+            packer.pack(BinaryReelHeader())
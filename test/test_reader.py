@@ -2,15 +2,40 @@
 """
 
 import io
+import os
+import pickle
+import shutil
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
 
 from hypothesis import assume, given, HealthCheck, Phase, settings, unlimited
 import hypothesis.strategies as ST
 import pytest
+from segpy.access import MEMORY_MAP_ACCESS, POSITIONAL_ACCESS, STREAM_ACCESS
+import segpy.background
+import segpy.readahead
+from segpy.background import BackgroundCatalog
+from segpy.dataset import DelegatingDataset
 from segpy.header import are_equal
-from segpy.reader import create_reader
-from segpy.toolkit import REEL_HEADER_NUM_BYTES
+import segpy.reader
+import segpy.util
+from segpy.reader import create_reader, trace_header_columns, FIXED_LENGTH_CATALOG, SCAN_CATALOG
+from segpy.toolkit import REEL_HEADER_NUM_BYTES, TRACE_HEADER_NUM_BYTES
+from segpy.trace_header import TraceHeaderRev1
+from segpy.trace_samples import LazyIBMSamples
+from segpy.util import hash_for_file
 from segpy.writer import write_segy
 from .dataset_strategy import dataset
+from .util import write_synthetic_segy
+
+
+class DecodedSamplesDataset(DelegatingDataset):
+    """A Dataset which provides the decoded samples of its source, but not the encoded samples."""
+
+    def trace_samples(self, trace_index, start=None, stop=None):
+        return self.source.trace_samples(trace_index, start, stop)
 
 
 @pytest.fixture
@@ -70,6 +95,26 @@ class Test_create_reader_Exceptions:
             create_reader(min_reader_data,
                           dimensionality=dims)
 
+    def test_value_error_on_invalid_access_mode(self, min_reader_data):
+        with pytest.raises(ValueError):
+            create_reader(min_reader_data,
+                          access_mode='telepathy')
+
+    def test_value_error_on_invalid_catalog_mode(self, min_reader_data):
+        with pytest.raises(ValueError):
+            create_reader(min_reader_data,
+                          catalog_mode='guesswork')
+
+    @pytest.mark.parametrize('access_mode', [MEMORY_MAP_ACCESS, POSITIONAL_ACCESS])
+    def test_type_error_on_access_mode_without_file_descriptor(self, tmpdir, access_mode):
+        write_synthetic_segy(tmpdir / 'test.segy')
+        with open(str(tmpdir / 'test.segy'), 'rb') as fh:
+            handle = io.BytesIO(fh.read())
+        with pytest.raises(TypeError):
+            create_reader(handle,
+                          cache_directory=None,
+                          access_mode=access_mode)
+
 
 @given(dataset(dims=2))
 @settings(
@@ -93,3 +138,809 @@ def test_round_trip(tmpdir, dataset):
         assert are_equal(dataset.binary_reel_header, reader.binary_reel_header)
         assert dataset.extended_textual_header == reader.extended_textual_header
         assert dataset.dimensionality == reader.dimensionality
+
+
+class TestMemoryMapAccess:
+
+    @pytest.mark.parametrize('seg_y_type', ['ibm', 'int32', 'int16', 'int8', 'float32'])
+    @pytest.mark.parametrize('endian', ['<', '>'])
+    def test_samples_and_headers_match_stream_access(self, tmpdir, seg_y_type, endian):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path, seg_y_type=seg_y_type, endian=endian)
+        with open(segy_path, 'rb') as fh:
+            stream_reader = create_reader(fh, endian=endian, cache_directory=None, access_mode=STREAM_ACCESS)
+            fh.seek(0)
+            mmap_reader = create_reader(fh, endian=endian, cache_directory=None, access_mode=MEMORY_MAP_ACCESS)
+            assert mmap_reader.access_mode == MEMORY_MAP_ACCESS
+            for trace_index in stream_reader.trace_indexes():
+                assert list(mmap_reader.trace_samples(trace_index)) == list(stream_reader.trace_samples(trace_index))
+                assert list(mmap_reader.trace_samples(trace_index, 2, 5)) == \
+                    list(stream_reader.trace_samples(trace_index, 2, 5))
+                assert are_equal(mmap_reader.trace_header(trace_index), stream_reader.trace_header(trace_index))
+
+    def test_single_byte_samples_are_not_copied(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        dataset = write_synthetic_segy(segy_path, seg_y_type='int8')
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None, access_mode=MEMORY_MAP_ACCESS)
+            samples = reader.trace_samples(5)
+            assert isinstance(samples, memoryview)
+            assert samples.tolist() == dataset.trace_samples(5)
+
+    def test_ibm_samples_are_decoded_lazily(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        dataset = write_synthetic_segy(segy_path, seg_y_type='ibm')
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None, access_mode=MEMORY_MAP_ACCESS)
+            samples = reader.trace_samples(5)
+            many_samples = reader.trace_samples_many([3, 5])
+        assert isinstance(samples, LazyIBMSamples)
+        assert samples[2] == dataset.trace_samples(5)[2]
+        assert list(samples[1:4]) == dataset.trace_samples(5)[1:4]
+        assert list(samples) == dataset.trace_samples(5)
+        assert [list(s) for s in many_samples] == [dataset.trace_samples(3), dataset.trace_samples(5)]
+
+    def test_trace_samples_many_matches_stream_access(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path, seg_y_type='int8')
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None, access_mode=MEMORY_MAP_ACCESS)
+            trace_indexes = [11, 0, 5, 5]
+            assert [list(samples) for samples in reader.trace_samples_many(trace_indexes, 1, 4)] == \
+                [list(reader.trace_samples(trace_index, 1, 4)) for trace_index in trace_indexes]
+
+    def test_cached_reader_adopts_requested_access_mode(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            create_reader(fh, access_mode=STREAM_ACCESS)
+            fh.seek(0)
+            reader = create_reader(fh, access_mode=MEMORY_MAP_ACCESS)
+            assert reader.access_mode == MEMORY_MAP_ACCESS
+
+
+def _overwrite_crossline_number(segy_path, trace_index, crossline_number, num_samples, bps=4):
+    trace_num_bytes = TRACE_HEADER_NUM_BYTES + num_samples * bps
+    pos = 3600 + trace_index * trace_num_bytes + TraceHeaderRev1.crossline_number.offset - 1
+    with open(segy_path, 'r+b') as fh:
+        fh.seek(pos)
+        fh.write(struct.pack('>i', crossline_number))
+
+
+def _catalogs(reader):
+    return (dict(reader._trace_offset_catalog),
+            dict(reader._trace_length_catalog),
+            dict(getattr(reader, '_cdp_catalog', None) or {}),
+            dict(getattr(reader, '_line_catalog', None) or {}))
+
+
+class TestFixedLengthCatalog:
+
+    @pytest.mark.parametrize('num_inlines, num_xlines', [(3, 4), (1, 5), (4, 1), (1, 1), (13, 17)])
+    def test_catalogs_match_scan(self, tmpdir, num_inlines, num_xlines):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path, num_inlines=num_inlines, num_xlines=num_xlines)
+        with open(segy_path, 'rb') as fh:
+            scan_reader = create_reader(fh, cache_directory=None, catalog_mode=SCAN_CATALOG)
+            fh.seek(0)
+            fixed_reader = create_reader(fh, cache_directory=None, catalog_mode=FIXED_LENGTH_CATALOG)
+            assert type(fixed_reader) == type(scan_reader)
+            assert _catalogs(fixed_reader) == _catalogs(scan_reader)
+            assert fixed_reader.verify_catalogs()
+
+    def test_falls_back_to_scan_for_irregular_sampled_headers(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path, num_inlines=3, num_xlines=4, num_samples=10)
+        _overwrite_crossline_number(segy_path, 11, 999, num_samples=10)
+        with open(segy_path, 'rb') as fh:
+            scan_reader = create_reader(fh, cache_directory=None, catalog_mode=SCAN_CATALOG)
+            fh.seek(0)
+            fixed_reader = create_reader(fh, cache_directory=None, catalog_mode=FIXED_LENGTH_CATALOG)
+            assert _catalogs(fixed_reader) == _catalogs(scan_reader)
+
+    def test_verify_detects_irregular_unsampled_header(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path, num_inlines=10, num_xlines=20, num_samples=10)
+        # With 200 traces one header in three is sampled, and trace 2 is not among them
+        _overwrite_crossline_number(segy_path, 2, 999, num_samples=10)
+        with open(segy_path, 'rb') as fh:
+            fixed_reader = create_reader(fh, cache_directory=None, catalog_mode=FIXED_LENGTH_CATALOG)
+            assert not fixed_reader.verify_catalogs()
+
+
+class TestCacheKey:
+
+    def test_file_restored_from_copy_is_loaded_from_cache(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            create_reader(fh)
+        # A copy which preserves the modification time has a different inode
+        backup_path = str(tmpdir / 'backup.segy')
+        shutil.copy2(segy_path, backup_path)
+        os.replace(backup_path, segy_path)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh)
+            assert reader.num_traces() == 12
+        assert len((tmpdir / '.segpy').listdir('*.idx')) == 1
+
+    def test_cache_key_does_not_depend_on_device_or_inode(self, tmpdir, monkeypatch):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            key = segpy.reader._cache_key(fh, 'args')
+            fingerprint = segpy.util.fingerprint_for_file(fh)
+            status = os.fstat(fh.fileno())
+            other_device_status = SimpleNamespace(**{name: getattr(status, name)
+                                                     for name in dir(status) if name.startswith('st_')})
+            other_device_status.st_dev += 1
+            other_device_status.st_ino += 1
+            monkeypatch.setattr(segpy.util, 'file_status', lambda fh: other_device_status)
+            assert segpy.reader._cache_key(fh, 'args') == key
+            assert segpy.util.fingerprint_for_file(fh) == fingerprint
+
+    @pytest.mark.parametrize('strict_cache', [False, True])
+    def test_second_reader_is_loaded_from_cache(self, tmpdir, strict_cache):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            create_reader(fh, strict_cache=strict_cache)
+            assert len((tmpdir / '.segpy').listdir('*.idx')) == 1
+            fh.seek(0)
+            reader = create_reader(fh, strict_cache=strict_cache, catalog_mode=FIXED_LENGTH_CATALOG)
+            assert len((tmpdir / '.segpy').listdir('*.idx')) == 1
+            assert reader.num_traces() == 12
+
+    def test_strict_and_fingerprint_caches_are_distinct(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            create_reader(fh, strict_cache=False)
+            fh.seek(0)
+            create_reader(fh, strict_cache=True)
+        assert len((tmpdir / '.segpy').listdir('*.idx')) == 2
+
+    def test_strict_cache_hashes_file_once_when_saving(self, tmpdir, monkeypatch):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        num_bytes_hashed = []
+
+        def counting_hash_for_file(fh, *args, num_bytes=None):
+            if num_bytes != REEL_HEADER_NUM_BYTES:
+                num_bytes_hashed.append(num_bytes)
+            return hash_for_file(fh, *args, num_bytes=num_bytes)
+
+        monkeypatch.setattr(segpy.reader, 'hash_for_file', counting_hash_for_file)
+        with open(segy_path, 'rb') as fh:
+            create_reader(fh, strict_cache=True)
+            assert len(num_bytes_hashed) == 1
+            fh.seek(0)
+            reader = create_reader(fh, strict_cache=True)
+            assert reader.num_traces() == 12
+        assert len((tmpdir / '.segpy').listdir('*.idx')) == 1
+
+    def test_in_memory_files_with_identical_headers_are_distinct(self, tmpdir):
+        cache_dir = tmpdir / 'cache'
+        data = []
+        for num_inlines in (3, 2):
+            segy_path = str(tmpdir / 'test.segy')
+            write_synthetic_segy(segy_path, num_inlines=num_inlines)
+            with open(segy_path, 'rb') as fh:
+                data.append(fh.read())
+        assert data[0][:REEL_HEADER_NUM_BYTES] == data[1][:REEL_HEADER_NUM_BYTES]
+        for segy_data in data:
+            create_reader(io.BytesIO(segy_data), cache_directory=str(cache_dir))
+        assert len(cache_dir.listdir('*.idx')) == 2
+        reader = create_reader(io.BytesIO(data[0]), cache_directory=str(cache_dir))
+        assert reader.num_traces() == 12
+
+    def test_fixed_length_catalogs_are_not_used_for_scan(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path, num_inlines=10, num_xlines=20, num_samples=10)
+        # Trace 2 is not among the headers sampled for the fixed-length catalogs
+        _overwrite_crossline_number(segy_path, 2, 999, num_samples=10)
+        with open(segy_path, 'rb') as fh:
+            uncached_reader = create_reader(fh, cache_directory=None, catalog_mode=SCAN_CATALOG)
+            fh.seek(0)
+            fixed_reader = create_reader(fh, catalog_mode=FIXED_LENGTH_CATALOG)
+            assert _catalogs(fixed_reader) != _catalogs(uncached_reader)
+            fh.seek(0)
+            scan_reader = create_reader(fh, catalog_mode=SCAN_CATALOG)
+            assert _catalogs(scan_reader) == _catalogs(uncached_reader)
+            fh.seek(0)
+            fixed_reader = create_reader(fh, catalog_mode=FIXED_LENGTH_CATALOG)
+            assert _catalogs(fixed_reader) == _catalogs(uncached_reader)
+        assert len((tmpdir / '.segpy').listdir('*.idx')) == 1
+
+    @pytest.mark.parametrize('irregular', [False, True])
+    def test_cached_reader_matches_scanned_reader(self, tmpdir, irregular):
+        segy_path = str(tmpdir / 'test.segy')
+        dataset = write_synthetic_segy(segy_path, num_inlines=3, num_xlines=4, num_samples=10)
+        if irregular:
+            _overwrite_crossline_number(segy_path, 11, 999, num_samples=10)
+        with open(segy_path, 'rb') as fh:
+            scanned_reader = create_reader(fh)
+            fh.seek(0)
+            cached_reader = create_reader(fh)
+            assert type(cached_reader) == type(scanned_reader)
+            assert _catalogs(cached_reader) == _catalogs(scanned_reader)
+            assert list(cached_reader.inline_numbers()) == list(scanned_reader.inline_numbers())
+            assert list(cached_reader.xline_numbers()) == list(scanned_reader.xline_numbers())
+            assert cached_reader.textual_reel_header == scanned_reader.textual_reel_header
+            assert are_equal(cached_reader.binary_reel_header, scanned_reader.binary_reel_header)
+            for trace_index in scanned_reader.trace_indexes():
+                assert list(cached_reader.trace_samples(trace_index)) == dataset.trace_samples(trace_index)
+
+    def test_unreadable_cache_file_is_replaced(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            create_reader(fh)
+            cache_file = (tmpdir / '.segpy').listdir('*.idx')[0]
+            cache_file.write_binary(b'garbage')
+            fh.seek(0)
+            reader = create_reader(fh)
+            assert reader.num_traces() == 12
+            assert cache_file.read_binary().startswith(b'SEGPYIDX')
+
+
+class TestGrowingFile:
+
+    def _write_prefix(self, tmpdir, num_prefix_traces):
+        full_path = str(tmpdir / 'full.segy')
+        dataset = write_synthetic_segy(full_path, num_inlines=4, num_xlines=5, num_samples=10)
+        with open(full_path, 'rb') as fh:
+            data = fh.read()
+        trace_num_bytes = TRACE_HEADER_NUM_BYTES + 10 * 4
+        segy_path = str(tmpdir / 'growing.segy')
+        prefix_num_bytes = 3600 + num_prefix_traces * trace_num_bytes
+        with open(segy_path, 'wb') as fh:
+            fh.write(data[:prefix_num_bytes])
+        return segy_path, data[prefix_num_bytes:], dataset
+
+    def test_appended_traces_are_catalogued_without_full_scan(self, tmpdir, monkeypatch):
+        segy_path, remainder, dataset = self._write_prefix(tmpdir, 10)
+        with open(segy_path, 'rb') as fh:
+            assert create_reader(fh).num_traces() == 10
+
+        with open(segy_path, 'ab') as fh:
+            fh.write(remainder)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("Full scan of trace headers")
+
+        monkeypatch.setattr(segpy.reader, 'catalog_traces', fail)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh)
+            assert reader.num_traces() == 20
+            assert list(reader.inline_numbers()) == [100, 101, 102, 103]
+            assert list(reader.trace_samples(reader.trace_index((103, 204)))) == dataset.trace_samples(19)
+            fh.seek(0)
+            assert create_reader(fh).num_traces() == 20
+        monkeypatch.undo()
+
+        with open(segy_path, 'rb') as fh:
+            scanned_reader = create_reader(fh, cache_directory=None)
+        assert _catalogs(reader) == _catalogs(scanned_reader)
+        assert len((tmpdir / '.segpy').listdir('*.idx')) == 1
+
+    def test_modified_file_is_rescanned(self, tmpdir):
+        segy_path, remainder, _ = self._write_prefix(tmpdir, 10)
+        with open(segy_path, 'rb') as fh:
+            create_reader(fh)
+        _overwrite_crossline_number(segy_path, 0, 999, num_samples=10)
+        with open(segy_path, 'ab') as fh:
+            fh.write(remainder)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh)
+            fh.seek(0)
+            scanned_reader = create_reader(fh, cache_directory=None)
+        assert _catalogs(reader) == _catalogs(scanned_reader)
+
+
+def _pause_background_scan(monkeypatch, trace_index, resume):
+    """Make background scans wait for the resume event after scanning a trace header."""
+    real_catalog_traces = segpy.background.catalog_traces
+
+    def paused_catalog_traces(*args, observer, **kwargs):
+        def paused_observer(observed_trace_index, pos, num_samples):
+            observer(observed_trace_index, pos, num_samples)
+            if observed_trace_index == trace_index:
+                assert resume.wait(10)
+        return real_catalog_traces(*args, observer=paused_observer, **kwargs)
+
+    monkeypatch.setattr(segpy.background, 'catalog_traces', paused_catalog_traces)
+
+
+class TestBackgroundCatalog:
+
+    @pytest.mark.parametrize('num_inlines, num_xlines', [(3, 4), (1, 5), (1, 1), (13, 17)])
+    def test_catalogs_match_scan(self, tmpdir, num_inlines, num_xlines):
+        segy_path = str(tmpdir / 'test.segy')
+        dataset = write_synthetic_segy(segy_path, num_inlines=num_inlines, num_xlines=num_xlines)
+        with open(segy_path, 'rb') as fh:
+            scan_reader = create_reader(fh, cache_directory=None)
+            fh.seek(0)
+            background_reader = create_reader(fh, cache_directory=None, background=True)
+            assert isinstance(background_reader._trace_offset_catalog, BackgroundCatalog)
+            assert type(background_reader) == type(scan_reader)
+            assert _catalogs(background_reader) == _catalogs(scan_reader)
+            for trace_index in scan_reader.trace_indexes():
+                assert list(background_reader.trace_samples(trace_index)) == dataset.trace_samples(trace_index)
+
+    def test_traces_are_readable_before_scan_completes(self, tmpdir, monkeypatch):
+        segy_path = str(tmpdir / 'test.segy')
+        dataset = write_synthetic_segy(segy_path)
+        resume = threading.Event()
+        _pause_background_scan(monkeypatch, 2, resume)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None, background=True)
+            assert list(reader.trace_samples(2)) == dataset.trace_samples(2)
+            assert are_equal(reader.trace_header(1), dataset.trace_header(1))
+            assert not resume.is_set()
+            resume.set()
+            assert reader.num_traces() == 12
+            assert list(reader.inline_numbers()) == [100, 101, 102]
+
+    def test_out_of_range_trace_index_waits_for_scan(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None, background=True)
+            with pytest.raises(ValueError):
+                reader.trace_samples(12)
+
+    def test_scan_errors_are_raised_by_reader(self, tmpdir, monkeypatch):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+
+        def failing_catalog_traces(*args, **kwargs):
+            raise OSError("Scan failed")
+
+        monkeypatch.setattr(segpy.background, 'catalog_traces', failing_catalog_traces)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None, background=True, dimensionality=3)
+            with pytest.raises(OSError):
+                reader.num_traces()
+
+    def test_catalogs_are_cached_when_scan_completes(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            background_reader = create_reader(fh, background=True)
+            assert background_reader.num_traces() == 12
+            assert len((tmpdir / '.segpy').listdir('*.idx')) == 1
+            fh.seek(0)
+            cached_reader = create_reader(fh, background=True)
+            assert not isinstance(cached_reader._trace_offset_catalog, BackgroundCatalog)
+            assert _catalogs(cached_reader) == _catalogs(background_reader)
+
+    def test_unnamed_file_is_scanned_before_returning(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            data = fh.read()
+        reader = create_reader(io.BytesIO(data), cache_directory=None, background=True)
+        assert not isinstance(reader._trace_offset_catalog, BackgroundCatalog)
+        assert reader.num_traces() == 12
+
+    def test_pickled_reader_has_completed_catalogs(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None, background=True)
+            unpickled_reader = pickle.loads(pickle.dumps(reader))
+            assert not isinstance(unpickled_reader._line_catalog, BackgroundCatalog)
+            assert _catalogs(unpickled_reader) == _catalogs(reader)
+            unpickled_reader._fh.close()
+
+
+class CountingAccess:
+
+    def __init__(self, access):
+        self._access = access
+        self.num_reads = 0
+
+    def read(self, pos, num_bytes):
+        self.num_reads += 1
+        return self._access.read(pos, num_bytes)
+
+
+class TestManyTraces:
+
+    @pytest.mark.parametrize('seg_y_type', ['ibm', 'int16', 'float32'])
+    @pytest.mark.parametrize('trace_indexes', [[], [4], [11, 0, 5, 5, 6], list(range(12))])
+    @pytest.mark.parametrize('start, stop', [(None, None), (2, 7), (3, 3)])
+    @pytest.mark.parametrize('max_gap', [0, 10000])
+    def test_trace_samples_many_matches_trace_samples(self, tmpdir, seg_y_type, trace_indexes, start, stop,
+                                                      max_gap):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path, seg_y_type=seg_y_type)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None)
+            samples = reader.trace_samples_many(trace_indexes, start, stop, max_gap)
+            assert [list(s) for s in samples] == \
+                [list(reader.trace_samples(trace_index, start, stop)) for trace_index in trace_indexes]
+
+    def test_crossline_is_read_with_a_single_read(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        dataset = write_synthetic_segy(segy_path, num_inlines=20, num_xlines=30)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None)
+            reader._access = CountingAccess(reader._access)
+            trace_indexes = [reader.trace_index((inline, 205)) for inline in reader.inline_numbers()]
+            samples = reader.trace_samples_many(trace_indexes)
+            assert reader._access.num_reads == 1
+            assert [list(s) for s in samples] == [dataset.trace_samples(i) for i in trace_indexes]
+
+    def test_distant_traces_are_read_separately(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path, num_inlines=20, num_xlines=30)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None)
+            reader._access = CountingAccess(reader._access)
+            reader.trace_samples_many([0, 100, 200], max_gap=0)
+            assert reader._access.num_reads == 3
+
+    def test_trace_headers_many_matches_trace_header(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None)
+            trace_indexes = [7, 3, 3, 11, 0]
+            headers = reader.trace_headers_many(trace_indexes)
+            assert all(are_equal(header, reader.trace_header(trace_index))
+                       for header, trace_index in zip(headers, trace_indexes))
+
+    @pytest.mark.parametrize('max_gap', [0, 10000])
+    def test_trace_header_bytes_many_matches_packed_headers(self, tmpdir, max_gap):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None)
+            trace_indexes = [7, 3, 3, 11, 0]
+            header_bytes = reader.trace_header_bytes_many(trace_indexes, max_gap)
+            assert header_bytes == b''.join(reader._trace_header_packer.pack(reader.trace_header(trace_index))
+                                            for trace_index in trace_indexes)
+
+    @pytest.mark.parametrize('trace_index', [-1, 12])
+    def test_out_of_range_trace_index_raises_value_error(self, tmpdir, trace_index):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None)
+            with pytest.raises(ValueError):
+                reader.trace_samples_many([0, trace_index])
+            with pytest.raises(ValueError):
+                reader.trace_headers_many([0, trace_index])
+            with pytest.raises(ValueError):
+                reader.trace_header_bytes_many([0, trace_index])
+
+    def test_truncated_file_raises_eof_error(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None)
+            last_header_pos = reader._trace_offset_catalog[11]
+            with open(segy_path, 'r+b') as truncate_fh:
+                truncate_fh.truncate(last_header_pos + TRACE_HEADER_NUM_BYTES // 2)
+            with pytest.raises(EOFError):
+                reader.trace_header_bytes_many([0, 11])
+
+
+
+class TestTraceHeaderFields:
+
+    FIELDS = ['inline_number', 'crossline_number', 'num_samples']
+
+    def test_trace_header_decodes_only_requested_fields(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None)
+            header = reader.trace_header(5, fields=self.FIELDS)
+            full_header = reader.trace_header(5)
+            assert header.ordered_field_names() == tuple(self.FIELDS)
+            assert all(getattr(header, name) == getattr(full_header, name) for name in self.FIELDS)
+
+    def test_fields_may_be_named_fields(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None)
+            header = reader.trace_header(5, fields=[TraceHeaderRev1.inline_number, 'crossline_number'])
+            assert header.ordered_field_names() == ('inline_number', 'crossline_number')
+
+    def test_trace_headers_many_decodes_only_requested_fields(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None)
+            trace_indexes = [7, 3, 3, 11, 0]
+            headers = reader.trace_headers_many(trace_indexes, fields=self.FIELDS)
+            assert all(are_equal(header, reader.trace_header(trace_index, fields=self.FIELDS))
+                       for header, trace_index in zip(headers, trace_indexes))
+
+    def test_repeated_requests_share_header_format(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None)
+            assert type(reader.trace_header(0, fields=self.FIELDS)) is type(reader.trace_header(1, fields=self.FIELDS))
+
+    def test_unknown_field_raises_value_error(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None)
+            with pytest.raises(ValueError):
+                reader.trace_header(0, fields=['no_such_field'])
+            with pytest.raises(ValueError):
+                reader.trace_headers_many([0], fields=['no_such_field'])
+
+    def test_fields_and_header_packer_override_raises_value_error(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None)
+            with pytest.raises(ValueError):
+                reader.trace_header(0, reader._trace_header_packer, fields=self.FIELDS)
+
+
+class TestTraceHeaderColumns:
+
+    FIELDS = ['inline_number', 'crossline_number', 'num_samples']
+
+    def test_columns_match_trace_headers(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None)
+            columns = trace_header_columns(reader, self.FIELDS)
+            assert list(columns.keys()) == self.FIELDS
+            for field_name in self.FIELDS:
+                assert list(columns[field_name]) == [getattr(reader.trace_header(trace_index), field_name)
+                                                     for trace_index in reader.trace_indexes()]
+
+    def test_second_request_does_not_read_trace_headers(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh)
+            columns = trace_header_columns(reader, self.FIELDS)
+            reader._access = CountingAccess(reader._access)
+            stored_columns = trace_header_columns(reader, self.FIELDS)
+            assert reader._access.num_reads == 0
+            assert {name: list(column) for name, column in stored_columns.items()} == \
+                {name: list(column) for name, column in columns.items()}
+
+    def test_different_fields_are_stored_separately(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh)
+            num_entries = len((tmpdir / '.segpy').listdir('*.idx'))
+            trace_header_columns(reader, ['inline_number'])
+            trace_header_columns(reader, [TraceHeaderRev1.crossline_number])
+            assert len((tmpdir / '.segpy').listdir('*.idx')) == num_entries + 2
+            reader._access = CountingAccess(reader._access)
+            assert list(trace_header_columns(reader, ['crossline_number'])['crossline_number']) == \
+                [200, 201, 202, 203] * 3
+            assert reader._access.num_reads == 0
+
+    def test_modified_file_rebuilds_columns(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path, num_inlines=3, num_xlines=4, num_samples=10)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, strict_cache=True)
+            trace_header_columns(reader, self.FIELDS, strict_cache=True)
+        _overwrite_crossline_number(segy_path, 11, 999, num_samples=10)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, strict_cache=True)
+            columns = trace_header_columns(reader, self.FIELDS, strict_cache=True)
+            assert columns['crossline_number'][11] == 999
+
+    def test_unknown_field_raises_value_error(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None)
+            with pytest.raises(ValueError):
+                trace_header_columns(reader, ['no_such_field'])
+
+class TestConcurrentAccess:
+
+    @pytest.mark.parametrize('access_mode', [POSITIONAL_ACCESS, MEMORY_MAP_ACCESS])
+    def test_reader_can_be_shared_by_threads(self, tmpdir, access_mode):
+        segy_path = str(tmpdir / 'test.segy')
+        dataset = write_synthetic_segy(segy_path, num_inlines=10, num_xlines=20, num_samples=50)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None, access_mode=access_mode)
+            trace_indexes = list(reader.trace_indexes()) * 5
+
+            def read_trace(trace_index):
+                return list(reader.trace_samples(trace_index)), reader.trace_header(trace_index)
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(read_trace, trace_indexes))
+
+            for trace_index, (samples, header) in zip(trace_indexes, results):
+                assert samples == dataset.trace_samples(trace_index)
+                assert are_equal(header, dataset.trace_header(trace_index))
+
+
+class TestTraceCache:
+
+    def test_cached_traces_are_not_read_again(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        dataset = write_synthetic_segy(segy_path, seg_y_type='ibm')
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None, trace_cache_num_bytes=1024 * 1024)
+            reader._access = CountingAccess(reader._access)
+            for _ in range(3):
+                assert list(reader.trace_samples(4)) == dataset.trace_samples(4)
+                assert list(reader.trace_samples(4, 2, 5)) == dataset.trace_samples(4)[2:5]
+            assert reader._access.num_reads == 2
+            assert reader.trace_cache.hits == 4
+            assert reader.trace_cache.misses == 2
+
+    def test_whole_trace_range_shares_entry(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path, num_samples=10)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None, trace_cache_num_bytes=1024 * 1024)
+            reader.trace_samples(4)
+            reader.trace_samples(4, 0, 10)
+            assert reader.trace_cache.hits == 1
+
+    def test_trace_samples_many_reads_only_uncached_traces(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        dataset = write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None, trace_cache_num_bytes=1024 * 1024)
+            reader.trace_samples(3)
+            reader.trace_samples(7)
+            reader._access = CountingAccess(reader._access)
+            trace_indexes = [3, 7, 3, 2]
+            samples = reader.trace_samples_many(trace_indexes, max_gap=0)
+            assert [list(s) for s in samples] == [dataset.trace_samples(i) for i in trace_indexes]
+            assert reader._access.num_reads == 1
+            reader.trace_samples_many(trace_indexes)
+            assert reader._access.num_reads == 1
+
+    def test_eviction_within_byte_budget(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path, num_samples=10, seg_y_type='int32')
+        with open(segy_path, 'rb') as fh:
+            # Room for the samples of two traces of 10 32-bit samples each
+            reader = create_reader(fh, cache_directory=None, trace_cache_num_bytes=80)
+            for trace_index in range(5):
+                reader.trace_samples(trace_index)
+            assert len(reader.trace_cache) == 2
+            assert reader.trace_cache.evictions == 3
+
+    def test_caching_is_disabled_by_default(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None)
+            assert reader.trace_cache is None
+
+    def test_negative_trace_cache_num_bytes_raises_value_error(self, min_reader_data):
+        with pytest.raises(ValueError):
+            create_reader(min_reader_data, trace_cache_num_bytes=-1)
+
+
+class TestReadahead:
+
+    def test_sequential_traces_are_read_ahead(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        dataset = write_synthetic_segy(segy_path, num_inlines=10, num_xlines=10, seg_y_type='ibm')
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None, readahead_num_traces=8)
+            reader._access = CountingAccess(reader._access)
+            for trace_index in reader.trace_indexes():
+                assert list(reader.trace_samples(trace_index)) == dataset.trace_samples(trace_index)
+            threshold = segpy.readahead.SEQUENTIAL_THRESHOLD
+            assert reader._access.num_reads == threshold
+            assert reader.readahead.num_hits == 100 - threshold
+
+    def test_read_ahead_ibm_samples_have_same_type_as_direct_reads(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        dataset = write_synthetic_segy(segy_path, num_inlines=4, num_xlines=4, seg_y_type='ibm')
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None, readahead_num_traces=4)
+            samples = [reader.trace_samples(trace_index) for trace_index in reader.trace_indexes()]
+            assert reader.readahead.num_hits > 0
+        assert all(isinstance(s, LazyIBMSamples) for s in samples)
+        assert samples == [dataset.trace_samples(trace_index) for trace_index in dataset.trace_indexes()]
+
+    def test_non_sequential_request_stops_reading_ahead(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        dataset = write_synthetic_segy(segy_path, num_inlines=10, num_xlines=10)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None, readahead_num_traces=4)
+            trace_indexes = [0, 1, 2, 3, 4, 50, 51, 5, 6, 7, 8, 9, 2, 2, 99]
+            for trace_index in trace_indexes:
+                assert list(reader.trace_samples(trace_index)) == dataset.trace_samples(trace_index)
+            assert not reader.readahead.is_active
+
+    def test_partial_traces_are_read_ahead(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        dataset = write_synthetic_segy(segy_path, num_inlines=5, num_xlines=5, num_samples=10)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None, readahead_num_traces=4)
+            for trace_index in range(25):
+                assert list(reader.trace_samples(trace_index, 2, 6)) == dataset.trace_samples(trace_index)[2:6]
+            for trace_index in range(25):
+                assert list(reader.trace_samples(trace_index)) == dataset.trace_samples(trace_index)
+            assert reader.readahead.num_hits > 0
+
+    def test_unnamed_file_is_read_directly(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        dataset = write_synthetic_segy(segy_path)
+        with open(segy_path, 'rb') as fh:
+            data = fh.read()
+        reader = create_reader(io.BytesIO(data), cache_directory=None, readahead_num_traces=4)
+        for trace_index in reader.trace_indexes():
+            assert list(reader.trace_samples(trace_index)) == dataset.trace_samples(trace_index)
+        assert reader.readahead.num_hits == 0
+
+    def test_write_segy_from_reader_with_readahead(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        copy_path = str(tmpdir / 'copy.segy')
+        write_synthetic_segy(segy_path, num_inlines=6, num_xlines=7)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None, readahead_num_traces=16)
+            with open(copy_path, 'wb') as copy_fh:
+                # Samples are copied from a reader without being decoded, unless they are overridden
+                write_segy(copy_fh, DecodedSamplesDataset(reader))
+            assert reader.readahead.num_hits > 0
+        with open(segy_path, 'rb') as fh, open(copy_path, 'rb') as copy_fh:
+            assert fh.read() == copy_fh.read()
+
+    def test_read_ahead_traces_are_cached(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        dataset = write_synthetic_segy(segy_path, num_inlines=5, num_xlines=5)
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, cache_directory=None, readahead_num_traces=4,
+                                   trace_cache_num_bytes=1024 * 1024)
+            for trace_index in reader.trace_indexes():
+                reader.trace_samples(trace_index)
+            assert reader.readahead.num_hits > 0
+            assert len(reader.trace_cache) == 25
+            assert list(reader.trace_samples(10)) == dataset.trace_samples(10)
+            assert reader.trace_cache.hits == 1
+
+    def test_request_waiting_for_read_ahead_trace_does_not_block_other_requests(self, tmpdir, monkeypatch):
+        segy_path = str(tmpdir / 'test.segy')
+        dataset = write_synthetic_segy(segy_path, num_inlines=10, num_xlines=10)
+        release = threading.Event()
+
+        def run_until_released(stream, reader, fh, trace_index, block_num_bytes):
+            # The background thread reads no traces, and reports the end of the file once it is released
+            fh.close()
+            release.wait(10)
+            stream._queue.put(segpy.readahead._END)
+
+        monkeypatch.setattr(segpy.readahead._ReadaheadStream, '_run', run_until_released)
+        with open(segy_path, 'rb') as fh, ThreadPoolExecutor(max_workers=2) as executor:
+            reader = create_reader(fh, cache_directory=None, access_mode=POSITIONAL_ACCESS,
+                                   readahead_num_traces=4)
+            threshold = segpy.readahead.SEQUENTIAL_THRESHOLD
+            for trace_index in range(threshold):
+                reader.trace_samples(trace_index)
+            assert reader.readahead.is_active
+            waiting = executor.submit(reader.trace_samples, threshold)
+            other = executor.submit(reader.trace_samples, 50)
+            try:
+                assert list(other.result(timeout=5)) == dataset.trace_samples(50)
+                # The other request stopped reading ahead, so the waiting request is read directly
+                assert list(waiting.result(timeout=5)) == dataset.trace_samples(threshold)
+            finally:
+                release.set()
+            assert reader.readahead.num_hits == 0
+
+    def test_readahead_num_traces_must_be_positive(self, min_reader_data):
+        with pytest.raises(ValueError):
+            create_reader(min_reader_data, readahead_num_traces=0)
@@ -0,0 +1,198 @@
+import time
+
+import pytest
+from pytest import raises
+
+import segpy.toolkit  # noqa: F401 Registers the built-in codecs
+from segpy import sample_codecs
+from segpy.sample_codecs import (register_codec, registered_codecs, active_codec, active_codecs, use_codec,
+                                 configure_codecs, BENCHMARK_CODECS_ENV_VAR)
+
+
+@pytest.fixture(autouse=True)
+def restore_registry(monkeypatch):
+    monkeypatch.setattr(sample_codecs, '_codecs', {t: dict(c) for t, c in sample_codecs._codecs.items()})
+    monkeypatch.setattr(sample_codecs, '_active_codecs', dict(sample_codecs._active_codecs))
+    monkeypatch.setattr(sample_codecs, '_required_types', set(sample_codecs._required_types))
+    monkeypatch.setattr(sample_codecs, '_benchmark', False)
+
+
+def unpack_none(buf, num_items, endian):
+    return [None] * num_items
+
+
+def pack_none(values, endian):
+    return bytes(len(values))
+
+
+def slow_unpack(buf, num_items, endian):
+    time.sleep(0.01)
+    return [None] * num_items
+
+
+def failing_pack(values, endian):
+    raise RuntimeError("Broken codec")
+
+
+class TestRegisterCodec:
+
+    def test_registered_codecs_are_ordered_by_decreasing_priority(self):
+        register_codec('test', 'low', unpack_none, pack_none, priority=1)
+        register_codec('test', 'high', unpack_none, pack_none, priority=3)
+        register_codec('test', 'middle', unpack_none, pack_none, priority=2)
+        assert [codec.name for codec in registered_codecs('test')] == ['high', 'middle', 'low']
+
+    def test_registering_same_name_replaces_codec(self):
+        register_codec('test', 'a', unpack_none, pack_none)
+        register_codec('test', 'a', slow_unpack, pack_none)
+        codecs = registered_codecs('test')
+        assert len(codecs) == 1
+        assert codecs[0].unpack is slow_unpack
+
+    def test_no_registered_codecs_for_unknown_type(self):
+        assert registered_codecs('unknown') == []
+
+    def test_builtin_types_have_python_codecs(self):
+        for seg_y_type in ('ibm', 'int8', 'int16', 'int32', 'float32'):
+            assert 'python' in [codec.name for codec in registered_codecs(seg_y_type)]
+
+
+class TestActiveCodec:
+
+    def test_highest_priority_codec_is_active(self):
+        register_codec('test', 'low', unpack_none, pack_none, priority=1)
+        register_codec('test', 'high', unpack_none, pack_none, priority=2)
+        assert active_codec('test').name == 'high'
+
+    def test_registering_higher_priority_codec_changes_active_codec(self):
+        register_codec('test', 'low', unpack_none, pack_none, priority=1)
+        assert active_codec('test').name == 'low'
+        register_codec('test', 'high', unpack_none, pack_none, priority=2)
+        assert active_codec('test').name == 'high'
+
+    def test_unknown_type_raises_value_error(self):
+        with raises(ValueError):
+            active_codec('unknown')
+
+    def test_active_codecs_reports_names(self):
+        register_codec('test', 'a', unpack_none, pack_none)
+        codecs = active_codecs()
+        assert codecs['test'] == 'a'
+        assert codecs['int16'] == 'python'
+
+
+class TestUseCodec:
+
+    def test_required_codec_is_active(self):
+        register_codec('test', 'low', unpack_none, pack_none, priority=1)
+        register_codec('test', 'high', unpack_none, pack_none, priority=2)
+        use_codec('test', 'low')
+        assert active_codec('test').name == 'low'
+
+    def test_required_codec_is_not_replaced_by_registration(self):
+        register_codec('test', 'low', unpack_none, pack_none, priority=1)
+        use_codec('test', 'low')
+        register_codec('test', 'high', unpack_none, pack_none, priority=2)
+        assert active_codec('test').name == 'low'
+
+    def test_none_restores_automatic_choice(self):
+        register_codec('test', 'low', unpack_none, pack_none, priority=1)
+        register_codec('test', 'high', unpack_none, pack_none, priority=2)
+        use_codec('test', 'low')
+        assert use_codec('test', None) is None
+        assert active_codec('test').name == 'high'
+
+    def test_unknown_codec_raises_value_error(self):
+        register_codec('test', 'a', unpack_none, pack_none)
+        with raises(ValueError):
+            use_codec('test', 'b')
+
+    def test_unknown_type_raises_value_error(self):
+        with raises(ValueError):
+            use_codec('unknown', 'python')
+
+    def test_required_codec_is_used_by_toolkit(self):
+        calls = []
+
+        def unpack_recording(buf, num_items, endian):
+            calls.append((bytes(buf), num_items, endian))
+            return [7] * num_items
+
+        register_codec('int16', 'recording', unpack_recording, pack_none)
+        use_codec('int16', 'recording')
+        values = segpy.toolkit.unpack_binary_values(b'\x00\x01\x00\x02', 'int16', 2, '<')
+        assert list(values) == [7, 7]
+        assert calls == [(b'\x00\x01\x00\x02', 2, '<')]
+
+
+@pytest.fixture
+def numpy():
+    return pytest.importorskip('numpy')
+
+
+class TestNumpyCodecs:
+
+    SEG_Y_TYPES = ['int8', 'int16', 'int32', 'float32']
+
+    @pytest.mark.parametrize('seg_y_type', SEG_Y_TYPES)
+    def test_numpy_codecs_are_registered_below_python(self, numpy, seg_y_type):
+        assert [codec.name for codec in registered_codecs(seg_y_type)] == ['python', 'numpy']
+        assert active_codec(seg_y_type).name == 'python'
+
+    @pytest.mark.parametrize('seg_y_type', SEG_Y_TYPES)
+    @pytest.mark.parametrize('endian', ['>', '<'])
+    def test_numpy_codecs_match_python_codecs(self, numpy, seg_y_type, endian):
+        values = [-100, 0, 1, 2, 127]
+        python_codec, numpy_codec = registered_codecs(seg_y_type)
+        encoded = python_codec.pack(values, endian)
+        assert numpy_codec.pack(values, endian) == encoded
+        assert numpy_codec.pack(numpy.array(values), endian) == encoded
+        assert list(numpy_codec.unpack(encoded, len(values), endian)) == values
+
+    def test_numpy_codec_rejects_values_out_of_range(self, numpy):
+        use_codec('int8', 'numpy')
+        with raises(OverflowError):
+            active_codec('int8').pack([128], '>')
+
+    def test_numpy_codec_is_used_by_toolkit(self, numpy):
+        use_codec('int16', 'numpy')
+        values = segpy.toolkit.unpack_binary_values(b'\x00\x01\xff\xfe', 'int16', 2, '>')
+        assert list(values) == [1, -2]
+        assert active_codec('int16').pack([1, -2], '>') == b'\x00\x01\xff\xfe'
+
+
+class TestBenchmarkCodecs:
+
+    def test_fastest_codec_is_chosen_when_benchmarking(self):
+        register_codec('test', 'slow', slow_unpack, pack_none, priority=2)
+        register_codec('test', 'fast', unpack_none, pack_none, priority=1)
+        configure_codecs(benchmark=True)
+        assert active_codec('test').name == 'fast'
+
+    def test_failing_codec_is_not_chosen_when_benchmarking(self):
+        register_codec('test', 'broken', unpack_none, failing_pack, priority=2)
+        register_codec('test', 'slow', slow_unpack, pack_none, priority=1)
+        configure_codecs(benchmark=True)
+        assert active_codec('test').name == 'slow'
+
+    def test_configuring_reselects_codecs(self):
+        register_codec('test', 'slow', slow_unpack, pack_none, priority=2)
+        register_codec('test', 'fast', unpack_none, pack_none, priority=1)
+        assert active_codec('test').name == 'slow'
+        configure_codecs(benchmark=True)
+        assert active_codec('test').name == 'fast'
+
+    def test_required_codec_is_not_benchmarked(self):
+        register_codec('test', 'slow', slow_unpack, pack_none, priority=2)
+        register_codec('test', 'fast', unpack_none, pack_none, priority=1)
+        use_codec('test', 'slow')
+        configure_codecs(benchmark=True)
+        assert active_codec('test').name == 'slow'
+
+    @pytest.mark.parametrize('value, expected', [('1', 'fast'), ('0', 'slow'), ('', 'slow')])
+    def test_environment_variable_enables_benchmarking(self, monkeypatch, value, expected):
+        monkeypatch.setattr(sample_codecs, '_benchmark', None)
+        monkeypatch.setenv(BENCHMARK_CODECS_ENV_VAR, value)
+        register_codec('test', 'slow', slow_unpack, pack_none, priority=2)
+        register_codec('test', 'fast', unpack_none, pack_none, priority=1)
+        assert active_codec('test').name == expected
@@ -1,8 +1,17 @@
+from array import array
+from io import BytesIO
+from itertools import count
+import struct
+
 from hypothesis import given
 import hypothesis.strategies as st
 import pytest
+from segpy.catalog import CatalogBuilder
+from segpy.datatypes import SEG_Y_TYPE_TO_CTYPE
 from segpy.ibm_float import EPSILON_IBM_FLOAT, ieee2ibm
+from segpy.packer import make_header_packer
 import segpy.toolkit as toolkit
+from segpy.trace_header import TraceHeaderRev1
 from segpy.util import almost_equal
 from unittest.mock import patch
 
@@ -60,8 +69,18 @@ class TestPackImplementationSelection:
             toolkit.pack_ibm_floats(data)
             assert mock.called
 
-    @pytest.mark.skipif(toolkit.pack_ibm_floats_cpp is not None,
-                        reason="C++ IBM float is installed")
+    @pytest.mark.skipif(toolkit.pack_ibm_floats_cpp is not None or toolkit.pack_ibm_floats_numpy is None,
+                        reason="C++ IBM float is installed or Numpy is not installed")
+    @given(st.data())
+    def test_numpy_pack_used_when_cpp_unavailable(self, data):
+        data = data.draw(byte_arrays_of_floats())
+        with patch('segpy.toolkit.pack_ibm_floats_numpy') as mock,\
+             test.util.force_python_ibm_float(False):
+            toolkit.pack_ibm_floats(data)
+            assert mock.called
+
+    @pytest.mark.skipif(toolkit.pack_ibm_floats_cpp is not None or toolkit.pack_ibm_floats_numpy is not None,
+                        reason="C++ IBM float or Numpy is installed")
     @given(st.data())
     def test_python_pack_used_as_fallback(self, data):
         data = data.draw(byte_arrays_of_floats())
@@ -104,8 +123,18 @@ class TestUnpackImplementationSelection:
             toolkit.unpack_ibm_floats(*data)
             assert mock.called
 
-    @pytest.mark.skipif(toolkit.unpack_ibm_floats_cpp is not None,
-                        reason="C++ IBM float is installed")
+    @pytest.mark.skipif(toolkit.unpack_ibm_floats_cpp is not None or toolkit.unpack_ibm_floats_numpy is None,
+                        reason="C++ IBM float is installed or Numpy is not installed")
+    @given(st.data())
+    def test_numpy_unpack_used_when_cpp_unavailable(self, data):
+        data = data.draw(byte_arrays_of_floats())
+        with patch('segpy.toolkit.unpack_ibm_floats_numpy') as mock,\
+             test.util.force_python_ibm_float(False):
+            toolkit.unpack_ibm_floats(*data)
+            assert mock.called
+
+    @pytest.mark.skipif(toolkit.unpack_ibm_floats_cpp is not None or toolkit.unpack_ibm_floats_numpy is not None,
+                        reason="C++ IBM float or Numpy is installed")
     @given(st.data())
     def test_python_unpack_used_as_fallback(self, data):
         data = data.draw(byte_arrays_of_floats())
@@ -113,3 +142,247 @@ class TestUnpackImplementationSelection:
              test.util.force_python_ibm_float(False):
             toolkit.unpack_ibm_floats(*data)
             assert mock.called
+
+
+def _catalog_traces_per_header(fh, bps, trace_header_format=TraceHeaderRev1, endian='>'):
+    """A reference implementation of catalog_traces which reads each header individually."""
+    packer = make_header_packer(trace_header_format, endian)
+    builders = [CatalogBuilder() for _ in range(5)]
+    pos = fh.tell()
+    for trace_number in count():
+        fh.seek(pos)
+        data = fh.read(toolkit.TRACE_HEADER_NUM_BYTES)
+        if len(data) < toolkit.TRACE_HEADER_NUM_BYTES:
+            break
+        header = packer.unpack(data)
+        builders[0].add(trace_number, pos)
+        builders[1].add(trace_number, header.num_samples)
+        builders[2].add(header.ensemble_num, trace_number)
+        builders[3].add((header.inline_number, header.crossline_number), trace_number)
+        builders[4].add((header.file_sequence_num, header.ensemble_num), trace_number)
+        pos += toolkit.TRACE_HEADER_NUM_BYTES + header.num_samples * bps
+    offsets, lengths, cdps, lines, alt_lines = (builder.create() for builder in builders)
+    return offsets, lengths, cdps, lines if lines is not None else alt_lines
+
+
+@st.composite
+def trace_chains(draw):
+    """A strategy for byte strings containing a series of traces of varying length."""
+    num_samples = draw(st.lists(st.integers(min_value=0, max_value=50), min_size=1, max_size=30))
+    inline_numbers = draw(st.lists(st.integers(min_value=1, max_value=3),
+                                   min_size=len(num_samples), max_size=len(num_samples)))
+    endian = draw(st.sampled_from(['<', '>']))
+    trailing = draw(st.binary(max_size=toolkit.TRACE_HEADER_NUM_BYTES - 1))
+    packer = make_header_packer(TraceHeaderRev1, endian)
+    with BytesIO() as fh:
+        for trace_index, (n, inline_number) in enumerate(zip(num_samples, inline_numbers)):
+            header = TraceHeaderRev1(num_samples=n,
+                                     ensemble_num=trace_index + 10,
+                                     file_sequence_num=trace_index,
+                                     inline_number=inline_number,
+                                     crossline_number=trace_index)
+            toolkit.write_trace_header(fh, header, packer)
+            toolkit.write_trace_samples(fh, [trace_index] * n, 'int32', endian=endian)
+        fh.write(trailing)
+        return fh.getvalue(), endian
+
+
+class TestCatalogTraces:
+
+    @given(trace_chains(), st.integers(min_value=1, max_value=4096))
+    def test_block_scan_matches_per_header_scan(self, chain, block_size):
+        data, endian = chain
+        with BytesIO(data) as fh:
+            expected = _catalog_traces_per_header(fh, 4, endian=endian)
+            fh.seek(0)
+            actual = toolkit.catalog_traces(fh, 4, endian=endian, block_size=block_size)
+        for expected_catalog, actual_catalog in zip(expected, actual):
+            if expected_catalog is None:
+                assert actual_catalog is None
+            else:
+                assert dict(actual_catalog) == dict(expected_catalog)
+                assert type(actual_catalog) == type(expected_catalog)
+
+    @given(trace_chains())
+    def test_progress_reaches_one(self, chain):
+        data, endian = chain
+        progress = []
+        with BytesIO(data) as fh:
+            toolkit.catalog_traces(fh, 4, endian=endian, progress=progress.append)
+        assert progress[-1] == 1
+
+
+class TestCatalogFixedLengthTraces:
+
+    @given(st.integers(min_value=1, max_value=5),
+           st.integers(min_value=1, max_value=5),
+           st.booleans())
+    def test_matches_full_scan(self, num_inlines, num_xlines, xline_quickest):
+        num_traces = num_inlines * num_xlines
+        packer = make_header_packer(TraceHeaderRev1)
+        with BytesIO() as fh:
+            for trace_index in range(num_traces):
+                if xline_quickest:
+                    i, j = divmod(trace_index, num_xlines)
+                else:
+                    j, i = divmod(trace_index, num_inlines)
+                header = TraceHeaderRev1(file_sequence_num=trace_index + 1,
+                                         ensemble_num=2 * trace_index + 10,
+                                         num_samples=3,
+                                         inline_number=i + 1,
+                                         crossline_number=j + 1)
+                toolkit.write_trace_header(fh, header, packer)
+                toolkit.write_trace_samples(fh, [trace_index] * 3, 'int32')
+            fh.seek(0)
+            expected = toolkit.catalog_traces(fh, 4)
+            fh.seek(0)
+            actual = toolkit.catalog_fixed_length_traces(fh, 4, 3)
+        for expected_catalog, actual_catalog in zip(expected, actual):
+            if expected_catalog is None:
+                assert actual_catalog is None
+            else:
+                assert dict(actual_catalog) == dict(expected_catalog)
+
+    @given(trace_chains())
+    def test_returns_none_or_matches_full_scan(self, chain):
+        data, endian = chain
+        with BytesIO(data) as fh:
+            expected = toolkit.catalog_traces(fh, 4, endian=endian)
+            fh.seek(0)
+            header = make_header_packer(TraceHeaderRev1, endian).unpack(fh.read(toolkit.TRACE_HEADER_NUM_BYTES))
+            fh.seek(0)
+            actual = toolkit.catalog_fixed_length_traces(fh, 4, header.num_samples, endian=endian)
+        if actual is not None:
+            assert dict(actual[0]) == dict(expected[0])
+            assert dict(actual[1]) == dict(expected[1])
+
+
+def _assert_catalogs_equal(actual, expected):
+    for expected_catalog, actual_catalog in zip(expected, actual):
+        if expected_catalog is None:
+            assert actual_catalog is None
+        else:
+            assert dict(actual_catalog) == dict(expected_catalog)
+            assert type(actual_catalog) == type(expected_catalog)
+
+
+class TestExtendCatalogs:
+
+    @given(trace_chains(), st.data())
+    def test_extended_catalogs_match_full_scan(self, chain, data):
+        chain_data, endian = chain
+        with BytesIO(chain_data) as fh:
+            expected = toolkit.catalog_traces(fh, 4, endian=endian)
+        trace_offsets = list(expected[0].values())
+        num_prefix_traces = data.draw(st.integers(min_value=1, max_value=len(trace_offsets)))
+        prefix_num_bytes = (trace_offsets[num_prefix_traces - 1] + toolkit.TRACE_HEADER_NUM_BYTES
+                            + expected[1][num_prefix_traces - 1] * 4)
+        with BytesIO(chain_data[:prefix_num_bytes]) as fh:
+            prefix_catalogs = toolkit.catalog_traces(fh, 4, endian=endian)
+        with BytesIO(chain_data) as fh:
+            actual = toolkit.extend_catalogs(fh, 4, prefix_catalogs, endian=endian)
+        if actual is not None:
+            _assert_catalogs_equal(actual, expected)
+
+    def test_alternative_line_keys_are_extended(self):
+        packer = make_header_packer(TraceHeaderRev1)
+        with BytesIO() as fh:
+            for trace_index in range(6):
+                # Inline and crossline numbers are duplicated, so the line catalog uses the
+                # file sequence and ensemble numbers
+                header = TraceHeaderRev1(num_samples=2,
+                                         file_sequence_num=1 + trace_index // 3,
+                                         ensemble_num=1 + trace_index % 3)
+                toolkit.write_trace_header(fh, header, packer)
+                toolkit.write_trace_samples(fh, [trace_index] * 2, 'int32')
+            data = fh.getvalue()
+        prefix_num_bytes = 3 * (toolkit.TRACE_HEADER_NUM_BYTES + 2 * 4)
+        with BytesIO(data[:prefix_num_bytes]) as fh:
+            prefix_catalogs = toolkit.catalog_traces(fh, 4)
+        with BytesIO(data) as fh:
+            expected = toolkit.catalog_traces(fh, 4)
+            actual = toolkit.extend_catalogs(fh, 4, prefix_catalogs)
+        assert dict(expected[3]) == {(i, j): (i - 1) * 3 + j - 1 for i in (1, 2) for j in (1, 2, 3)}
+        _assert_catalogs_equal(actual, expected)
+
+
+NON_IBM_SEG_Y_TYPES = ['int32', 'nnint32', 'int16', 'nnint16', 'int8', 'nnint8', 'float32']
+
+
+class TestPackValues:
+
+    @given(st.sampled_from(NON_IBM_SEG_Y_TYPES), st.sampled_from(['<', '>']), st.data())
+    def test_buffers_pack_as_struct(self, seg_y_type, endian, data):
+        ctype = SEG_Y_TYPE_TO_CTYPE[seg_y_type]
+        values = data.draw(st.lists(_ctype_values(ctype)))
+        expected = struct.pack('{}{}{}'.format(endian, len(values), ctype), *values)
+        assert toolkit.pack_values(values, ctype, endian) == expected
+        assert toolkit.pack_values(array(ctype, values), ctype, endian) == expected
+        assert toolkit.pack_values(memoryview(array(ctype, values)), ctype, endian) == expected
+        assert toolkit.pack_values(iter(values), ctype, endian) == expected
+
+    def test_non_contiguous_buffer(self):
+        values = memoryview(array('i', [1, 2, 3, 4]))[::2]
+        assert toolkit.pack_values(values, 'i', '>') == struct.pack('>2i', 1, 3)
+
+    def test_buffer_with_different_type_is_converted(self):
+        assert toolkit.pack_values(array('d', [1.5, -2.0]), 'f', '<') == struct.pack('<2f', 1.5, -2.0)
+
+    def test_value_out_of_range_raises(self):
+        with pytest.raises(struct.error):
+            toolkit.pack_values([70000], 'h')
+
+
+@pytest.fixture
+def numpy():
+    return pytest.importorskip('numpy')
+
+
+class TestPackValuesNumpy:
+
+    @pytest.mark.parametrize('seg_y_type, dtype', [(seg_y_type, dtype)
+                                                   for seg_y_type in NON_IBM_SEG_Y_TYPES
+                                                   for dtype in ['i8', '>i2', 'u1', 'f8', '<f4']
+                                                   if seg_y_type == 'float32' or 'f' not in dtype])
+    @pytest.mark.parametrize('endian', ['<', '>'])
+    def test_arrays_pack_as_struct(self, numpy, seg_y_type, dtype, endian):
+        ctype = SEG_Y_TYPE_TO_CTYPE[seg_y_type]
+        values = [0, 1, 7, 100]
+        expected = struct.pack('{}{}{}'.format(endian, len(values), ctype), *values)
+        assert toolkit.pack_values(numpy.array(values, dtype=dtype), ctype, endian) == expected
+
+    def test_multidimensional_array_is_packed_in_row_major_order(self, numpy):
+        values = numpy.arange(6, dtype='i4').reshape(2, 3).T
+        assert toolkit.pack_values(values, 'i', '>') == struct.pack('>6i', 0, 3, 1, 4, 2, 5)
+
+    def test_integer_out_of_range_raises_overflow_error(self, numpy):
+        with pytest.raises(OverflowError):
+            toolkit.pack_values(numpy.array([-1]), 'H')
+
+    def test_float_out_of_range_raises_overflow_error(self, numpy):
+        with pytest.raises(OverflowError):
+            toolkit.pack_values(numpy.array([1.0, 1e300]), 'f')
+
+    def test_infinity_is_packed(self, numpy):
+        assert toolkit.pack_values(numpy.array([float('inf')]), 'f', '>') == struct.pack('>f', float('inf'))
+
+    def test_floats_as_integers_raise_type_error(self, numpy):
+        with pytest.raises(TypeError):
+            toolkit.pack_values(numpy.array([1.5]), 'i')
+
+    @pytest.mark.parametrize('seg_y_type', ['int16', 'float32', 'ibm'])
+    def test_write_trace_samples(self, numpy, seg_y_type):
+        values = [1, -2, 3]
+        with BytesIO() as fh:
+            toolkit.write_trace_samples(fh, numpy.array(values, dtype='i2'), seg_y_type)
+            data = fh.getvalue()
+        assert list(toolkit.unpack_binary_values(data, seg_y_type, 3)) == values
+
+
+def _ctype_values(ctype):
+    if ctype == 'f':
+        return st.floats(width=32)
+    num_bits = 8 * struct.calcsize(ctype)
+    if ctype.isupper():
+        return st.integers(min_value=0, max_value=2 ** num_bits - 1)
+    return st.integers(min_value=-2 ** (num_bits - 1), max_value=2 ** (num_bits - 1) - 1)
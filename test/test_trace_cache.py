@@ -0,0 +1,109 @@
+import pickle
+from array import array
+
+from hypothesis import given
+import hypothesis.strategies as ST
+import pytest
+
+from segpy.trace_cache import TraceCache, samples_num_bytes
+
+
+def samples(num_samples):
+    return array('f', range(num_samples))
+
+
+class TestTraceCache:
+
+    def test_negative_max_num_bytes_raises_value_error(self):
+        with pytest.raises(ValueError):
+            TraceCache(-1)
+
+    def test_get_missing_entry_counts_miss(self):
+        cache = TraceCache(1000)
+        assert cache.get('a') is None
+        assert cache.misses == 1
+        assert cache.hits == 0
+
+    def test_get_present_entry_counts_hit(self):
+        cache = TraceCache(1000)
+        a = samples(10)
+        cache.put('a', a)
+        assert cache.get('a') is a
+        assert cache.hits == 1
+        assert cache.misses == 0
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TraceCache(100)
+        cache.put('a', samples(10))
+        cache.put('b', samples(10))
+        cache.get('a')
+        cache.put('c', samples(10))
+        assert 'a' in cache
+        assert 'b' not in cache
+        assert 'c' in cache
+        assert cache.evictions == 1
+        assert cache.num_bytes == 80
+
+    def test_entry_larger_than_cache_is_not_added(self):
+        cache = TraceCache(100)
+        cache.put('a', samples(10))
+        cache.put('b', samples(100))
+        assert 'a' in cache
+        assert 'b' not in cache
+        assert cache.evictions == 0
+
+    def test_replacing_entry_updates_size(self):
+        cache = TraceCache(100)
+        cache.put('a', samples(10))
+        cache.put('a', samples(5))
+        assert len(cache) == 1
+        assert cache.num_bytes == 20
+
+    def test_clear(self):
+        cache = TraceCache(100)
+        cache.put('a', samples(10))
+        cache.get('a')
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.num_bytes == 0
+        assert cache.hits == 1
+
+    def test_statistics(self):
+        cache = TraceCache(100)
+        cache.put('a', samples(10))
+        cache.get('a')
+        cache.get('b')
+        statistics = cache.statistics()
+        assert statistics.hits == 1
+        assert statistics.misses == 1
+        assert statistics.evictions == 0
+        assert statistics.num_entries == 1
+        assert statistics.num_bytes == 40
+        assert statistics.max_num_bytes == 100
+
+    def test_pickled_cache_is_empty(self):
+        cache = TraceCache(100)
+        cache.put('a', memoryview(bytearray(10)))
+        unpickled_cache = pickle.loads(pickle.dumps(cache))
+        assert unpickled_cache.max_num_bytes == 100
+        assert len(unpickled_cache) == 0
+
+    @given(ST.lists(ST.tuples(ST.integers(0, 20), ST.integers(0, 30))), ST.integers(0, 200))
+    def test_size_never_exceeds_limit(self, puts, max_num_bytes):
+        cache = TraceCache(max_num_bytes)
+        for key, num_samples in puts:
+            cache.put(key, samples(num_samples))
+            assert cache.num_bytes <= max_num_bytes
+            assert cache.num_bytes == sum(samples_num_bytes(cache.get(k)) for k in range(21) if k in cache)
+
+
+class TestSamplesNumBytes:
+
+    def test_memoryview(self):
+        assert samples_num_bytes(memoryview(bytearray(12)).cast('f')) == 12
+
+    def test_array(self):
+        assert samples_num_bytes(array('h', range(10))) == 20
+
+    def test_list_is_larger_than_values(self):
+        assert samples_num_bytes([1.0] * 10) > 80
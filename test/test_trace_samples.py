@@ -0,0 +1,162 @@
+import pickle
+from array import array
+
+import pytest
+from hypothesis import given
+from hypothesis.strategies import integers, lists, floats, slices, data
+from pytest import raises
+
+from segpy.ibm_float import ieee2ibm, ibm2ieee, MIN_IBM_FLOAT, MAX_IBM_FLOAT
+from segpy.trace_cache import samples_num_bytes
+from segpy.trace_samples import LazyIBMSamples, unpack_trace_samples
+from segpy import toolkit
+from segpy.sample_codecs import registered_codecs, use_codec
+
+ibm_compatible_floats = floats(min_value=MIN_IBM_FLOAT, max_value=MAX_IBM_FLOAT).map(
+    lambda f: ibm2ieee(ieee2ibm(f)) if abs(f) >= 1e-75 or f == 0 else 0.0)
+
+
+def encode(values):
+    return b''.join(ieee2ibm(value) for value in values)
+
+
+class TestLazyIBMSamples:
+
+    @given(lists(ibm_compatible_floats))
+    def test_iteration_decodes_all_samples(self, values):
+        samples = LazyIBMSamples(encode(values), len(values))
+        assert len(samples) == len(values)
+        assert list(samples) == values
+
+    @given(data())
+    def test_indexing_decodes_sample(self, d):
+        values = d.draw(lists(ibm_compatible_floats, min_size=1))
+        index = d.draw(integers(min_value=-len(values), max_value=len(values) - 1))
+        samples = LazyIBMSamples(encode(values), len(values))
+        assert samples[index] == values[index]
+
+    @given(data())
+    def test_slicing_decodes_slice(self, d):
+        values = d.draw(lists(ibm_compatible_floats))
+        s = d.draw(slices(len(values) + 1))
+        samples = LazyIBMSamples(encode(values), len(values))
+        assert list(samples[s]) == values[s]
+
+    @given(data())
+    def test_indexing_after_iteration(self, d):
+        values = d.draw(lists(ibm_compatible_floats, min_size=1))
+        index = d.draw(integers(min_value=-len(values), max_value=len(values) - 1))
+        samples = LazyIBMSamples(encode(values), len(values))
+        samples.tolist()
+        assert samples[index] == values[index]
+        assert list(samples[1:]) == values[1:]
+
+    @pytest.mark.parametrize('index', [3, -4, 100])
+    def test_index_out_of_range_raises_index_error(self, index):
+        samples = LazyIBMSamples(encode([1.0, 2.0, 3.0]), 3)
+        with raises(IndexError):
+            samples[index]
+
+    def test_indexing_decodes_only_indexed_sample(self, monkeypatch):
+        def fail(data, num_items):
+            raise AssertionError("All samples decoded")
+
+        samples = LazyIBMSamples(encode([1.0, 2.0, 3.0]), 3)
+        monkeypatch.setattr(toolkit, 'force_python_ibm_floats', True)
+        monkeypatch.setattr(toolkit, 'unpack_ibm_floats_py', fail)
+        assert samples[1] == 2.0
+
+    def test_only_num_items_are_retained(self):
+        samples = LazyIBMSamples(encode([1.0, 2.0, 3.0]), 2)
+        assert list(samples) == [1.0, 2.0]
+
+    def test_too_few_bytes_raises_eof_error(self):
+        with raises(EOFError):
+            LazyIBMSamples(encode([1.0, 2.0]), 3)
+
+    def test_data_is_copied_from_memoryview(self):
+        buf = bytearray(encode([1.0, 2.0]))
+        samples = LazyIBMSamples(memoryview(buf), 2)
+        buf[:] = encode([3.0, 4.0])
+        assert list(samples) == [1.0, 2.0]
+
+    def test_equal_samples_are_equal(self):
+        assert LazyIBMSamples(encode([1.0, 2.0]), 2) == LazyIBMSamples(encode([1.0, 2.0]), 2)
+        assert LazyIBMSamples(encode([1.0, 2.0]), 2) != LazyIBMSamples(encode([1.0, 3.0]), 2)
+
+    def test_reversed(self):
+        assert list(reversed(LazyIBMSamples(encode([1.0, 2.0, 3.0]), 3))) == [3.0, 2.0, 1.0]
+
+    def test_pickle_round_trip(self):
+        samples = LazyIBMSamples(encode([1.0, 2.0]), 2)
+        assert list(pickle.loads(pickle.dumps(samples))) == [1.0, 2.0]
+
+    def test_num_bytes_includes_decoded_values(self):
+        assert samples_num_bytes(LazyIBMSamples(encode([1.0, 2.0]), 2)) == 24
+
+    def test_numpy_array_conversion(self):
+        numpy = pytest.importorskip('numpy')
+        array = numpy.asarray(LazyIBMSamples(encode([1.0, -2.5, 0.0]), 3))
+        assert array.dtype == numpy.float64
+        assert array.tolist() == [1.0, -2.5, 0.0]
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def ibm_codec(request):
+    if request.param not in [codec.name for codec in registered_codecs('ibm')]:
+        pytest.skip("{} IBM float codec is not available".format(request.param))
+    use_codec('ibm', request.param)
+    yield request.param
+    use_codec('ibm', None)
+
+
+class TestLazyIBMSamplesCodecIndependence:
+
+    def test_equal_to_list(self, ibm_codec):
+        samples = LazyIBMSamples(encode([1.0, 2.0, 3.5]), 3)
+        assert samples == [1.0, 2.0, 3.5]
+        assert samples != [1.0, 2.0, 3.0]
+        assert samples != [1.0, 2.0]
+
+    def test_equal_to_tuple_and_array(self, ibm_codec):
+        samples = LazyIBMSamples(encode([1.0, 2.0, 3.5]), 3)
+        assert samples == (1.0, 2.0, 3.5)
+        assert samples == array('f', [1.0, 2.0, 3.5])
+
+    def test_not_equal_to_non_sequence(self, ibm_codec):
+        assert LazyIBMSamples(encode([1.0]), 1) != 1.0
+
+    @pytest.mark.parametrize('index', [slice(1, 3), slice(None, None, 2), slice(None, None, -1)])
+    def test_slices_are_float_arrays(self, ibm_codec, index):
+        values = [1.0, 2.0, 3.5, -4.0]
+        samples = LazyIBMSamples(encode(values), 4)
+        for _ in range(2):
+            # Once before and once after all the samples are decoded
+            sliced = samples[index]
+            assert type(sliced) is array and sliced.typecode == 'd'
+            assert sliced.tolist() == values[index]
+            samples.decode()
+
+    def test_items_are_floats(self, ibm_codec):
+        samples = LazyIBMSamples(encode([1.0, 2.0]), 2)
+        assert type(samples[1]) is float
+        samples.decode()
+        assert type(samples[1]) is float
+        assert all(type(sample) is float for sample in samples)
+        assert all(type(sample) is float for sample in samples.tolist())
+
+
+class TestUnpackTraceSamples:
+
+    def test_ibm_samples_are_lazy(self):
+        assert isinstance(unpack_trace_samples(encode([1.0, 2.0]), 'ibm', 2), LazyIBMSamples)
+
+    def test_other_samples_are_decoded(self):
+        samples = unpack_trace_samples(b'\x00\x01\x00\x02', 'int16', 2, '>')
+        assert not isinstance(samples, LazyIBMSamples)
+        assert list(samples) == [1, 2]
+
+    @pytest.mark.parametrize('seg_y_type', ['ibm', 'int16'])
+    def test_too_few_bytes_raises_eof_error(self, seg_y_type):
+        with raises(EOFError):
+            unpack_trace_samples(b'\x00\x01', seg_y_type, 2)
@@ -1,9 +1,12 @@
+from io import BytesIO
+
 from hypothesis import given, assume, example
 from hypothesis.strategies import integers, lists, booleans, tuples, dictionaries, text
 from pytest import raises
 
 from segpy.util import batched, complementary_intervals, flatten, intervals_are_contiguous, roundrobin, reversed_range, \
-    make_sorted_distinct_sequence, SortSense, sgn, is_sorted, measure_stride, true, last, first, minmax
+    make_sorted_distinct_sequence, SortSense, sgn, is_sorted, measure_stride, true, last, first, minmax, \
+    fingerprint_for_file, hash_for_file, pairwise
 from test.strategies import spaced_ranges, ranges, sequences
 
 
@@ -49,6 +52,16 @@ class TestBatched:
         assert batches[-1] == [0, 0, 42]
 
 
+class TestPairwise:
+
+    @given(lists(integers()))
+    def test_pairs_are_adjacent_items(self, items):
+        assert list(pairwise(items)) == list(zip(items, items[1:]))
+
+    def test_empty_series_has_no_pairs(self):
+        assert list(pairwise([])) == []
+
+
 class TestComplementaryIntervals:
 
     @given(spaced_ranges(min_num_ranges=1, max_num_ranges=10,
@@ -323,3 +336,49 @@ class TestMinMax:
         a, b = minmax(s)
         assert a == min(s)
         assert b == max(s)
+
+
+class CountingBytesIO(BytesIO):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.num_bytes_read = 0
+
+    def read(self, *args, **kwargs):
+        data = super().read(*args, **kwargs)
+        self.num_bytes_read += len(data)
+        return data
+
+
+class TestFingerprintForFile:
+
+    def test_equal_contents_have_equal_fingerprints(self):
+        data = bytes(range(256)) * 1000
+        assert fingerprint_for_file(BytesIO(data), 'x') == fingerprint_for_file(BytesIO(data), 'x')
+
+    def test_differs_from_hash(self):
+        data = bytes(range(256)) * 10
+        assert fingerprint_for_file(BytesIO(data)) != hash_for_file(BytesIO(data))
+
+    def test_args_change_fingerprint(self):
+        data = bytes(range(256)) * 10
+        assert fingerprint_for_file(BytesIO(data), 'x') != fingerprint_for_file(BytesIO(data), 'y')
+
+    @given(length=integers(min_value=1, max_value=10000), block_size=integers(min_value=1, max_value=100))
+    def test_change_to_header_or_length_changes_fingerprint(self, length, block_size):
+        data = bytes(length)
+        expected = fingerprint_for_file(BytesIO(data), block_size=block_size)
+        assert fingerprint_for_file(BytesIO(b'\x01' + data[1:]), block_size=block_size) != expected
+        assert fingerprint_for_file(BytesIO(data[:-1] + b'\x01'), block_size=block_size) != expected
+        assert fingerprint_for_file(BytesIO(data + b'\x00'), block_size=block_size) != expected
+
+    def test_number_of_bytes_read_is_independent_of_length(self):
+        fh = CountingBytesIO(bytes(10 * 1024 * 1024))
+        fingerprint_for_file(fh, block_size=1024, num_sampled_blocks=4)
+        assert fh.num_bytes_read <= 6 * 1024
+
+    def test_position_is_restored(self):
+        fh = BytesIO(bytes(1000))
+        fh.seek(17)
+        fingerprint_for_file(fh)
+        assert fh.tell() == 17
@@ -0,0 +1,115 @@
+"""Tests for segpy.writer.
+"""
+
+from io import BytesIO
+
+import pytest
+from segpy.access import MEMORY_MAP_ACCESS, STREAM_ACCESS
+from segpy.dataset import DelegatingDataset, RawTraceSamples
+from segpy.reader import create_reader
+from segpy.toolkit import write_trace_samples
+from segpy.writer import write_segy
+from .util import write_synthetic_segy, SyntheticDataset3D
+
+
+class NoDecodingDataset(DelegatingDataset):
+    """A Dataset which fails if its samples are decoded."""
+
+    def trace_samples_raw(self, trace_index, start=None, stop=None):
+        return self._source.trace_samples_raw(trace_index, start, stop)
+
+    def trace_samples(self, trace_index, start=None, stop=None):
+        raise AssertionError("Samples were decoded")
+
+
+class ScaledCdpDataset(DelegatingDataset):
+
+    def trace_header(self, trace_index):
+        header = self.source.trace_header(trace_index)
+        header.cdp_x *= 2
+        return header
+
+
+class NegatedSamplesDataset(DelegatingDataset):
+
+    def trace_samples(self, trace_index, start=None, stop=None):
+        return [-sample for sample in self.source.trace_samples(trace_index, start, stop)]
+
+
+def copy_segy(segy_path, transform=None, endian='>', access_mode=STREAM_ACCESS):
+    with open(segy_path, 'rb') as fh:
+        reader = create_reader(fh, endian=endian, cache_directory=None, access_mode=access_mode)
+        dataset = transform(reader) if transform is not None else reader
+        with BytesIO() as out_fh:
+            write_segy(out_fh, dataset, endian=endian)
+            return out_fh.getvalue()
+
+
+def read_samples(data, endian='>'):
+    with BytesIO(data) as fh:
+        reader = create_reader(fh, endian=endian, cache_directory=None)
+        return [list(reader.trace_samples(trace_index)) for trace_index in reader.trace_indexes()]
+
+
+class TestRawSamplePassthrough:
+
+    @pytest.mark.parametrize('seg_y_type', ['ibm', 'int32', 'int16', 'int8', 'float32'])
+    @pytest.mark.parametrize('endian', ['<', '>'])
+    @pytest.mark.parametrize('access_mode', [STREAM_ACCESS, MEMORY_MAP_ACCESS])
+    def test_copied_reader_is_identical_without_decoding(self, tmpdir, seg_y_type, endian, access_mode):
+        segy_path = str(tmpdir / 'test.segy')
+        write_synthetic_segy(segy_path, seg_y_type=seg_y_type, endian=endian)
+        copied = copy_segy(segy_path, NoDecodingDataset, endian=endian, access_mode=access_mode)
+        with open(segy_path, 'rb') as fh:
+            assert copied == fh.read()
+
+    def test_header_only_changes_do_not_decode_samples(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        dataset = write_synthetic_segy(segy_path, seg_y_type='ibm')
+        copied = copy_segy(segy_path, lambda reader: ScaledCdpDataset(NoDecodingDataset(reader)))
+        with BytesIO(copied) as fh:
+            reader = create_reader(fh, cache_directory=None)
+            assert [reader.trace_header(i).cdp_x for i in reader.trace_indexes()] == \
+                [dataset.trace_header(i).cdp_x * 2 for i in dataset.trace_indexes()]
+        assert read_samples(copied) == [dataset.trace_samples(i) for i in dataset.trace_indexes()]
+
+    def test_transformed_samples_are_not_passed_through(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        dataset = write_synthetic_segy(segy_path, seg_y_type='ibm')
+        copied = copy_segy(segy_path, NegatedSamplesDataset)
+        assert read_samples(copied) == [[-s for s in dataset.trace_samples(i)] for i in dataset.trace_indexes()]
+
+    def test_samples_are_encoded_when_endianness_differs(self, tmpdir):
+        segy_path = str(tmpdir / 'test.segy')
+        dataset = write_synthetic_segy(segy_path, seg_y_type='int16', endian='<')
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, endian='<', cache_directory=None)
+            with BytesIO() as out_fh:
+                write_segy(out_fh, reader, endian='>')
+                copied = out_fh.getvalue()
+        assert read_samples(copied, endian='>') == [dataset.trace_samples(i) for i in dataset.trace_indexes()]
+
+    def test_datasets_without_raw_samples_are_encoded(self):
+        dataset = SyntheticDataset3D(2, 2, 5, 'float32')
+        assert dataset.trace_samples_raw(0) is None
+        assert DelegatingDataset(dataset).trace_samples_raw(0) is None
+        with BytesIO() as out_fh:
+            write_segy(out_fh, dataset)
+            written = out_fh.getvalue()
+        assert read_samples(written) == [dataset.trace_samples(i) for i in dataset.trace_indexes()]
+
+
+class TestTraceSamplesRaw:
+
+    @pytest.mark.parametrize('seg_y_type', ['ibm', 'int16', 'float32'])
+    @pytest.mark.parametrize('endian', ['<', '>'])
+    def test_raw_samples_are_encoded_samples(self, tmpdir, seg_y_type, endian):
+        segy_path = str(tmpdir / 'test.segy')
+        dataset = write_synthetic_segy(segy_path, seg_y_type=seg_y_type, endian=endian)
+        with BytesIO() as expected_fh:
+            write_trace_samples(expected_fh, dataset.trace_samples(5)[2:7], seg_y_type, endian=endian)
+            expected = expected_fh.getvalue()
+        with open(segy_path, 'rb') as fh:
+            reader = create_reader(fh, endian=endian, cache_directory=None)
+            raw = reader.trace_samples_raw(5, 2, 7)
+            assert raw == RawTraceSamples(expected, seg_y_type, endian)
@@ -1,5 +1,11 @@
 from contextlib import contextmanager
+from segpy.binary_reel_header import BinaryReelHeader
+from segpy.dataset import Dataset
+from segpy.datatypes import SEG_Y_TYPE_TO_DATA_SAMPLE_FORMAT
+from segpy.encoding import ASCII
 import segpy.toolkit as toolkit
+from segpy.trace_header import TraceHeaderRev1
+from segpy.writer import write_segy
 
 
 @contextmanager
@@ -13,3 +19,82 @@ def force_python_ibm_float(force):
         yield force
     finally:
         toolkit.force_python_ibm_floats = orig
+
+
+class SyntheticDataset3D(Dataset):
+    """A small, regular 3D dataset with predictable trace headers and samples.
+
+    Traces are ordered by inline, then crossline. Each sample value is derived
+    from its trace index and sample index so that reads can be checked exactly.
+    """
+
+    def __init__(self, num_inlines, num_xlines, num_samples, seg_y_type='float32'):
+        self._num_inlines = num_inlines
+        self._num_xlines = num_xlines
+        self._seg_y_type = seg_y_type
+        self._binary_reel_header = BinaryReelHeader(
+            num_samples=num_samples,
+            sample_interval=4000,
+            data_sample_format=SEG_Y_TYPE_TO_DATA_SAMPLE_FORMAT[seg_y_type])
+
+    @property
+    def textual_reel_header(self):
+        return tuple(' ' * toolkit.CARD_LENGTH for _ in range(toolkit.CARDS_PER_HEADER))
+
+    @property
+    def binary_reel_header(self):
+        return self._binary_reel_header
+
+    @property
+    def extended_textual_header(self):
+        return []
+
+    @property
+    def dimensionality(self):
+        return 3
+
+    @property
+    def encoding(self):
+        return ASCII
+
+    def trace_indexes(self):
+        return iter(range(self.num_traces()))
+
+    def num_traces(self):
+        return self._num_inlines * self._num_xlines
+
+    def trace_header(self, trace_index):
+        inline_index, xline_index = divmod(trace_index, self._num_xlines)
+        return TraceHeaderRev1(
+            line_sequence_num=trace_index + 1,
+            file_sequence_num=trace_index + 1,
+            ensemble_num=trace_index + 1,
+            num_samples=self._binary_reel_header.num_samples,
+            inline_number=inline_index + 100,
+            crossline_number=xline_index + 200,
+            cdp_x=trace_index * 25,
+            cdp_y=trace_index * 50)
+
+    def trace_samples(self, trace_index, start=None, stop=None):
+        start = 0 if start is None else start
+        stop = self._binary_reel_header.num_samples if stop is None else stop
+        return [self.sample_value(trace_index, sample_index) for sample_index in range(start, stop)]
+
+    def sample_value(self, trace_index, sample_index):
+        """The exactly representable value of a particular sample."""
+        value = (trace_index * 3 + sample_index) % 100 - 50
+        if self._seg_y_type in {'ibm', 'float32'}:
+            return value / 4
+        return value
+
+
+def write_synthetic_segy(path, num_inlines=3, num_xlines=4, num_samples=10, seg_y_type='float32', endian='>'):
+    """Write a SyntheticDataset3D to a file.
+
+    Returns:
+        The SyntheticDataset3D which was written.
+    """
+    dataset = SyntheticDataset3D(num_inlines, num_xlines, num_samples, seg_y_type)
+    with open(str(path), 'wb') as fh:
+        write_segy(fh, dataset, endian=endian)
+    return dataset